@@ -0,0 +1,196 @@
+import math
+import time
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+from anyio import CapacityLimiter, to_thread
+from app.config import settings
+from app.metrics import ADMISSION_REJECTIONS, ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+INFERENCE = "inference"
+TRAINING = "training"
+TIMEOUT_HEADER = "x-request-timeout"
+RETRY_AFTER_HEADER = "retry-after"
+
+# service time estimates before the first request of each kind completes
+INITIAL_SERVICE_TIME = {INFERENCE: 0.05, TRAINING: 30.0}
+SERVICE_TIME_SMOOTHING = 0.2
+# while no request of the lane completes, its estimate falls back towards the initial value with this half-life,
+# so a single slow request cannot hold the deadline checks shut
+SERVICE_TIME_HALF_LIFE = 10.0
+
+
+class Overloaded(Exception):
+    def __init__(self, kind: str, reason: str, retry_after: float):
+        super().__init__(f"Server overloaded ({kind}): {reason}")
+        self.kind = kind
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.retry_after))
+
+
+class _Lane:
+    def __init__(self, kind: str, limit: int, queue_limit: int):
+        self.kind = kind
+        self.limit = max(limit, 1)
+        self.queue_limit = queue_limit
+        self.in_flight = 0
+        self.waiting = 0
+        self._service_time = INITIAL_SERVICE_TIME[kind]
+        self._updated = time.monotonic()
+
+    @property
+    def service_time(self) -> float:
+        initial = INITIAL_SERVICE_TIME[self.kind]
+        decay = 0.5 ** ((time.monotonic() - self._updated) / SERVICE_TIME_HALF_LIFE)
+        return initial + (self._service_time - initial) * decay
+
+    def observe(self, elapsed: float):
+        service_time = self.service_time
+        self._service_time = service_time + SERVICE_TIME_SMOOTHING * (elapsed - service_time)
+        self._updated = time.monotonic()
+
+    def expected_wait(self) -> float:
+        if self.in_flight < self.limit:
+            return 0.0
+        return (self.waiting // self.limit + 1) * self.service_time
+
+
+class AdmissionController:
+    def __init__(self):
+        self.per_model_limit = settings.max_concurrent_predictions_per_model
+        self._lanes = {
+            INFERENCE: _Lane(INFERENCE, settings.max_concurrent_predictions, settings.max_queued_predictions),
+            TRAINING: _Lane(TRAINING, settings.max_concurrent_trainings, settings.max_queued_trainings),
+        }
+        self._model_in_flight: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._limiters: Dict[str, CapacityLimiter] = {}
+        for kind, lane in self._lanes.items():
+            ADMISSION_IN_FLIGHT.labels(kind).set_function(lambda lane=lane: lane.in_flight)
+            ADMISSION_QUEUE_DEPTH.labels(kind).set_function(lambda lane=lane: lane.waiting)
+
+    def _can_run(self, lane: _Lane, model_name: Optional[str]) -> bool:
+        if lane.in_flight >= lane.limit:
+            return False
+        if lane.kind == INFERENCE and model_name is not None:
+            return self._model_in_flight.get(model_name, 0) < self.per_model_limit
+        # training only starts once no prediction is waiting for a slot
+        return lane.kind != TRAINING or self._lanes[INFERENCE].waiting == 0
+
+    def _reject(self, lane: _Lane, reason: str, retry_after: float):
+        ADMISSION_REJECTIONS.labels(lane.kind, reason).inc()
+        logger.warning(f"Rejected {lane.kind} request: {reason} (in flight {lane.in_flight}, waiting {lane.waiting})")
+        raise Overloaded(lane.kind, reason, retry_after)
+
+    def acquire(self, kind: str, model_name: Optional[str] = None, timeout: Optional[float] = None):
+        lane = self._lanes[kind]
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._cond:
+            # a free slot is always taken; the deadline only decides whether queueing is worth it
+            if not self._can_run(lane, model_name):
+                if lane.waiting >= lane.queue_limit:
+                    self._reject(lane, "queue_full", lane.expected_wait())
+                # fail fast when the queue ahead already takes longer than the caller is willing to wait
+                expected = lane.expected_wait() + lane.service_time
+                if deadline is not None and deadline - time.monotonic() < expected:
+                    self._reject(lane, "deadline", expected)
+                lane.waiting += 1
+                try:
+                    while not self._can_run(lane, model_name):
+                        remaining = None if deadline is None else deadline - time.monotonic() - lane.service_time
+                        if remaining is not None and remaining <= 0:
+                            self._reject(lane, "deadline", lane.expected_wait() + lane.service_time)
+                        self._cond.wait(remaining)
+                finally:
+                    lane.waiting -= 1
+                    if lane.kind == INFERENCE and lane.waiting == 0:
+                        self._cond.notify_all()
+            lane.in_flight += 1
+            if kind == INFERENCE and model_name is not None:
+                self._model_in_flight[model_name] = self._model_in_flight.get(model_name, 0) + 1
+
+    def release(self, kind: str, model_name: Optional[str], elapsed: float):
+        lane = self._lanes[kind]
+        with self._cond:
+            lane.in_flight -= 1
+            if kind == INFERENCE and model_name is not None:
+                self._release_model(model_name)
+            lane.observe(elapsed)
+            self._cond.notify_all()
+
+    def acquire_model(self, model_name: str, timeout: Optional[float] = None):
+        # per-model slot for a request already admitted to the inference lane, e.g. one model of a fan-out
+        lane = self._lanes[INFERENCE]
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._cond:
+            while self._model_in_flight.get(model_name, 0) >= self.per_model_limit:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._reject(lane, "model_busy", lane.service_time)
+                self._cond.wait(remaining)
+            self._model_in_flight[model_name] = self._model_in_flight.get(model_name, 0) + 1
+
+    def release_model(self, model_name: str):
+        with self._cond:
+            self._release_model(model_name)
+            self._cond.notify_all()
+
+    def _release_model(self, model_name: str):
+        count = self._model_in_flight.get(model_name, 1) - 1
+        if count > 0:
+            self._model_in_flight[model_name] = count
+        else:
+            self._model_in_flight.pop(model_name, None)
+
+    @contextmanager
+    def admit(self, kind: str, model_name: Optional[str] = None, timeout: Optional[float] = None):
+        self.acquire(kind, model_name, timeout)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(kind, model_name, time.perf_counter() - start)
+
+    def _limiter(self, kind: str) -> CapacityLimiter:
+        # created on first use, inside the event loop; one thread per slot that can run or wait in the queue
+        limiter = self._limiters.get(kind)
+        if limiter is None:
+            lane = self._lanes[kind]
+            limiter = self._limiters[kind] = CapacityLimiter(lane.limit + lane.queue_limit)
+        return limiter
+
+    @asynccontextmanager
+    async def admit_async(self, kind: str, model_name: Optional[str] = None, timeout: Optional[float] = None):
+        # waiting for a slot blocks a thread from the lane's own limiter, so queued requests never
+        # hold tokens of the shared threadpool that admitted handlers run in
+        await to_thread.run_sync(self.acquire, kind, model_name, timeout, limiter=self._limiter(kind))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(kind, model_name, time.perf_counter() - start)
+
+    @contextmanager
+    def model_slot(self, model_name: str, timeout: Optional[float] = None):
+        self.acquire_model(model_name, timeout)
+        try:
+            yield
+        finally:
+            self.release_model(model_name)
+
+
+def request_timeout(value: Optional[float], kind: str = INFERENCE) -> Optional[float]:
+    # the caller's own deadline wins; predictions otherwise get the configured budget, training only the queue bound
+    if value is not None and value > 0:
+        return value
+    return settings.admission_timeout if kind == INFERENCE else None
+
+
+admission = AdmissionController()
@@ -0,0 +1,20 @@
+import numpy as np
+
+MATRIX_DTYPES = ("float32", "float64")
+
+
+def decode_matrix(buffer: bytes, rows: int, cols: int, dtype: str = "float64") -> np.ndarray:
+    dtype = dtype or "float64"
+    if dtype not in MATRIX_DTYPES:
+        raise ValueError(f"Unsupported dtype {dtype}, expected one of {', '.join(MATRIX_DTYPES)}")
+    data = np.frombuffer(buffer, dtype=dtype)
+    if rows < 0 or cols <= 0 or data.size != rows * cols:
+        raise ValueError(f"Buffer of {data.size} values does not match shape ({rows}, {cols})")
+    return data.reshape(rows, cols)
+
+
+def encode_array(array: np.ndarray):
+    if array.dtype.name not in MATRIX_DTYPES:
+        array = array.astype(np.float64)
+    array = np.ascontiguousarray(array)
+    return array.tobytes(), array.dtype.name
@@ -1,39 +1,187 @@
 import logging
 import json
+import signal
 import numpy as np
 from concurrent import futures
 import grpc
-import sys
-import os
-
-try:
-    from app.api import grpc_api_pb2
-    from app.api import grpc_api_pb2_grpc
-except ImportError:
-    import subprocess
-    result = subprocess.run(
-        [sys.executable, "-m", "grpc_tools.protoc", "-I.", "--python_out=.", "--grpc_python_out=.", "app/api/grpc_api.proto"],
-        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    )
-    if result.returncode == 0:
-        from app.api import grpc_api_pb2
-        from app.api import grpc_api_pb2_grpc
-    else:
-        raise ImportError("Could not generate gRPC code")
-
-from app.services.model_service import ModelService
-from app.services.dataset_service import DatasetService
+import time
+import threading
+from prometheus_client import start_http_server
+
+from app.api import grpc_api_pb2
+from app.api import grpc_api_pb2_grpc
+from app.api.codec import decode_matrix, encode_array
+
+from typing import Optional
+from app.services.model_service import ModelService, training_message
 from app.config import settings
+from app.metrics import (
+    REQUESTS, REQUEST_LATENCY, PREDICT_STAGE_LATENCY, PREDICT_BATCH_SIZE,
+    observe, track_registry_size, track_executor_queue
+)
+from app.profiling import PROFILE_HEADER, profile_requested, profile_store, render_text
+from app.admission import admission, request_timeout, Overloaded, INFERENCE, TRAINING, RETRY_AFTER_HEADER
+from app.readiness import readiness
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _record_rpc(endpoint: str, start: float, status: grpc.StatusCode):
+    REQUEST_LATENCY.labels("grpc", endpoint).observe(time.perf_counter() - start)
+    REQUESTS.labels("grpc", endpoint, status.name).inc()
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return handler
+
+        endpoint = handler_call_details.method.rsplit("/", 1)[-1]
+        if handler.unary_unary is not None:
+            behavior = handler.unary_unary
+
+            def wrapper(request, context):
+                start = time.perf_counter()
+                status = grpc.StatusCode.UNKNOWN
+                try:
+                    response = behavior(request, context)
+                    status = context.code() or grpc.StatusCode.OK
+                    return response
+                except Exception:
+                    status = context.code() or grpc.StatusCode.UNKNOWN
+                    raise
+                finally:
+                    _record_rpc(endpoint, start, status)
+
+            return grpc.unary_unary_rpc_method_handler(
+                wrapper,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer
+            )
+
+        if handler.unary_stream is not None:
+            behavior = handler.unary_stream
+
+            def stream_wrapper(request, context):
+                # latency covers the whole stream, until the last message is handed to gRPC
+                start = time.perf_counter()
+                status = grpc.StatusCode.UNKNOWN
+                try:
+                    yield from behavior(request, context)
+                    status = context.code() or grpc.StatusCode.OK
+                except GeneratorExit:
+                    status = grpc.StatusCode.CANCELLED
+                    raise
+                except Exception:
+                    status = context.code() or grpc.StatusCode.UNKNOWN
+                    raise
+                finally:
+                    _record_rpc(endpoint, start, status)
+
+            return grpc.unary_stream_rpc_method_handler(
+                stream_wrapper,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer
+            )
+        return handler
+
+class ProfilingInterceptor(grpc.ServerInterceptor):
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        metadata = dict(handler_call_details.invocation_metadata or ())
+        if metadata.get(PROFILE_HEADER, "").lower() not in ("1", "true"):
+            return handler
+
+        behavior = handler.unary_unary
+
+        def wrapper(request, context):
+            token = profile_requested.set(True)
+            try:
+                return behavior(request, context)
+            finally:
+                profile_requested.reset(token)
+
+        return grpc.unary_unary_rpc_method_handler(
+            wrapper,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer
+        )
+
+NO_DEADLINE = 365 * 24 * 3600
+
+def time_remaining(context) -> Optional[float]:
+    remaining = context.time_remaining()
+    # calls without a deadline report an effectively infinite remaining time
+    return remaining if remaining is not None and remaining <= NO_DEADLINE else None
+
+class AdmissionInterceptor(grpc.ServerInterceptor):
+    ADMITTED = {
+        "Predict": INFERENCE,
+        "PredictMatrix": INFERENCE,
+        "PredictMulti": INFERENCE,
+        "TrainModel": TRAINING,
+        "RetrainModel": TRAINING,
+    }
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        kind = self.ADMITTED.get(handler_call_details.method.rsplit("/", 1)[-1])
+        if kind is None:
+            return handler
+
+        behavior = handler.unary_unary
+
+        def wrapper(request, context):
+            model_name = getattr(request, "model_name", None) if kind == INFERENCE else None
+            try:
+                # the client's deadline is the budget; waiting past it would only produce a response nobody reads
+                admission.acquire(kind, model_name or None, request_timeout(time_remaining(context), kind))
+            except Overloaded as e:
+                context.set_trailing_metadata(((RETRY_AFTER_HEADER, str(e.retry_after_seconds)),))
+                context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+            start = time.perf_counter()
+            try:
+                return behavior(request, context)
+            finally:
+                admission.release(kind, model_name or None, time.perf_counter() - start)
+
+        return grpc.unary_unary_rpc_method_handler(
+            wrapper,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer
+        )
+
+def _model_info(m) -> grpc_api_pb2.ModelInfo:
+    return grpc_api_pb2.ModelInfo(
+        name=m["name"],
+        id=m["id"],
+        created=m["created"] or "",
+        loaded=m["loaded"],
+        version=m["version"] or 0,
+        model_class=m["model_class"] or ""
+    )
+
+def _dataset_info(d) -> grpc_api_pb2.DatasetInfo:
+    return grpc_api_pb2.DatasetInfo(
+        name=d["name"],
+        size=d["size"],
+        path=d["path"],
+        modified=d["modified"]
+    )
+
 class MLServiceServicer(grpc_api_pb2_grpc.MLServiceServicer):
-    def __init__(self):
-        self.model_service = ModelService()
-        self.dataset_service = DatasetService()
+    def __init__(self, model_service: Optional[ModelService] = None):
+        # the combined server passes the REST app's service so both APIs see the same models
+        self.model_service = model_service or ModelService()
+        self.dataset_service = self.model_service.dataset_service
 
     def Health(self, request, context):
+        if not readiness.ready:
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            return grpc_api_pb2.HealthResponse(status="shutting_down")
         return grpc_api_pb2.HealthResponse(status="healthy")
 
     def GetModelClasses(self, request, context):
@@ -48,12 +196,13 @@ class MLServiceServicer(grpc_api_pb2_grpc.MLServiceServicer):
                 request.model_class,
                 request.dataset_name,
                 hyperparameters,
-                request.target_column
+                request.target_column,
+                request.precision or None
             )
             if success:
                 return grpc_api_pb2.TrainModelResponse(
                     success=True,
-                    message=f"Model {request.model_name} trained successfully"
+                    message=training_message(request.model_name, success, "trained")
                 )
             else:
                 context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
@@ -70,19 +219,87 @@ class MLServiceServicer(grpc_api_pb2_grpc.MLServiceServicer):
             )
 
     def Predict(self, request, context):
+        label = self.model_service.metric_label(request.model_name)
         try:
-            data = np.array([[point.features[i] for i in range(len(point.features))] 
-                            for point in request.data])
-            predictions = self.model_service.predict(request.model_name, data)
+            PREDICT_BATCH_SIZE.labels("grpc", label).observe(len(request.data))
+            with observe(PREDICT_STAGE_LATENCY, "grpc", label, "convert"):
+                # proto floats are 32-bit already, so float32 holds them exactly
+                data = np.array([list(point.features) for point in request.data], dtype=np.float32)
+            with observe(PREDICT_STAGE_LATENCY, "grpc", label, "predict"):
+                predictions = self.model_service.predict(request.model_name, data)
             if predictions is None:
                 context.set_code(grpc.StatusCode.NOT_FOUND)
                 return grpc_api_pb2.PredictResponse()
-            return grpc_api_pb2.PredictResponse(predictions=predictions.tolist())
+            with observe(PREDICT_STAGE_LATENCY, "grpc", label, "serialize"):
+                response = grpc_api_pb2.PredictResponse(predictions=predictions.tolist())
+            return response
         except Exception as e:
             logger.error(f"Error in Predict: {e}")
             context.set_code(grpc.StatusCode.INTERNAL)
             return grpc_api_pb2.PredictResponse()
 
+    def PredictMatrix(self, request, context):
+        label = self.model_service.metric_label(request.model_name)
+        try:
+            PREDICT_BATCH_SIZE.labels("grpc", label).observe(request.rows)
+            with observe(PREDICT_STAGE_LATENCY, "grpc", label, "convert"):
+                data = decode_matrix(request.data, request.rows, request.cols, request.dtype)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return grpc_api_pb2.PredictMatrixResponse()
+        try:
+            with observe(PREDICT_STAGE_LATENCY, "grpc", label, "predict"):
+                predictions = self.model_service.predict(request.model_name, data)
+            if predictions is None:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                return grpc_api_pb2.PredictMatrixResponse()
+            with observe(PREDICT_STAGE_LATENCY, "grpc", label, "serialize"):
+                buffer, dtype = encode_array(predictions)
+            return grpc_api_pb2.PredictMatrixResponse(predictions=buffer, dtype=dtype, rows=len(predictions))
+        except Exception as e:
+            logger.error(f"Error in PredictMatrix: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            return grpc_api_pb2.PredictMatrixResponse()
+
+    def PredictMulti(self, request, context):
+        model_names = list(request.model_names)
+        try:
+            PREDICT_BATCH_SIZE.labels("grpc", "multi").observe(len(request.data))
+            with observe(PREDICT_STAGE_LATENCY, "grpc", "multi", "convert"):
+                data = np.array([list(point.features) for point in request.data],
+                                dtype=self.model_service.fanout_input_dtype(model_names))
+            with observe(PREDICT_STAGE_LATENCY, "grpc", "multi", "predict"):
+                result = self.model_service.predict_many(model_names, data, list(request.weights) or None,
+                                                         request_timeout(time_remaining(context)))
+        except Overloaded as e:
+            context.set_trailing_metadata(((RETRY_AFTER_HEADER, str(e.retry_after_seconds)),))
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            context.set_details(str(e))
+            return grpc_api_pb2.PredictMultiResponse()
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return grpc_api_pb2.PredictMultiResponse()
+        except Exception as e:
+            logger.error(f"Error in PredictMulti: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            return grpc_api_pb2.PredictMultiResponse()
+        if not result["predictions"]:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            return grpc_api_pb2.PredictMultiResponse()
+        with observe(PREDICT_STAGE_LATENCY, "grpc", "multi", "serialize"):
+            results = [
+                grpc_api_pb2.ModelPredictions(
+                    model_name=name,
+                    predictions=result["predictions"][name].tolist() if name in result["predictions"] else [],
+                    error=result["errors"].get(name, "")
+                )
+                for name in model_names
+            ]
+            combined = result["combined"].tolist() if result["combined"] is not None else []
+            return grpc_api_pb2.PredictMultiResponse(results=results, combined=combined)
+
     def RetrainModel(self, request, context):
         try:
             hyperparameters = json.loads(request.hyperparameters_json)
@@ -91,12 +308,13 @@ class MLServiceServicer(grpc_api_pb2_grpc.MLServiceServicer):
                 request.model_class,
                 request.dataset_name,
                 hyperparameters,
-                request.target_column
+                request.target_column,
+                request.precision or None
             )
             if success:
                 return grpc_api_pb2.RetrainModelResponse(
                     success=True,
-                    message=f"Model {request.model_name} retrained successfully"
+                    message=training_message(request.model_name, success, "retrained")
                 )
             else:
                 context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
@@ -134,19 +352,40 @@ class MLServiceServicer(grpc_api_pb2_grpc.MLServiceServicer):
                 message=str(e)
             )
 
+    def _page_models(self, request, cursor: Optional[str], include_total: bool = False):
+        return self.model_service.page_models(
+            request.name_prefix or None,
+            request.model_class or None,
+            request.loaded if request.HasField("loaded") else None,
+            request.sort_by or "name",
+            request.descending,
+            cursor,
+            request.page_size or None,
+            include_total
+        )
+
+    def _page_datasets(self, request, cursor: Optional[str], include_total: bool = False):
+        return self.dataset_service.page_datasets(
+            request.name_prefix or None,
+            request.sort_by or "name",
+            request.descending,
+            cursor,
+            request.page_size or None,
+            include_total
+        )
+
     def ListModels(self, request, context):
         try:
-            models = self.model_service.list_models()
-            model_infos = [
-                grpc_api_pb2.ModelInfo(
-                    name=m["name"],
-                    id=m["id"],
-                    created=m["created"],
-                    loaded=m["loaded"]
-                )
-                for m in models
-            ]
-            return grpc_api_pb2.ListModelsResponse(models=model_infos)
+            # the total is counted for the first page only
+            models, next_cursor, total = self._page_models(request, request.page_token or None,
+                                                           not request.page_token)
+            return grpc_api_pb2.ListModelsResponse(
+                models=[_model_info(m) for m in models],
+                next_page_token=next_cursor or "",
+                total=total or 0
+            )
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
         except Exception as e:
             logger.error(f"Error in ListModels: {e}")
             context.set_code(grpc.StatusCode.INTERNAL)
@@ -154,24 +393,48 @@ class MLServiceServicer(grpc_api_pb2_grpc.MLServiceServicer):
 
     def ListDatasets(self, request, context):
         try:
-            datasets = self.dataset_service.list_datasets()
-            dataset_infos = [
-                grpc_api_pb2.DatasetInfo(
-                    name=d["name"],
-                    size=d["size"],
-                    path=d["path"]
-                )
-                for d in datasets
-            ]
-            return grpc_api_pb2.ListDatasetsResponse(datasets=dataset_infos)
+            datasets, next_cursor, total = self._page_datasets(request, request.page_token or None,
+                                                               not request.page_token)
+            return grpc_api_pb2.ListDatasetsResponse(
+                datasets=[_dataset_info(d) for d in datasets],
+                next_page_token=next_cursor or "",
+                total=total or 0
+            )
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
         except Exception as e:
             logger.error(f"Error in ListDatasets: {e}")
             context.set_code(grpc.StatusCode.INTERNAL)
             return grpc_api_pb2.ListDatasetsResponse()
 
+    def StreamModels(self, request, context):
+        # walks the index page by page, page_size only sets how many records are read at a time
+        cursor = request.page_token or None
+        try:
+            while context.is_active():
+                models, cursor, _ = self._page_models(request, cursor)
+                for m in models:
+                    yield _model_info(m)
+                if cursor is None:
+                    return
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+    def StreamDatasets(self, request, context):
+        cursor = request.page_token or None
+        try:
+            while context.is_active():
+                datasets, cursor, _ = self._page_datasets(request, cursor)
+                for d in datasets:
+                    yield _dataset_info(d)
+                if cursor is None:
+                    return
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
     def LoadModel(self, request, context):
         try:
-            success = self.model_service.load_model_from_clearml(request.model_name)
+            success = self.model_service.load_model_from_clearml(request.model_name, request.precision or None)
             if success:
                 return grpc_api_pb2.LoadModelResponse(
                     success=True,
@@ -191,14 +454,68 @@ class MLServiceServicer(grpc_api_pb2_grpc.MLServiceServicer):
                 message=str(e)
             )
 
+    def ListProfiles(self, request, context):
+        profiles = [
+            grpc_api_pb2.ProfileInfo(
+                id=p["id"],
+                operation=p["operation"],
+                label=p["label"],
+                timestamp=p["timestamp"],
+                duration=p["duration"]
+            )
+            for p in profile_store.list()
+        ]
+        return grpc_api_pb2.ListProfilesResponse(profiles=profiles)
+
+    def GetProfile(self, request, context):
+        profile = profile_store.get(request.id)
+        if profile is None:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            return grpc_api_pb2.GetProfileResponse()
+        return grpc_api_pb2.GetProfileResponse(data=profile["data"], text=render_text(profile))
+
+def create_server(servicer: MLServiceServicer) -> grpc.Server:
+    # workers blocked in admission queues count against this pool, so it is sized above the admission limits;
+    # RPCs beyond the worker count are refused right away instead of waiting in the executor queue with no deadline
+    executor = futures.ThreadPoolExecutor(max_workers=settings.grpc_workers)
+    max_rpcs = min(settings.grpc_max_concurrent_rpcs, settings.grpc_workers)
+    if max_rpcs < settings.grpc_max_concurrent_rpcs:
+        logger.info(f"Capping concurrent gRPC calls at {max_rpcs}, the number of worker threads")
+    server = grpc.server(
+        executor,
+        interceptors=[MetricsInterceptor(), AdmissionInterceptor(), ProfilingInterceptor()],
+        maximum_concurrent_rpcs=max_rpcs,
+        options=[
+            # let pooled clients keep idle connections alive with pings
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.min_ping_interval_without_data_ms", 10000),
+            ("grpc.http2.max_pings_without_data", 0),
+            ("grpc.max_receive_message_length", settings.grpc_max_message_bytes),
+            ("grpc.max_send_message_length", settings.grpc_max_message_bytes)
+        ]
+    )
+    grpc_api_pb2_grpc.add_MLServiceServicer_to_server(servicer, server)
+    track_executor_queue("grpc", executor)
+    server.add_insecure_port(f'[::]:{settings.grpc_port}')
+    return server
+
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    grpc_api_pb2_grpc.add_MLServiceServicer_to_server(MLServiceServicer(), server)
-    listen_addr = f'[::]:{settings.grpc_port}'
-    server.add_insecure_port(listen_addr)
+    servicer = MLServiceServicer()
+    server = create_server(servicer)
+    track_registry_size(servicer.model_service.models)
+    track_executor_queue("fanout", servicer.model_service.fanout_executor)
+    start_http_server(settings.metrics_port)
+    logger.info(f"gRPC metrics exporter started on port {settings.metrics_port}")
+    # SIGTERM fails Health first, then stops accepting new RPCs and lets in-flight ones finish within the grace period
+    def shutdown(signum, frame):
+        readiness.drain()
+        threading.Timer(settings.shutdown_delay, server.stop, args=(settings.shutdown_grace_period,)).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
     server.start()
-    logger.info(f"gRPC server started on {listen_addr}")
+    logger.info(f"gRPC server started on port {settings.grpc_port}")
     server.wait_for_termination()
+    servicer.model_service.close()
 
 if __name__ == '__main__':
     serve()
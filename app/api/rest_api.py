@@ -1,16 +1,33 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse, FileResponse
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
 import numpy as np
 import logging
-import pandas as pd
-from app.services.model_service import ModelService
-from app.services.dataset_service import DatasetService
+import time
+import json
+import asyncio
+import uuid
+from prometheus_client import make_asgi_app
+from app.services.model_service import ModelService, training_message
+from app.services.batch_service import BatchService, TERMINAL_STATUSES
+from app.services.dataset_service import is_safe_name
+from app.config import settings
+from app.api.codec import decode_matrix, encode_array
+from app.metrics import (
+    REQUESTS, REQUEST_LATENCY, PREDICT_STAGE_LATENCY, PREDICT_BATCH_SIZE,
+    observe, track_registry_size, track_executor_queue
+)
+from app.profiling import PROFILE_HEADER, profile_requested, profile_store, render_text
+from app.readiness import readiness
+from app.admission import admission, request_timeout, Overloaded, INFERENCE, TRAINING, TIMEOUT_HEADER
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 app = FastAPI(
     title="MLOps HW1 API",
     description="REST API for ML model training and inference",
@@ -18,7 +35,56 @@ app = FastAPI(
 )
 
 model_service = ModelService()
-dataset_service = DatasetService()
+dataset_service = model_service.dataset_service
+batch_service = BatchService(model_service)
+track_registry_size(model_service.models)
+track_executor_queue("fanout", model_service.fanout_executor)
+
+app.mount("/metrics", make_asgi_app())
+
+@app.middleware("http")
+async def profiling_middleware(request: Request, call_next):
+    token = profile_requested.set(request.headers.get(PROFILE_HEADER, "").lower() in ("1", "true"))
+    try:
+        return await call_next(request)
+    finally:
+        profile_requested.reset(token)
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    request.state.start_time = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        endpoint = route.path if route is not None else "unmatched"
+        if endpoint != "/metrics":
+            REQUEST_LATENCY.labels("rest", endpoint).observe(time.perf_counter() - request.state.start_time)
+            REQUESTS.labels("rest", endpoint, str(status)).inc()
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after_seconds)}
+    )
+
+def header_timeout(http_request: Request) -> float:
+    try:
+        return float(http_request.headers.get(TIMEOUT_HEADER, "0"))
+    except ValueError:
+        return 0.0
+
+def admission_timeout(http_request: Request, kind: str = INFERENCE) -> Optional[float]:
+    timeout = request_timeout(header_timeout(http_request), kind)
+    if timeout is None:
+        return None
+    # time already spent reading and validating the body counts against the caller's budget
+    return max(timeout - (time.perf_counter() - http_request.state.start_time), 0.001)
 
 class TrainRequest(BaseModel):
     model_name: str
@@ -26,17 +92,33 @@ class TrainRequest(BaseModel):
     dataset_name: str
     hyperparameters: Dict[str, Any]
     target_column: str = "target"
+    precision: Optional[str] = None
 
 class PredictRequest(BaseModel):
     model_name: str
     data: List[List[float]]
 
+class MultiPredictRequest(BaseModel):
+    model_names: List[str]
+    data: List[List[float]]
+    weights: Optional[List[float]] = None
+
+class DatasetBatchRequest(BaseModel):
+    model_name: str
+    dataset_name: str
+    target_column: Optional[str] = "target"
+    dvc_version: bool = False
+
+class AliasRequest(BaseModel):
+    version: int
+
 class RetrainRequest(BaseModel):
     model_name: str
     model_class: str
     dataset_name: str
     hyperparameters: Dict[str, Any]
     target_column: str = "target"
+    precision: Optional[str] = None
 
 @app.get("/")
 async def root():
@@ -46,41 +128,92 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def ready():
+    # liveness stays on /health; this one fails as soon as shutdown starts
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content={"status": "shutting_down"})
+    return {"status": "ready"}
+
 @app.get("/api/v1/models/classes")
 async def get_model_classes():
     classes = model_service.get_available_model_classes()
     return {"model_classes": classes}
 
 @app.post("/api/v1/models/train")
-async def train_model(request: TrainRequest):
+async def train_model(request: TrainRequest, http_request: Request):
     try:
-        success = model_service.train_model(
-            request.model_name,
-            request.model_class,
-            request.dataset_name,
-            request.hyperparameters,
-            request.target_column
-        )
+        async with admission.admit_async(TRAINING, timeout=admission_timeout(http_request, TRAINING)):
+            success = await run_in_threadpool(
+                model_service.train_model,
+                request.model_name,
+                request.model_class,
+                request.dataset_name,
+                request.hyperparameters,
+                request.target_column,
+                request.precision
+            )
         if not success:
             raise HTTPException(
                 status_code=400, 
                 detail="Failed to train model. Check logs for details."
             )
-        return {"message": f"Model {request.model_name} trained successfully"}
-    except HTTPException:
+        return {"message": training_message(request.model_name, success), "result": success}
+    except (HTTPException, Overloaded):
         raise
     except Exception as e:
         logger.error(f"Error in train_model endpoint: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
+async def stream_predictions(model_name: str, data: np.ndarray, chunk_size: int, timeout: Optional[float]):
+    # each slice is admitted, predicted and serialized only when the client is ready for it;
+    # the caller's budget covers the whole stream, so every slice only gets what is left of it
+    deadline = time.perf_counter() + timeout if timeout is not None else None
+    for offset in range(0, len(data), chunk_size):
+        remaining = None if deadline is None else deadline - time.perf_counter()
+        if remaining is not None and remaining <= 0:
+            yield json.dumps({"offset": offset, "error": "Request deadline exceeded"}) + "\n"
+            return
+        try:
+            async with admission.admit_async(INFERENCE, model_name, remaining):
+                predictions = await run_in_threadpool(model_service.predict, model_name, data[offset:offset + chunk_size])
+        except Overloaded as e:
+            yield json.dumps({"offset": offset, "error": str(e), "retry_after": e.retry_after_seconds}) + "\n"
+            return
+        if predictions is None:
+            yield json.dumps({"offset": offset, "error": "Prediction failed"}) + "\n"
+            return
+        yield json.dumps({"offset": offset, "predictions": predictions.tolist()}) + "\n"
+
 @app.post("/api/v1/models/predict")
-async def predict(request: PredictRequest):
+async def predict(request: PredictRequest, http_request: Request, stream: bool = False):
     try:
-        data = np.array(request.data)
-        predictions = model_service.predict(request.model_name, data)
+        label = model_service.metric_label(request.model_name)
+        # body read and pydantic validation happen before the handler runs
+        PREDICT_STAGE_LATENCY.labels("rest", label, "parse").observe(
+            time.perf_counter() - http_request.state.start_time
+        )
+        PREDICT_BATCH_SIZE.labels("rest", label).observe(len(request.data))
+        with observe(PREDICT_STAGE_LATENCY, "rest", label, "convert"):
+            data = np.array(request.data, dtype=model_service.input_dtype(request.model_name))
+        if stream or http_request.headers.get("accept") == NDJSON_MEDIA_TYPE:
+            if request.model_name not in model_service.models:
+                raise HTTPException(status_code=404, detail="Model not found")
+            return StreamingResponse(
+                stream_predictions(request.model_name, data, settings.predict_stream_chunk_size,
+                                   admission_timeout(http_request)),
+                media_type=NDJSON_MEDIA_TYPE
+            )
+        async with admission.admit_async(INFERENCE, request.model_name, admission_timeout(http_request)):
+            with observe(PREDICT_STAGE_LATENCY, "rest", label, "predict"):
+                predictions = await run_in_threadpool(model_service.predict, request.model_name, data)
         if predictions is None:
             raise HTTPException(status_code=404, detail="Model not found or prediction failed")
-        return {"predictions": predictions.tolist()}
+        with observe(PREDICT_STAGE_LATENCY, "rest", label, "serialize"):
+            response = JSONResponse({"predictions": predictions.tolist()})
+        return response
+    except (HTTPException, Overloaded):
+        raise
     except ValueError as e:
         logger.error(f"Value error in predict: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -88,40 +221,170 @@ async def predict(request: PredictRequest):
         logger.error(f"Error in predict endpoint: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
-@app.post("/api/v1/models/retrain")
-async def retrain_model(request: RetrainRequest):
-    success = model_service.retrain_model(
-        request.model_name,
-        request.model_class,
-        request.dataset_name,
-        request.hyperparameters,
-        request.target_column
+@app.post("/api/v1/models/predict/multi")
+async def predict_multi(request: MultiPredictRequest, http_request: Request):
+    try:
+        PREDICT_BATCH_SIZE.labels("rest", "multi").observe(len(request.data))
+        with observe(PREDICT_STAGE_LATENCY, "rest", "multi", "convert"):
+            data = np.array(request.data, dtype=model_service.fanout_input_dtype(request.model_names))
+        timeout = admission_timeout(http_request)
+        async with admission.admit_async(INFERENCE, timeout=timeout):
+            with observe(PREDICT_STAGE_LATENCY, "rest", "multi", "predict"):
+                result = await run_in_threadpool(
+                    model_service.predict_many, request.model_names, data, request.weights, timeout
+                )
+        if not result["predictions"]:
+            raise HTTPException(status_code=404, detail=result["errors"])
+        with observe(PREDICT_STAGE_LATENCY, "rest", "multi", "serialize"):
+            response = JSONResponse({
+                "predictions": {name: p.tolist() for name, p in result["predictions"].items()},
+                "combined": result["combined"].tolist() if result["combined"] is not None else None,
+                "errors": result["errors"]
+            })
+        return response
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/v1/models/{model_name}/predict/raw")
+async def predict_raw(model_name: str, http_request: Request):
+    label = model_service.metric_label(model_name)
+    try:
+        rows, cols = (int(v) for v in http_request.headers.get("x-shape", "").split(","))
+        body = await http_request.body()
+        with observe(PREDICT_STAGE_LATENCY, "rest", label, "convert"):
+            data = decode_matrix(body, rows, cols, http_request.headers.get("x-dtype", "float64"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid matrix payload: {e}")
+    PREDICT_BATCH_SIZE.labels("rest", label).observe(rows)
+    async with admission.admit_async(INFERENCE, model_name, admission_timeout(http_request)):
+        with observe(PREDICT_STAGE_LATENCY, "rest", label, "predict"):
+            predictions = await run_in_threadpool(model_service.predict, model_name, data)
+    if predictions is None:
+        raise HTTPException(status_code=404, detail="Model not found or prediction failed")
+    with observe(PREDICT_STAGE_LATENCY, "rest", label, "serialize"):
+        buffer, dtype = encode_array(predictions)
+    return Response(
+        content=buffer,
+        media_type="application/octet-stream",
+        headers={"X-Dtype": dtype, "X-Shape": str(len(predictions))}
     )
+
+@app.post("/api/v1/models/retrain")
+async def retrain_model(request: RetrainRequest, http_request: Request):
+    async with admission.admit_async(TRAINING, timeout=admission_timeout(http_request, TRAINING)):
+        success = await run_in_threadpool(
+            model_service.retrain_model,
+            request.model_name,
+            request.model_class,
+            request.dataset_name,
+            request.hyperparameters,
+            request.target_column,
+            request.precision
+        )
     if not success:
         raise HTTPException(status_code=400, detail="Failed to retrain model")
-    return {"message": f"Model {request.model_name} retrained successfully"}
+    return {"message": training_message(request.model_name, success, "retrained"), "result": success}
 
 @app.delete("/api/v1/models/{model_name}")
 async def delete_model(model_name: str):
-    success = model_service.delete_model(model_name)
+    success = await run_in_threadpool(model_service.delete_model, model_name)
     if not success:
         raise HTTPException(status_code=404, detail="Model not found")
     return {"message": f"Model {model_name} deleted successfully"}
 
+@app.get("/api/v1/models/{model_name}/versions")
+async def list_model_versions(model_name: str):
+    versions = model_service.list_model_versions(model_name)
+    if not versions:
+        raise HTTPException(status_code=404, detail="Model not found")
+    return {"versions": versions}
+
+@app.put("/api/v1/models/{model_name}/aliases/{alias}")
+async def set_model_alias(model_name: str, alias: str, request: AliasRequest):
+    success = model_service.set_model_alias(model_name, request.version, alias)
+    if not success:
+        raise HTTPException(status_code=404, detail="Model version not found or not warmed")
+    return {"message": f"Alias {alias} of model {model_name} now points to version {request.version}"}
+
+@app.post("/api/v1/models/{model_name}/rollback")
+async def rollback_model(model_name: str):
+    version = model_service.rollback_model(model_name)
+    if version is None:
+        raise HTTPException(status_code=409, detail="No previous version to roll back to")
+    return {"message": f"Model {model_name} rolled back to version {version}"}
+
+def sort_order(order: str) -> bool:
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    return order == "desc"
+
 @app.get("/api/v1/models")
-async def list_models():
-    models = model_service.list_models()
-    return {"models": models}
+def list_models(
+    limit: int = Query(settings.list_page_size, ge=1, le=settings.list_max_page_size),
+    cursor: Optional[str] = None,
+    prefix: Optional[str] = None,
+    model_class: Optional[str] = None,
+    loaded: Optional[bool] = None,
+    sort: str = "name",
+    order: str = "asc"
+):
+    try:
+        # the total is counted for the first page only
+        models, next_cursor, total = model_service.page_models(
+            prefix, model_class, loaded, sort, sort_order(order), cursor, limit, cursor is None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"models": models, "next_cursor": next_cursor, "total": total}
+
+# restarts reset the listing versions, so the ETag also names the process that issued it
+STATE_EPOCH = uuid.uuid4().hex[:12]
+
+@app.get("/api/v1/state")
+def get_state(http_request: Request):
+    # the ETag comes from the listing index versions, so a 304 never builds or hashes the body
+    model_service.refresh_catalog()
+    dataset_service.refresh_catalog()
+    etag = f'"{STATE_EPOCH}-{model_service.catalog.version}-{dataset_service.catalog.version}"'
+    if http_request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    # bounded like the list endpoints: the first page of each listing plus the totals
+    models, _, models_total = model_service.page_models(include_total=True)
+    datasets, _, datasets_total = dataset_service.page_datasets(include_total=True)
+    state = {
+        "models": models,
+        "models_total": models_total,
+        "datasets": datasets,
+        "datasets_total": datasets_total,
+        "model_classes": model_service.get_available_model_classes()
+    }
+    return JSONResponse(state, headers={"ETag": etag})
 
 @app.get("/api/v1/datasets")
-async def list_datasets():
-    datasets = dataset_service.list_datasets()
-    return {"datasets": datasets}
+def list_datasets(
+    limit: int = Query(settings.list_page_size, ge=1, le=settings.list_max_page_size),
+    cursor: Optional[str] = None,
+    prefix: Optional[str] = None,
+    sort: str = "name",
+    order: str = "asc"
+):
+    try:
+        datasets, next_cursor, total = dataset_service.page_datasets(
+            prefix, sort, sort_order(order), cursor, limit, cursor is None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"datasets": datasets, "next_cursor": next_cursor, "total": total}
 
 @app.post("/api/v1/datasets/upload")
 async def upload_dataset(file: UploadFile = File(...)):
+    if not is_safe_name(file.filename):
+        raise HTTPException(status_code=400, detail="Invalid dataset name")
     try:
         import io
+        import pandas as pd
         contents = await file.read()
         file_obj = io.BytesIO(contents)
         
@@ -142,15 +405,93 @@ async def upload_dataset(file: UploadFile = File(...)):
 
 @app.delete("/api/v1/datasets/{dataset_name}")
 async def delete_dataset(dataset_name: str):
-    success = dataset_service.delete_dataset(dataset_name)
+    success = await run_in_threadpool(dataset_service.delete_dataset, dataset_name)
     if not success:
         raise HTTPException(status_code=404, detail="Dataset not found")
     return {"message": f"Dataset {dataset_name} deleted successfully"}
 
 @app.post("/api/v1/models/{model_name}/load")
-async def load_model(model_name: str):
-    success = model_service.load_model_from_clearml(model_name)
+async def load_model(model_name: str, precision: Optional[str] = None):
+    success = await run_in_threadpool(model_service.load_model_from_clearml, model_name, precision)
     if not success:
         raise HTTPException(status_code=404, detail="Model not found in ClearML")
     return {"message": f"Model {model_name} loaded successfully"}
 
+
+@app.get("/api/v1/admin/profiles")
+async def list_profiles():
+    return {"profiles": profile_store.list()}
+
+@app.get("/api/v1/admin/profiles/{profile_id}")
+async def get_profile(profile_id: int, format: str = "prof"):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "text":
+        return PlainTextResponse(render_text(profile))
+    return Response(
+        content=profile["data"],
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="profile_{profile_id}.prof"'}
+    )
+
+@app.post("/api/v1/batch/upload")
+async def submit_batch_upload(model_name: str = Form(...), file: UploadFile = File(...)):
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    job = await run_in_threadpool(batch_service.submit_upload, model_name, file.file, file.filename)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Model not found")
+    return job
+
+@app.post("/api/v1/batch/dataset")
+async def submit_batch_dataset(request: DatasetBatchRequest):
+    try:
+        job = batch_service.submit_dataset(
+            request.model_name,
+            request.dataset_name,
+            request.target_column,
+            request.dvc_version
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Model or dataset not found")
+    return job
+
+@app.get("/api/v1/batch")
+async def list_batch_jobs():
+    return {"jobs": batch_service.list_jobs()}
+
+@app.get("/api/v1/batch/{job_id}")
+async def get_batch_job(job_id: str):
+    job = batch_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return batch_service.job_status(job)
+
+@app.get("/api/v1/batch/{job_id}/progress")
+async def stream_batch_progress(job_id: str, interval: float = 0.5):
+    job = batch_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+
+    async def progress():
+        while True:
+            status = batch_service.job_status(job)
+            status.pop("preview", None)
+            yield json.dumps(status) + "\n"
+            if status["status"] in TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(progress(), media_type=NDJSON_MEDIA_TYPE)
+
+@app.get("/api/v1/batch/{job_id}/download")
+async def download_batch_predictions(job_id: str):
+    job = batch_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Batch job is {job['status']}")
+    return FileResponse(job["output_path"], media_type="text/csv", filename=f"predictions_{job_id}.csv")
@@ -6,14 +6,57 @@ class Settings:
         self.minio_access_key: str = os.getenv("MINIO_ACCESS_KEY", "minioadmin")
         self.minio_secret_key: str = os.getenv("MINIO_SECRET_KEY", "minioadmin")
         self.minio_bucket: str = os.getenv("MINIO_BUCKET", "mlops")
+        self.minio_secure: bool = os.getenv("MINIO_SECURE", "false").lower() == "true"
         self.clearml_api_host: str = os.getenv("CLEARML_API_HOST", "http://localhost:8008")
         self.clearml_web_host: str = os.getenv("CLEARML_WEB_HOST", "http://localhost:8080")
         self.clearml_files_host: str = os.getenv("CLEARML_FILES_HOST", "http://localhost:8081")
         self.models_dir: str = os.getenv("MODELS_DIR", "/app/models")
+        self.model_store_enabled: bool = os.getenv("MODEL_STORE_ENABLED", "false").lower() == "true"
+        self.model_cache_dir: str = os.getenv("MODEL_CACHE_DIR", os.path.join(self.models_dir, "cache"))
+        self.model_store_poll_interval: float = float(os.getenv("MODEL_STORE_POLL_INTERVAL", "5"))
         self.datasets_dir: str = os.getenv("DATASETS_DIR", "/app/datasets")
         self.dvc_remote: str = os.getenv("DVC_REMOTE", "s3://mlops/datasets")
         self.grpc_port: int = int(os.getenv("GRPC_PORT", "50051"))
         self.rest_port: int = int(os.getenv("REST_PORT", "8000"))
+        self.server_mode: str = os.getenv("SERVER_MODE", "combined")
+        self.shutdown_grace_period: float = float(os.getenv("SHUTDOWN_GRACE_PERIOD", "20"))
+        self.shutdown_delay: float = float(os.getenv("SHUTDOWN_DELAY", "5"))
+        self.grpc_max_message_bytes: int = int(os.getenv("GRPC_MAX_MESSAGE_BYTES", str(64 * 1024 * 1024)))
+        self.metrics_port: int = int(os.getenv("METRICS_PORT", "9100"))
+        self.profiling_enabled: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+        self.profile_sample_rate: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0.0"))
+        self.profile_buffer_size: int = int(os.getenv("PROFILE_BUFFER_SIZE", "20"))
+        self.model_versions_retained: int = int(os.getenv("MODEL_VERSIONS_RETAINED", "2"))
+        self.model_warmup_rows: int = int(os.getenv("MODEL_WARMUP_ROWS", "16"))
+        self.model_precision: str = os.getenv("MODEL_PRECISION", "float64")
+        self.float32_max_drift: float = float(os.getenv("FLOAT32_MAX_DRIFT", "1e-4"))
+        self.float32_check_rows: int = int(os.getenv("FLOAT32_CHECK_ROWS", "1000"))
+        self.fanout_workers: int = int(os.getenv("FANOUT_WORKERS", "4"))
+        self.list_page_size: int = int(os.getenv("LIST_PAGE_SIZE", "100"))
+        self.list_max_page_size: int = int(os.getenv("LIST_MAX_PAGE_SIZE", "1000"))
+        self.model_list_refresh_interval: float = float(os.getenv("MODEL_LIST_REFRESH_INTERVAL", "30"))
+        self.dataset_stat_interval: float = float(os.getenv("DATASET_STAT_INTERVAL", "5"))
+        self.max_concurrent_predictions: int = int(os.getenv("MAX_CONCURRENT_PREDICTIONS", "16"))
+        self.max_concurrent_predictions_per_model: int = int(os.getenv("MAX_CONCURRENT_PREDICTIONS_PER_MODEL", "8"))
+        self.max_queued_predictions: int = int(os.getenv("MAX_QUEUED_PREDICTIONS", "64"))
+        self.max_concurrent_trainings: int = int(os.getenv("MAX_CONCURRENT_TRAININGS", "1"))
+        self.max_queued_trainings: int = int(os.getenv("MAX_QUEUED_TRAININGS", "4"))
+        self.admission_timeout: float = float(os.getenv("ADMISSION_TIMEOUT", "30"))
+        # every admitted or queued RPC holds a worker thread, plus headroom for listings, health and profiles
+        admitted_rpcs = (self.max_concurrent_predictions + self.max_queued_predictions
+                         + self.max_concurrent_trainings + self.max_queued_trainings)
+        self.grpc_workers: int = int(os.getenv("GRPC_WORKERS", str(admitted_rpcs + 8)))
+        self.grpc_max_concurrent_rpcs: int = int(os.getenv("GRPC_MAX_CONCURRENT_RPCS", "100"))
+        self.predict_stream_chunk_size: int = int(os.getenv("PREDICT_STREAM_CHUNK_SIZE", "1000"))
+        self.batch_dir: str = os.getenv("BATCH_DIR", "/app/batch")
+        self.batch_chunk_size: int = int(os.getenv("BATCH_CHUNK_SIZE", "10000"))
+        self.batch_workers: int = int(os.getenv("BATCH_WORKERS", "2"))
+        self.batch_processes: int = int(os.getenv("BATCH_PROCESSES", str(os.cpu_count() or 1)))
+        self.batch_max_jobs: int = int(os.getenv("BATCH_MAX_JOBS", "50"))
+        self.batch_preview_rows: int = int(os.getenv("BATCH_PREVIEW_ROWS", "20"))
+        self.model_artifact_format: str = os.getenv("MODEL_ARTIFACT_FORMAT", "joblib")
+        self.model_compression: str = os.getenv("MODEL_COMPRESSION", "")
+        self.model_compression_level: int = int(os.getenv("MODEL_COMPRESSION_LEVEL", "3"))
 
 settings = Settings()
 
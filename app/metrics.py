@@ -0,0 +1,101 @@
+import time
+from contextlib import contextmanager
+from prometheus_client import Counter, Gauge, Histogram
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536)
+TRAINING_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+# label value for model names that do not resolve in the registry, so clients cannot grow label cardinality
+UNKNOWN_MODEL = "unknown"
+
+REQUESTS = Counter(
+    "mlops_requests_total",
+    "Requests handled by the service",
+    ["api", "endpoint", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "mlops_request_duration_seconds",
+    "End-to-end request latency",
+    ["api", "endpoint"],
+    buckets=LATENCY_BUCKETS
+)
+PREDICT_STAGE_LATENCY = Histogram(
+    "mlops_predict_stage_duration_seconds",
+    "Prediction latency per model broken down by stage (parse, convert, predict, serialize)",
+    ["api", "model", "stage"],
+    buckets=LATENCY_BUCKETS
+)
+PREDICT_BATCH_SIZE = Histogram(
+    "mlops_predict_batch_size",
+    "Number of rows per prediction request",
+    ["api", "model"],
+    buckets=BATCH_SIZE_BUCKETS
+)
+TRAINING_DURATION = Histogram(
+    "mlops_training_duration_seconds",
+    "Model training duration",
+    ["model_class"],
+    buckets=TRAINING_BUCKETS
+)
+DATASET_LOAD_DURATION = Histogram(
+    "mlops_dataset_load_duration_seconds",
+    "Dataset load time",
+    buckets=LATENCY_BUCKETS
+)
+CLEARML_LATENCY = Histogram(
+    "mlops_clearml_call_duration_seconds",
+    "ClearML call latency",
+    ["operation"],
+    buckets=LATENCY_BUCKETS
+)
+MODEL_REGISTRY_SIZE = Gauge(
+    "mlops_model_registry_size",
+    "Model versions held in memory, including standby and draining ones"
+)
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "mlops_executor_queue_depth",
+    "Work items waiting for an executor thread",
+    ["executor"]
+)
+ADMISSION_REJECTIONS = Counter(
+    "mlops_admission_rejections_total",
+    "Requests shed by admission control",
+    ["kind", "reason"]
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "mlops_admission_in_flight",
+    "Admitted requests currently running",
+    ["kind"]
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "mlops_admission_queue_depth",
+    "Requests waiting for admission",
+    ["kind"]
+)
+COALESCED_CALLS = Counter(
+    "mlops_coalesced_calls_total",
+    "Calls that waited for an identical in-flight call instead of running it again",
+    ["operation"]
+)
+
+
+@contextmanager
+def observe(histogram, *labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        child = histogram.labels(*labels) if labels else histogram
+        child.observe(time.perf_counter() - start)
+
+
+def track_registry_size(models):
+    MODEL_REGISTRY_SIZE.set_function(models.resident_versions)
+
+
+def track_executor_queue(name: str, executor):
+    # evaluated only at scrape time, so the hot path pays nothing for it
+    # the queue is a ThreadPoolExecutor internal; executors without one report nothing queued
+    work_queue = getattr(executor, "_work_queue", None)
+    EXECUTOR_QUEUE_DEPTH.labels(name).set_function(lambda: work_queue.qsize() if work_queue is not None else 0)
@@ -0,0 +1,92 @@
+import cProfile
+import functools
+import io
+import itertools
+import marshal
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from app.config import settings
+
+PROFILE_HEADER = "x-profile"
+
+profile_requested: ContextVar[bool] = ContextVar("profile_requested", default=False)
+_active = threading.local()
+
+
+class ProfileStore:
+    def __init__(self, maxlen: int):
+        self._profiles = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def add(self, operation: str, label: str, duration: float, profiler: cProfile.Profile) -> int:
+        stats = pstats.Stats(profiler)
+        entry = {
+            "id": next(self._ids),
+            "operation": operation,
+            "label": label,
+            "timestamp": time.time(),
+            "duration": duration,
+            "data": marshal.dumps(stats.stats),
+        }
+        with self._lock:
+            self._profiles.append(entry)
+        return entry["id"]
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{k: v for k, v in p.items() if k != "data"} for p in reversed(self._profiles)]
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for p in self._profiles:
+                if p["id"] == profile_id:
+                    return p
+        return None
+
+
+def render_text(profile: Dict[str, Any], limit: int = 50) -> str:
+    stream = io.StringIO()
+    stats = pstats.Stats(stream=stream)
+    stats.stats = marshal.loads(profile["data"])
+    stats.get_top_level_stats()
+    stats.sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
+
+
+profile_store = ProfileStore(settings.profile_buffer_size)
+
+
+def should_profile() -> bool:
+    if not settings.profiling_enabled:
+        return False
+    if profile_requested.get():
+        return True
+    return settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate
+
+
+def profiled(operation: str):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            # nested calls (e.g. load_dataset inside train_model) are already covered by the outer profile
+            if getattr(_active, "running", False) or not should_profile():
+                return func(self, *args, **kwargs)
+
+            label = str(args[0]) if args else ""
+            profiler = cProfile.Profile()
+            _active.running = True
+            start = time.perf_counter()
+            try:
+                return profiler.runcall(func, self, *args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                _active.running = False
+                profile_store.add(operation, label, duration, profiler)
+        return wrapper
+    return decorator
@@ -0,0 +1,22 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    # flipped once on shutdown, so load balancers stop routing here before the listeners close
+    def __init__(self):
+        self._draining = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return not self._draining.is_set()
+
+    def drain(self):
+        if not self._draining.is_set():
+            self._draining.set()
+            logger.info("Marked the service as not ready")
+
+
+readiness = Readiness()
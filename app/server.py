@@ -0,0 +1,84 @@
+import time
+import logging
+import threading
+import uvicorn
+from app.config import settings
+from app.readiness import readiness
+
+logger = logging.getLogger(__name__)
+
+SERVER_MODES = ("combined", "rest", "grpc")
+
+
+class _Server(uvicorn.Server):
+    # uvicorn owns the signal handlers; the gRPC server starts draining on the same signal
+    def __init__(self, config: uvicorn.Config, grpc_server=None):
+        super().__init__(config)
+        self.grpc_server = grpc_server
+        self.grpc_stopped = None
+        self.stop_started = None
+        self._delay = None
+
+    def handle_exit(self, sig, frame):
+        if self._delay is None:
+            # readiness fails first; the listeners keep serving until the probe has taken the pod out of rotation
+            readiness.drain()
+            logger.info(f"Closing listeners in {settings.shutdown_delay}s")
+            self._delay = threading.Timer(settings.shutdown_delay, self._stop, args=(sig, frame))
+            self._delay.daemon = True
+            self._delay.start()
+            return
+        # a second signal skips the delay
+        self._delay.cancel()
+        self._stop(sig, frame)
+
+    def _stop(self, sig, frame):
+        if self.stop_started is None:
+            self.stop_started = time.monotonic()
+        if self.grpc_server is not None and self.grpc_stopped is None:
+            logger.info(f"Draining gRPC server for up to {settings.shutdown_grace_period}s")
+            self.grpc_stopped = self.grpc_server.stop(settings.shutdown_grace_period)
+        super().handle_exit(sig, frame)
+
+    def grace_remaining(self) -> float:
+        if self.stop_started is None:
+            return 0.0
+        return max(settings.shutdown_grace_period - (time.monotonic() - self.stop_started), 0.0)
+
+
+def run(mode: str = None):
+    mode = mode or settings.server_mode
+    if mode not in SERVER_MODES:
+        raise ValueError(f"Unknown server mode {mode}, expected one of {', '.join(SERVER_MODES)}")
+    if mode == "grpc":
+        from app.api.grpc_server import serve
+        serve()
+        return
+
+    from app.api import rest_api
+    grpc_server = None
+    if mode == "combined":
+        # both APIs share one ModelService, so a model trained or loaded over REST is served over gRPC too;
+        # gRPC metrics are exposed by the REST /metrics endpoint instead of a separate port
+        from app.api.grpc_server import MLServiceServicer, create_server
+        grpc_server = create_server(MLServiceServicer(rest_api.model_service))
+
+    config = uvicorn.Config(
+        rest_api.app,
+        host="0.0.0.0",
+        port=settings.rest_port,
+        timeout_graceful_shutdown=int(settings.shutdown_grace_period)
+    )
+    server = _Server(config, grpc_server)
+    if grpc_server is not None:
+        grpc_server.start()
+        logger.info(f"gRPC server started on port {settings.grpc_port}")
+    try:
+        server.run()
+    finally:
+        if grpc_server is not None:
+            stopped = server.grpc_stopped or grpc_server.stop(settings.shutdown_grace_period)
+            stopped.wait()
+            logger.info("gRPC server stopped")
+        rest_api.batch_service.shutdown(server.grace_remaining())
+        rest_api.model_service.close()
@@ -1,6 +1,7 @@
 from .model_service import ModelService
 from .dataset_service import DatasetService
 from .clearml_service import ClearMLService
+from .batch_service import BatchService
 
-__all__ = ["ModelService", "DatasetService", "ClearMLService"]
+__all__ = ["ModelService", "DatasetService", "ClearMLService", "BatchService"]
 
@@ -0,0 +1,321 @@
+import os
+import time
+import uuid
+import pickle
+import shutil
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict, deque
+from contextlib import ExitStack
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+from app.services.dataset_service import is_safe_name
+from app.services.model_registry import ModelVersion, VERSION_SEPARATOR
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+# DVC-versioned batch outputs live in a subdirectory of the datasets repo, so they are not listed as datasets
+PREDICTIONS_DIR = "predictions"
+
+# models loaded by a pool worker, by artifact path; one per concurrently running job is enough
+_worker_models: "OrderedDict[str, Any]" = OrderedDict()
+
+
+def _predict_chunk(model_path: str, data):
+    # the shared pool serves every job, so each worker loads a job's model on its first chunk and keeps it
+    model = _worker_models.get(model_path)
+    if model is None:
+        with open(model_path, "rb") as f:
+            model = _worker_models[model_path] = pickle.load(f)
+        while len(_worker_models) > settings.batch_workers:
+            _worker_models.popitem(last=False)
+    else:
+        _worker_models.move_to_end(model_path)
+    return model.predict(data)
+
+
+def count_rows(path: str) -> int:
+    lines = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+    # the header line does not hold a row; a missing trailing newline hides one row
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                lines += 1
+    return max(lines - 1, 0)
+
+
+class BatchService:
+    def __init__(self, model_service):
+        self.model_service = model_service
+        self.batch_dir = settings.batch_dir
+        self.chunk_size = settings.batch_chunk_size
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=settings.batch_workers, thread_name_prefix="batch")
+        self._futures: Dict[Future, Tuple[Dict[str, Any], Optional[ExitStack]]] = {}
+        # one pool for all dataset jobs, so concurrent jobs never run more than batch_processes processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        os.makedirs(self.batch_dir, exist_ok=True)
+
+    def _new_job(self, model_name: str, source: str, output_path: Optional[str] = None) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.batch_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        job = {
+            "id": job_id,
+            "model_name": model_name,
+            "source": source,
+            "status": "pending",
+            "total_rows": None,
+            "rows_processed": 0,
+            "chunks_processed": 0,
+            "rows_per_second": 0.0,
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+            "error": None,
+            "preview": [],
+            "dir": job_dir,
+            "output_path": output_path or os.path.join(job_dir, "predictions.csv"),
+            # chunks go to a job-private file that replaces output_path only once the job completes
+            "partial_path": os.path.join(job_dir, "predictions.partial.csv"),
+        }
+        with self._lock:
+            self.jobs[job_id] = job
+            self._evict()
+        return job
+
+    def _evict(self):
+        finished = [j for j in self.jobs.values() if j["status"] in TERMINAL_STATUSES]
+        while len(self.jobs) > settings.batch_max_jobs and finished:
+            job = finished.pop(0)
+            self.jobs.pop(job["id"], None)
+            shutil.rmtree(job["dir"], ignore_errors=True)
+
+    def _pin(self, model_name: str) -> Optional[Tuple[ExitStack, ModelVersion]]:
+        # the job holds the version the request resolved to from submission until it finishes,
+        # so neither an alias move nor a retirement in between changes what it scores with
+        pin = ExitStack()
+        try:
+            return pin, pin.enter_context(self.model_service.models.acquire(model_name))
+        except KeyError:
+            logger.error(f"Model {model_name} not found")
+            return None
+
+    def submit_upload(self, model_name: str, fileobj, filename: str) -> Optional[Dict[str, Any]]:
+        pinned = self._pin(model_name)
+        if pinned is None:
+            return None
+        pin, model_version = pinned
+        with ExitStack() as cleanup:
+            # released right away if anything fails before the job is queued
+            cleanup.push(pin)
+            job = self._new_job(model_name, filename)
+            job["model_version"] = model_version.version
+            input_path = os.path.join(job["dir"], "input.csv")
+            with open(input_path, "wb") as f:
+                shutil.copyfileobj(fileobj, f, 1 << 20)
+            self._submit(job, pin, self._run_csv_job, job, pin, model_version, input_path)
+            cleanup.pop_all()
+        logger.info(f"Submitted batch job {job['id']} for model {model_version.name} version {model_version.version}")
+        return self.job_status(job)
+
+    def _submit(self, job: Dict[str, Any], pin: Optional[ExitStack], fn, *args):
+        future = self._executor.submit(fn, *args)
+        with self._lock:
+            self._futures[future] = (job, pin)
+        future.add_done_callback(self._forget)
+
+    def _forget(self, future: Future):
+        with self._lock:
+            self._futures.pop(future, None)
+
+    def _run_csv_job(self, job: Dict[str, Any], pin: ExitStack, model_version: ModelVersion, input_path: str):
+        import pandas as pd
+        job["status"] = "running"
+        job["started"] = time.time()
+        try:
+            job["total_rows"] = count_rows(input_path)
+            header = True
+            with pin:
+                for chunk in pd.read_csv(input_path, chunksize=self.chunk_size):
+                    self._score_chunk(job, model_version, chunk.values, header)
+                    header = False
+            if header:
+                pd.DataFrame({"prediction": []}).to_csv(job["partial_path"], index=False)
+            os.replace(job["partial_path"], job["output_path"])
+            job["status"] = "completed"
+            logger.info(f"Batch job {job['id']} scored {job['rows_processed']} rows")
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            logger.error(f"Batch job {job['id']} failed: {e}")
+        finally:
+            pin.close()
+            job["finished"] = time.time()
+            for path in (input_path, job["partial_path"]):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def submit_dataset(self, model_name: str, dataset_name: str, target_column: Optional[str] = "target",
+                       version: bool = False) -> Optional[Dict[str, Any]]:
+        base_name = model_name.split(VERSION_SEPARATOR, 1)[0]
+        if not is_safe_name(base_name) or not is_safe_name(dataset_name):
+            raise ValueError("Model and dataset names must be plain file names")
+        dataset_service = self.model_service.dataset_service
+        dataset_path = dataset_service.dataset_path(dataset_name)
+        if not os.path.exists(dataset_path):
+            logger.error(f"Dataset {dataset_name} not found")
+            return None
+        pinned = self._pin(model_name)
+        if pinned is None:
+            return None
+        pin, model_version = pinned
+
+        output_path = None
+        if version:
+            predictions_dir = os.path.join(dataset_service.datasets_dir, PREDICTIONS_DIR)
+            os.makedirs(predictions_dir, exist_ok=True)
+            stem = os.path.splitext(dataset_name)[0]
+            output_path = os.path.join(predictions_dir, f"{stem}_predictions_{base_name}.csv")
+        with ExitStack() as cleanup:
+            cleanup.push(pin)
+            job = self._new_job(model_name, f"dataset:{dataset_name}", output_path)
+            job["model_version"] = model_version.version
+            self._submit(job, pin, self._run_dataset_job, job, pin, model_version, dataset_path, target_column, version)
+            cleanup.pop_all()
+        logger.info(f"Submitted batch job {job['id']} for model {model_version.name} "
+                    f"version {model_version.version} on dataset {dataset_name}")
+        return self.job_status(job)
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            # a worker that died breaks the whole pool, so the next job starts a fresh one
+            if self._pool is None or getattr(self._pool, "_broken", False):
+                self._pool = ProcessPoolExecutor(
+                    max_workers=settings.batch_processes,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def _read_chunks(self, path: str, target_column: Optional[str]):
+        import pandas as pd
+        if path.endswith('.csv'):
+            chunks = pd.read_csv(path, chunksize=self.chunk_size)
+        elif path.endswith('.json'):
+            df = pd.read_json(path)
+            chunks = (df.iloc[i:i + self.chunk_size] for i in range(0, len(df), self.chunk_size))
+        else:
+            raise ValueError(f"Unsupported file format for {path}")
+        for chunk in chunks:
+            if target_column and target_column in chunk.columns:
+                chunk = chunk.drop(columns=[target_column])
+            yield chunk.values
+
+    def _run_dataset_job(self, job: Dict[str, Any], pin: ExitStack, model_version: ModelVersion,
+                         dataset_path: str, target_column: Optional[str], version: bool):
+        import pandas as pd
+        job["status"] = "running"
+        job["started"] = time.time()
+        model_path = os.path.join(job["dir"], "model.pkl")
+        try:
+            if dataset_path.endswith('.csv'):
+                job["total_rows"] = count_rows(dataset_path)
+            # workers load the pinned model from the job directory once; chunks travel as pickled numpy arrays
+            with pin:
+                with open(model_path, "wb") as f:
+                    pickle.dump(model_version.model, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pool = self._process_pool()
+            pending = deque()
+            header = True
+            for data in self._read_chunks(dataset_path, target_column):
+                pending.append(pool.submit(_predict_chunk, model_path, data))
+                if len(pending) >= 2 * settings.batch_processes:
+                    self._write_chunk(job, pending.popleft().result(), header)
+                    header = False
+            while pending:
+                self._write_chunk(job, pending.popleft().result(), header)
+                header = False
+            if header:
+                pd.DataFrame({"prediction": []}).to_csv(job["partial_path"], index=False)
+            if job["total_rows"] is None:
+                job["total_rows"] = job["rows_processed"]
+            os.replace(job["partial_path"], job["output_path"])
+
+            if version:
+                self.model_service.dataset_service.version_file(job["output_path"])
+            job["status"] = "completed"
+            logger.info(f"Batch job {job['id']} scored {job['rows_processed']} rows "
+                        f"at {job['rows_per_second']:.0f} rows/s")
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            logger.error(f"Batch job {job['id']} failed: {e}")
+        finally:
+            pin.close()
+            job["finished"] = time.time()
+            for path in (model_path, job["partial_path"]):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _score_chunk(self, job: Dict[str, Any], model_version: ModelVersion, data, header: bool):
+        predictions = model_version.model.predict(data)
+        self._write_chunk(job, predictions, header)
+
+    def _write_chunk(self, job: Dict[str, Any], predictions, header: bool):
+        import pandas as pd
+        pd.DataFrame({"prediction": predictions}).to_csv(
+            job["partial_path"], mode="w" if header else "a", header=header, index=False
+        )
+        if len(job["preview"]) < settings.batch_preview_rows:
+            job["preview"].extend(predictions[:settings.batch_preview_rows - len(job["preview"])].tolist())
+        job["rows_processed"] += len(predictions)
+        job["chunks_processed"] += 1
+        elapsed = time.time() - job["started"]
+        job["rows_per_second"] = job["rows_processed"] / elapsed if elapsed > 0 else 0.0
+
+    def shutdown(self, timeout: float = 0):
+        # queued jobs are dropped; running ones get up to timeout seconds to finish before the process exits
+        with self._lock:
+            futures = dict(self._futures)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for future, (job, pin) in futures.items():
+            if future.cancelled():
+                job["status"] = "failed"
+                job["error"] = "Service shut down before the job started"
+                if pin is not None:
+                    pin.close()
+        running = [future for future in futures if not future.done()]
+        if running:
+            logger.info(f"Waiting up to {timeout:.0f}s for {len(running)} running batch jobs")
+            _, unfinished = wait(running, timeout=timeout)
+            if unfinished:
+                logger.warning(f"{len(unfinished)} batch jobs did not finish before shutdown")
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+        logger.info("Batch service stopped")
+
+    def job_status(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in job.items() if k not in ("dir", "output_path", "partial_path")}
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self.job_status(j) for j in self.jobs.values()]
@@ -1,14 +1,25 @@
 import os
 import logging
-from typing import Dict, Any, Optional
-import joblib
-from clearml import Task, Model, OutputModel
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from app.config import settings
+from app.services.model_artifacts import save_artifact, load_artifact
+from app.metrics import CLEARML_LATENCY, observe
+from app.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from clearml import Task
 
 logger = logging.getLogger(__name__)
 
+def _clearml():
+    # clearml takes most of a second to import, so it is only pulled in on first use
+    import clearml
+    return clearml
+
 class ClearMLService:
     def __init__(self):
+        self._queries = SingleFlight("clearml_query_models")
+        self._downloads = SingleFlight("clearml_load_model")
         self._initialize_clearml()
 
     def _initialize_clearml(self):
@@ -16,30 +27,37 @@ class ClearMLService:
         os.environ["CLEARML_WEB_HOST"] = settings.clearml_web_host
         os.environ["CLEARML_FILES_HOST"] = settings.clearml_files_host
 
-    def create_experiment(self, model_name: str, model_class: str, hyperparameters: Dict[str, Any]) -> Optional[Task]:
+    def create_experiment(self, model_name: str, model_class: str, hyperparameters: Dict[str, Any]) -> Optional["Task"]:
         try:
-            task = Task.init(
-                project_name="MLOps-HW1",
-                task_name=f"{model_class}_{model_name}",
-                tags=[model_class, model_name]
-            )
-            task.connect(hyperparameters, name="hyperparameters")
+            with observe(CLEARML_LATENCY, "create_experiment"):
+                task = _clearml().Task.init(
+                    project_name="MLOps-HW1",
+                    task_name=f"{model_class}_{model_name}",
+                    tags=[model_class, model_name]
+                )
+                task.connect(hyperparameters, name="hyperparameters")
             logger.info(f"Created ClearML experiment for model {model_name}")
             return task
         except Exception as e:
             logger.warning(f"Could not create ClearML experiment: {e}. Continuing without ClearML.")
             return None
 
-    def save_model(self, task: Optional[Task], model, model_name: str, model_class: str) -> str:
-        model_path = f"{settings.models_dir}/{model_name}.pkl"
+    def save_model(self, task: Optional["Task"], model, model_name: str, model_class: str) -> str:
         os.makedirs(settings.models_dir, exist_ok=True)
-        joblib.dump(model, model_path)
+        model_path = save_artifact(
+            model,
+            f"{settings.models_dir}/{model_name}",
+            settings.model_artifact_format,
+            settings.model_compression or None,
+            settings.model_compression_level
+        )
 
         if task is not None:
             try:
-                output_model = OutputModel(task=task, name=model_name, framework="scikit-learn")
-                output_model.update_weights(model_path)
-                output_model.set_labels({"model_class": model_class, "model_name": model_name})
+                with observe(CLEARML_LATENCY, "save_model"):
+                    output_model = _clearml().OutputModel(task=task, name=model_name, framework="scikit-learn")
+                    output_model.update_weights(model_path)
+                    output_model.set_labels({"model_class": model_class, "model_name": model_name})
                 logger.info(f"Saved model {model_name} to ClearML")
             except Exception as e:
                 logger.warning(f"Could not save model to ClearML: {e}. Model saved locally.")
@@ -47,9 +65,20 @@ class ClearMLService:
             logger.info(f"Saved model {model_name} locally (ClearML not available)")
         return model_path
 
+    def _query_models(self) -> list:
+        with observe(CLEARML_LATENCY, "query_models"):
+            return _clearml().Model.query_models(project_name="MLOps-HW1", only_published=False)
+
+    def query_models(self) -> list:
+        return self._queries.do("query_models", self._query_models)
+
     def load_model(self, model_name: str) -> Optional[Any]:
+        # concurrent loads of one model share a single download and deserialization
+        return self._downloads.do(model_name, self._load_model, model_name)
+
+    def _load_model(self, model_name: str) -> Optional[Any]:
         try:
-            models = Model.query_models(project_name="MLOps-HW1", only_published=False)
+            models = self.query_models()
             if not models:
                 logger.warning(f"No models found in ClearML")
                 return None
@@ -60,8 +89,9 @@ class ClearMLService:
                 return None
 
             model_obj = matching_models[0]
-            model_path = model_obj.get_local_copy()
-            model = joblib.load(model_path)
+            with observe(CLEARML_LATENCY, "download_model"):
+                model_path = model_obj.get_local_copy()
+            model = load_artifact(model_path)
             logger.info(f"Loaded model {model_name} from ClearML")
             return model
         except Exception as e:
@@ -70,15 +100,20 @@ class ClearMLService:
 
     def list_models(self) -> list:
         try:
-            models = Model.query_models(project_name="MLOps-HW1", only_published=False)
-            return [{"name": m.name, "id": m.id, "created": str(m.created)} for m in models]
+            models = self.query_models()
+            return [{
+                "name": m.name,
+                "id": m.id,
+                "created": str(m.created),
+                "model_class": (getattr(m, "labels", None) or {}).get("model_class")
+            } for m in models]
         except Exception as e:
             logger.error(f"Error listing models from ClearML: {e}")
             return []
 
     def delete_model(self, model_name: str) -> bool:
         try:
-            models = Model.query_models(project_name="MLOps-HW1", only_published=False)
+            models = self.query_models()
             if not models:
                 return False
             
@@ -86,7 +121,8 @@ class ClearMLService:
             if not matching_models:
                 return False
             
-            matching_models[0].delete()
+            with observe(CLEARML_LATENCY, "delete_model"):
+                matching_models[0].delete()
             logger.info(f"Deleted model {model_name} from ClearML")
             return True
         except Exception as e:
@@ -1,62 +1,143 @@
 import os
+import time
 import logging
-import pandas as pd
 import json
-from typing import List, Dict, Optional
-from dvc.repo import Repo
+import threading
+from typing import TYPE_CHECKING, Any, List, Dict, Optional
 from app.config import settings
+from app.services.listing import ListingIndex
+from app.metrics import DATASET_LOAD_DURATION, observe
+from app.profiling import profiled
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+_UNSET = object()
+
+DATASET_EXTENSIONS = ('.csv', '.json')
+
+
+def is_safe_name(name: str) -> bool:
+    # names become file names, so anything that could leave the target directory is rejected
+    return bool(name) and name not in (".", "..") and os.path.basename(name) == name and "\\" not in name
+
 class DatasetService:
     def __init__(self):
         self.datasets_dir = settings.datasets_dir
         os.makedirs(self.datasets_dir, exist_ok=True)
+        self._dvc_repo = _UNSET
+        self._dvc_lock = threading.Lock()
+        self.catalog = ListingIndex(["name", "size", "modified"])
+        self._catalog_mtime: Optional[int] = None
+        self._catalog_checked = 0.0
+        self._catalog_lock = threading.Lock()
+
+    @property
+    def dvc_repo(self):
+        if self._dvc_repo is _UNSET:
+            with self._dvc_lock:
+                if self._dvc_repo is _UNSET:
+                    self._dvc_repo = self._open_dvc_repo()
+        return self._dvc_repo
+
+    def _open_dvc_repo(self):
         try:
-            self.dvc_repo = Repo(self.datasets_dir)
+            from dvc.repo import Repo
+            return Repo(self.datasets_dir)
         except Exception as e:
             logger.warning(f"Could not initialize DVC repo: {e}")
-            self.dvc_repo = None
+            return None
 
-    def list_datasets(self) -> List[Dict[str, str]]:
-        datasets = []
-        if not os.path.exists(self.datasets_dir):
-            return datasets
+    def dataset_path(self, filename: str) -> Optional[str]:
+        if not is_safe_name(filename):
+            logger.error(f"Invalid dataset name {filename}")
+            return None
+        return os.path.join(self.datasets_dir, filename)
+
+    def _dataset_record(self, filename: str, filepath: str, stat: os.stat_result) -> Dict[str, Any]:
+        return {
+            "name": filename,
+            "size": stat.st_size,
+            "path": filepath,
+            "modified": stat.st_mtime
+        }
 
-        for filename in os.listdir(self.datasets_dir):
-            filepath = os.path.join(self.datasets_dir, filename)
-            if os.path.isfile(filepath) and (filename.endswith('.csv') or filename.endswith('.json')):
-                size = os.path.getsize(filepath)
-                datasets.append({
-                    "name": filename,
-                    "size": size,
-                    "path": filepath
-                })
-        logger.info(f"Listed {len(datasets)} datasets")
-        return datasets
-
-    def load_dataset(self, filename: str) -> Optional[pd.DataFrame]:
+    def _index_dataset(self, filename: str):
         filepath = os.path.join(self.datasets_dir, filename)
+        try:
+            self.catalog.put(filename, self._dataset_record(filename, filepath, os.stat(filepath)))
+        except OSError:
+            self.catalog.remove(filename)
+
+    def refresh_catalog(self):
+        # files can also appear through DVC or a shared volume, so the directory is rescanned
+        # whenever its mtime changes. Rewriting a file in place leaves the directory mtime alone,
+        # so indexed files are also re-stat'ed, at most every dataset_stat_interval seconds
+        try:
+            mtime = os.stat(self.datasets_dir).st_mtime_ns
+        except OSError:
+            self.catalog.replace({})
+            return
+        with self._catalog_lock:
+            now = time.monotonic()
+            if mtime == self._catalog_mtime:
+                if now - self._catalog_checked >= settings.dataset_stat_interval:
+                    for record in self.catalog.all():
+                        self._index_dataset(record["name"])
+                    self._catalog_checked = now
+                return
+            records = {}
+            with os.scandir(self.datasets_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(DATASET_EXTENSIONS):
+                        records[entry.name] = self._dataset_record(entry.name, entry.path, entry.stat())
+            self.catalog.replace(records)
+            self._catalog_mtime = mtime
+            self._catalog_checked = now
+        logger.info(f"Indexed {len(records)} datasets")
+
+    def list_datasets(self) -> List[Dict[str, Any]]:
+        self.refresh_catalog()
+        return self.catalog.all()
+
+    def page_datasets(self, prefix: Optional[str] = None, sort_by: str = "name", descending: bool = False,
+                      cursor: Optional[str] = None, limit: Optional[int] = None, include_total: bool = False):
+        self.refresh_catalog()
+        match = (lambda record: record["name"].startswith(prefix)) if prefix else None
+        limit = min(limit or settings.list_page_size, settings.list_max_page_size)
+        return self.catalog.page(match, sort_by, descending, cursor, limit, include_total)
+
+    @profiled("load_dataset")
+    def load_dataset(self, filename: str) -> Optional["pd.DataFrame"]:
+        filepath = self.dataset_path(filename)
+        if filepath is None:
+            return None
         if not os.path.exists(filepath):
             logger.error(f"Dataset {filename} not found")
             return None
 
         try:
-            if filename.endswith('.csv'):
-                df = pd.read_csv(filepath)
-            elif filename.endswith('.json'):
-                df = pd.read_json(filepath)
-            else:
-                logger.error(f"Unsupported file format for {filename}")
-                return None
+            import pandas as pd
+            with observe(DATASET_LOAD_DURATION):
+                if filename.endswith('.csv'):
+                    df = pd.read_csv(filepath)
+                elif filename.endswith('.json'):
+                    df = pd.read_json(filepath)
+                else:
+                    logger.error(f"Unsupported file format for {filename}")
+                    return None
             logger.info(f"Loaded dataset {filename}")
             return df
         except Exception as e:
             logger.error(f"Error loading dataset {filename}: {e}")
             return None
 
-    def save_dataset(self, filename: str, data: pd.DataFrame) -> bool:
-        filepath = os.path.join(self.datasets_dir, filename)
+    def save_dataset(self, filename: str, data: "pd.DataFrame") -> bool:
+        filepath = self.dataset_path(filename)
+        if filepath is None:
+            return False
         try:
             if filename.endswith('.csv'):
                 data.to_csv(filepath, index=False)
@@ -70,13 +151,28 @@ class DatasetService:
                 self.dvc_repo.add(filepath)
                 self.dvc_repo.commit(f"Add dataset {filename}")
                 logger.info(f"Saved and committed dataset {filename} to DVC")
+            self._index_dataset(filename)
             return True
         except Exception as e:
             logger.error(f"Error saving dataset {filename}: {e}")
             return False
 
+    def version_file(self, filepath: str) -> bool:
+        if not self.dvc_repo:
+            return False
+        try:
+            self.dvc_repo.add(filepath)
+            self.dvc_repo.commit(f"Add {os.path.basename(filepath)}")
+            logger.info(f"Committed {filepath} to DVC")
+            return True
+        except Exception as e:
+            logger.error(f"Error committing {filepath} to DVC: {e}")
+            return False
+
     def delete_dataset(self, filename: str) -> bool:
-        filepath = os.path.join(self.datasets_dir, filename)
+        filepath = self.dataset_path(filename)
+        if filepath is None:
+            return False
         if not os.path.exists(filepath):
             logger.error(f"Dataset {filename} not found")
             return False
@@ -85,6 +181,7 @@ class DatasetService:
             if self.dvc_repo:
                 self.dvc_repo.remove(filepath)
             os.remove(filepath)
+            self.catalog.remove(filename)
             logger.info(f"Deleted dataset {filename}")
             return True
         except Exception as e:
@@ -0,0 +1,121 @@
+import json
+import base64
+import bisect
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+
+
+def _sort_value(value: Any) -> Tuple[bool, Any]:
+    # missing values sort last in ascending order
+    return (value is None, value if value is not None else "")
+
+
+def encode_cursor(sort_by: str, descending: bool, key: Tuple[bool, Any], name: str) -> str:
+    payload = json.dumps([sort_by, descending, list(key), name], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, bool, Tuple[bool, Any], str]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_by, descending, key, name = json.loads(payload)
+        return sort_by, bool(descending), tuple(key), name
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class ListingIndex:
+    # name -> record; each sorted view is rebuilt lazily, only after the records changed
+    def __init__(self, sort_fields: List[str]):
+        self.sort_fields = sort_fields
+        self._records: Dict[str, Record] = {}
+        self._views: Dict[str, List[Tuple[Tuple[bool, Any], str]]] = {}
+        self._lock = threading.Lock()
+        # bumped on every effective change, so callers can tell the listing changed without reading it
+        self.version = 0
+
+    def _changed(self):
+        self._views.clear()
+        self.version += 1
+
+    def put(self, name: str, record: Record):
+        with self._lock:
+            if self._records.get(name) != record:
+                self._records[name] = record
+                self._changed()
+
+    def remove(self, name: str):
+        with self._lock:
+            if self._records.pop(name, None) is not None:
+                self._changed()
+
+    def replace(self, records: Dict[str, Record]):
+        with self._lock:
+            if records != self._records:
+                self._records = dict(records)
+                self._changed()
+
+    def get(self, name: str) -> Optional[Record]:
+        with self._lock:
+            record = self._records.get(name)
+            return dict(record) if record is not None else None
+
+    def all(self) -> List[Record]:
+        with self._lock:
+            return [dict(self._records[name]) for _, name in self._view("name")]
+
+    def _view(self, sort_by: str) -> List[Tuple[Tuple[bool, Any], str]]:
+        view = self._views.get(sort_by)
+        if view is None:
+            view = self._views[sort_by] = sorted(
+                (_sort_value(record.get(sort_by)), name) for name, record in self._records.items()
+            )
+        return view
+
+    def page(self, match: Optional[Callable[[Record], bool]] = None, sort_by: str = "name",
+             descending: bool = False, cursor: Optional[str] = None, limit: int = 100,
+             include_total: bool = False) -> Tuple[List[Record], Optional[str], Optional[int]]:
+        # keyset pagination: the cursor holds the sort key of the last returned record,
+        # so records added or removed between pages neither repeat nor shift the next page.
+        # Counting matches scans every record, so the total is only computed when asked for
+        if sort_by not in self.sort_fields:
+            raise ValueError(f"Unknown sort field {sort_by}, expected one of {', '.join(self.sort_fields)}")
+        if limit < 1:
+            raise ValueError("Page size must be positive")
+        after = None
+        if cursor:
+            cursor_sort, cursor_descending, key, name = decode_cursor(cursor)
+            if (cursor_sort, cursor_descending) != (sort_by, descending):
+                raise ValueError("Cursor was issued for a different sort order")
+            after = (key, name)
+
+        with self._lock:
+            view = self._view(sort_by)
+            if descending:
+                start = bisect.bisect_left(view, after) - 1 if after is not None else len(view) - 1
+                positions = range(start, -1, -1)
+            else:
+                start = bisect.bisect_right(view, after) if after is not None else 0
+                positions = range(start, len(view))
+
+            items, last, has_more = [], None, False
+            for position in positions:
+                record = self._records[view[position][1]]
+                if match is not None and not match(record):
+                    continue
+                if len(items) == limit:
+                    has_more = True
+                    break
+                items.append(dict(record))
+                last = view[position]
+            total = None
+            if include_total:
+                total = len(self._records) if match is None else sum(1 for r in self._records.values() if match(r))
+
+        next_cursor = encode_cursor(sort_by, descending, last[0], last[1]) if has_more else None
+        return items, next_cursor, total
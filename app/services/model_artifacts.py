@@ -0,0 +1,168 @@
+import os
+import logging
+from typing import Any, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMATS = ("joblib", "npz")
+NPZ_CODECS = (None, "zlib")
+PRECISIONS = ("float64", "float32")
+FLOAT_ARRAYS = ("coef", "intercept", "threshold", "value")
+
+
+class NpzLinearModel:
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray):
+        self.coef_ = coef
+        self.intercept_ = intercept
+
+    @property
+    def n_features_in_(self) -> int:
+        return self.coef_.shape[-1]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=self.coef_.dtype)
+        return X @ self.coef_.T + self.intercept_
+
+
+class NpzForestModel:
+    def __init__(self, children_left: np.ndarray, children_right: np.ndarray, feature: np.ndarray,
+                 threshold: np.ndarray, value: np.ndarray, tree_offsets: np.ndarray,
+                 n_features_in_: Optional[int] = None):
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.tree_offsets = tree_offsets
+        # artifacts written before the feature count was stored leave it unknown
+        self.n_features_in_ = n_features_in_
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # sklearn evaluates tree splits on float32 inputs, so do the same to keep predictions identical
+        X = np.asarray(X, dtype=np.float32)
+        n_samples = X.shape[0]
+        rows = np.arange(n_samples)
+        nodes = np.repeat(self.tree_offsets[:, None], n_samples, axis=1)
+        active = self.children_left[nodes] != -1
+        while active.any():
+            tree_idx, sample_idx = np.nonzero(active)
+            current = nodes[tree_idx, sample_idx]
+            go_left = X[rows[sample_idx], self.feature[current]] <= self.threshold[current]
+            nodes[tree_idx, sample_idx] = np.where(go_left, self.children_left[current], self.children_right[current])
+            active = self.children_left[nodes] != -1
+        return self.value[nodes].mean(axis=0)
+
+
+def artifact_extension(artifact_format: str) -> str:
+    return ".npz" if artifact_format == "npz" else ".pkl"
+
+
+def _linear_arrays(model) -> dict:
+    return {
+        "kind": np.array("linear"),
+        "coef": np.asarray(model.coef_),
+        "intercept": np.asarray(model.intercept_),
+    }
+
+
+def _forest_arrays(model) -> dict:
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    node_counts = np.array([tree.node_count for tree in trees], dtype=np.int64)
+    tree_offsets = np.concatenate([[0], np.cumsum(node_counts)[:-1]]).astype(np.int64)
+
+    children_left, children_right = [], []
+    for tree, offset in zip(trees, tree_offsets):
+        # child indices are made global so every tree lives in one flat array; leaves stay at -1
+        left = tree.children_left.astype(np.int64)
+        right = tree.children_right.astype(np.int64)
+        children_left.append(np.where(left == -1, -1, left + offset))
+        children_right.append(np.where(right == -1, -1, right + offset))
+
+    return {
+        "kind": np.array("forest"),
+        "children_left": np.concatenate(children_left),
+        "children_right": np.concatenate(children_right),
+        "feature": np.concatenate([np.maximum(tree.feature, 0).astype(np.int64) for tree in trees]),
+        "threshold": np.concatenate([tree.threshold for tree in trees]),
+        "value": np.concatenate([tree.value[:, 0, 0] for tree in trees]),
+        "tree_offsets": tree_offsets,
+        "n_features_in_": np.array(model.n_features_in_, dtype=np.int64),
+    }
+
+
+def to_arrays(model) -> Optional[dict]:
+    # classifiers predict labels rather than the raw linear or tree output, so they keep the generic path
+    if hasattr(model, "coef_") and hasattr(model, "intercept_") and not hasattr(model, "classes_"):
+        return _linear_arrays(model)
+    if hasattr(model, "estimators_") and all(hasattr(e, "tree_") for e in model.estimators_):
+        if getattr(model, "n_outputs_", 1) == 1 and not hasattr(model, "classes_"):
+            return _forest_arrays(model)
+    return None
+
+
+def from_arrays(arrays) -> Any:
+    kind = str(arrays["kind"])
+    if kind == "linear":
+        return NpzLinearModel(arrays["coef"], arrays["intercept"])
+    if kind == "forest":
+        n_features = arrays["n_features_in_"] if "n_features_in_" in arrays else None
+        return NpzForestModel(
+            arrays["children_left"],
+            arrays["children_right"],
+            arrays["feature"],
+            arrays["threshold"],
+            arrays["value"],
+            arrays["tree_offsets"],
+            int(n_features) if n_features is not None else None,
+        )
+    raise ValueError(f"Unknown npz model kind: {kind}")
+
+
+def to_float32(model) -> Optional[Any]:
+    # same flat layout as npz artifacts, with parameters stored in float32 so inference never upcasts
+    if isinstance(model, NpzForestModel):
+        arrays = {"kind": np.array("forest"), **vars(model)}
+    else:
+        arrays = to_arrays(model)
+    if arrays is None:
+        return None
+    for key in FLOAT_ARRAYS:
+        if key in arrays:
+            arrays[key] = arrays[key].astype(np.float32)
+    return from_arrays(arrays)
+
+
+def save_artifact(model, path_without_ext: str, artifact_format: str = "joblib",
+                  compression: Optional[str] = None, compression_level: int = 3) -> str:
+    if artifact_format not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format: {artifact_format}")
+
+    if artifact_format == "npz":
+        arrays = to_arrays(model)
+        if arrays is None:
+            logger.warning(f"Model {type(model).__name__} has no npz layout, falling back to joblib")
+            artifact_format = "joblib"
+        else:
+            path = path_without_ext + ".npz"
+            if compression not in NPZ_CODECS:
+                logger.warning(f"npz artifacts only support zlib compression, using zlib instead of {compression}")
+            if compression:
+                np.savez_compressed(path, **arrays)
+            else:
+                np.savez(path, **arrays)
+            return path
+
+    import joblib
+    path = path_without_ext + ".pkl"
+    compress = (compression, compression_level) if compression else 0
+    joblib.dump(model, path, compress=compress)
+    return path
+
+
+def load_artifact(path: str) -> Any:
+    if os.path.splitext(path)[1] == ".npz":
+        with np.load(path, allow_pickle=False) as arrays:
+            return from_arrays(arrays)
+    import joblib
+    return joblib.load(path)
@@ -0,0 +1,196 @@
+import time
+import logging
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALIAS = "prod"
+VERSION_SEPARATOR = "@"
+
+
+def parse_model_ref(model_ref: str) -> Tuple[str, Optional[str]]:
+    # "name" -> serving alias, "name@7" -> pinned version, "name@canary" -> named alias
+    if VERSION_SEPARATOR in model_ref:
+        name, ref = model_ref.rsplit(VERSION_SEPARATOR, 1)
+        return name, ref
+    return model_ref, None
+
+
+class ModelVersion:
+    def __init__(self, name: str, version: int, model: Any, source: str, precision: str = "float64"):
+        self.name = name
+        self.version = version
+        self.model = model
+        self.source = source
+        self.precision = precision
+        self.created = time.time()
+        self.state = "candidate"
+        self.refcount = 0
+        self.warmed = False
+
+    def info(self, aliases: List[str]) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "state": self.state,
+            "aliases": aliases,
+            "source": self.source,
+            "precision": self.precision,
+            "created": self.created,
+            "in_flight": self.refcount,
+            "warmed": self.warmed,
+        }
+
+
+class ModelRegistry(Mapping):
+    def __init__(self, versions_retained: int = 2):
+        self.versions_retained = versions_retained
+        self._versions: Dict[str, Dict[int, ModelVersion]] = {}
+        self._aliases: Dict[str, Dict[str, int]] = {}
+        self._next_version: Dict[str, int] = {}
+        self._draining: set = set()
+        self._lock = threading.RLock()
+
+    # Mapping interface: model name (or name@ref) -> model served under it
+    def __getitem__(self, model_ref: str) -> Any:
+        with self._lock:
+            version = self._resolve(model_ref)
+            if version is None:
+                raise KeyError(model_ref)
+            return version.model
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter([name for name, aliases in self._aliases.items() if DEFAULT_ALIAS in aliases])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for aliases in self._aliases.values() if DEFAULT_ALIAS in aliases)
+
+    def _resolve(self, model_ref: str) -> Optional[ModelVersion]:
+        name, ref = parse_model_ref(model_ref)
+        versions = self._versions.get(name, {})
+        if ref is not None and ref.isdigit():
+            version = versions.get(int(ref))
+            return version if version is not None and version.warmed else None
+        version = self._aliases.get(name, {}).get(ref or DEFAULT_ALIAS)
+        return versions.get(version) if version is not None else None
+
+    def reserve(self, name: str) -> int:
+        # version numbers follow the order work started in, not the order it finished
+        with self._lock:
+            number = self._next_version.get(name, 1)
+            self._next_version[name] = number + 1
+            return number
+
+    def register(self, name: str, model: Any, source: str = "train", precision: str = "float64",
+                 number: Optional[int] = None) -> ModelVersion:
+        with self._lock:
+            if number is None:
+                number = self.reserve(name)
+            version = ModelVersion(name, number, model, source, precision)
+            self._versions.setdefault(name, {})[number] = version
+            logger.info(f"Registered model {name} version {number}")
+            return version
+
+    def discard(self, name: str, number: int):
+        with self._lock:
+            version = self._versions.get(name, {}).get(number)
+            if version is not None and not self._aliases_of(name, number):
+                self._retire(version)
+
+    def set_alias(self, name: str, number: int, alias: str = DEFAULT_ALIAS, forward_only: bool = False) -> bool:
+        with self._lock:
+            version = self._versions.get(name, {}).get(number)
+            if version is None or version.state in ("draining", "freed"):
+                return False
+            if not version.warmed:
+                logger.error(f"Model {name} version {number} is not warmed, refusing to route traffic to it")
+                return False
+            previous = self._aliases.get(name, {}).get(alias)
+            if forward_only and previous is not None and previous > number:
+                logger.warning(f"Not moving {name}{VERSION_SEPARATOR}{alias} back from version {previous} to {number}")
+                return False
+            aliases = self._aliases.setdefault(name, {})
+            aliases[alias] = number
+            version.state = "serving"
+            if previous is not None and previous != number and not self._aliases_of(name, previous):
+                self._versions[name][previous].state = "standby"
+            self._enforce_retention(name)
+            logger.info(f"Alias {name}{VERSION_SEPARATOR}{alias} -> version {number} (was {previous})")
+            return True
+
+    def previous_version(self, name: str, alias: str = DEFAULT_ALIAS) -> Optional[int]:
+        with self._lock:
+            current = self._aliases.get(name, {}).get(alias)
+            standby = [n for n, v in self._versions.get(name, {}).items()
+                       if v.state == "standby" and (current is None or n < current)]
+            return max(standby) if standby else None
+
+    def remove(self, name: str) -> bool:
+        with self._lock:
+            versions = self._versions.pop(name, {})
+            self._aliases.pop(name, None)
+            for version in versions.values():
+                self._retire(version, unlink=False)
+            return bool(versions)
+
+    @contextmanager
+    def acquire(self, model_ref: str):
+        with self._lock:
+            version = self._resolve(model_ref)
+            if version is None:
+                raise KeyError(model_ref)
+            version.refcount += 1
+        try:
+            yield version
+        finally:
+            with self._lock:
+                version.refcount -= 1
+                if version.state == "draining" and version.refcount == 0:
+                    self._free(version)
+
+    def versions(self, name: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [v.info(self._aliases_of(name, n)) for n, v in sorted(self._versions.get(name, {}).items())]
+
+    def resident_versions(self) -> int:
+        # standby and draining versions hold their model in memory as well as the serving ones
+        with self._lock:
+            return sum(len(versions) for versions in self._versions.values()) + len(self._draining)
+
+    def serving_version(self, name: str) -> Optional[int]:
+        with self._lock:
+            return self._aliases.get(name, {}).get(DEFAULT_ALIAS)
+
+    def precision(self, model_ref: str) -> Optional[str]:
+        with self._lock:
+            version = self._resolve(model_ref)
+            return version.precision if version is not None else None
+
+    def _aliases_of(self, name: str, number: int) -> List[str]:
+        return [alias for alias, n in self._aliases.get(name, {}).items() if n == number]
+
+    def _enforce_retention(self, name: str):
+        standby = sorted(n for n, v in self._versions[name].items() if v.state == "standby")
+        for number in standby[:max(len(standby) - self.versions_retained, 0)]:
+            self._retire(self._versions[name][number])
+
+    def _retire(self, version: ModelVersion, unlink: bool = True):
+        if unlink:
+            self._versions.get(version.name, {}).pop(version.version, None)
+        if version.refcount > 0:
+            version.state = "draining"
+            self._draining.add(version)
+            logger.info(f"Model {version.name} version {version.version} draining {version.refcount} requests")
+        else:
+            self._free(version)
+
+    def _free(self, version: ModelVersion):
+        self._draining.discard(version)
+        version.state = "freed"
+        version.model = None
+        logger.info(f"Freed model {version.name} version {version.version}")
@@ -1,137 +1,464 @@
 import os
+import time
 import logging
+import importlib
+import threading
+import contextvars
 import numpy as np
-import pandas as pd
-from typing import Dict, Any, Optional, List
-from app.models import LinearRegressionModel, RandomForestModel, BaseMLModel
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Sequence
 from app.services.clearml_service import ClearMLService
 from app.services.dataset_service import DatasetService
+from app.services.model_registry import ModelRegistry, ModelVersion, DEFAULT_ALIAS, VERSION_SEPARATOR, parse_model_ref
+from app.services.model_artifacts import PRECISIONS, to_float32, load_artifact
+from app.services.model_store import ModelStore
+from app.services.listing import ListingIndex
 from app.config import settings
+from app.admission import admission, Overloaded
+from app.metrics import TRAINING_DURATION, UNKNOWN_MODEL, observe
+from app.profiling import profiled
+from app.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from app.models import BaseMLModel
 
 logger = logging.getLogger(__name__)
 
+# train_model outcomes; a superseded fit succeeded but a newer training of the same model already serves
+TRAINED = "trained"
+SUPERSEDED = "superseded"
+
+def training_message(model_name: str, result: str, verb: str = "trained") -> str:
+    if result == SUPERSEDED:
+        return f"Model {model_name} {verb}, but a newer training of it already serves; this version was dropped"
+    return f"Model {model_name} {verb} successfully"
+
+def _load_model_class(class_name: str):
+    # app.models pulls in scikit-learn, which is only needed once a model is trained or loaded
+    return getattr(importlib.import_module("app.models"), class_name)
+
+def _relative_drift(reference, candidate, X: np.ndarray) -> float:
+    expected = np.asarray(reference.predict(X), dtype=np.float64)
+    actual = np.asarray(candidate.predict(X), dtype=np.float64)
+    if expected.size == 0:
+        return 0.0
+    scale = max(float(np.max(np.abs(expected))), float(np.finfo(np.float32).tiny))
+    return float(np.max(np.abs(actual - expected))) / scale
+
 class ModelService:
     _model_classes = {
-        "LinearRegression": LinearRegressionModel,
-        "RandomForest": RandomForestModel
+        "LinearRegression": "LinearRegressionModel",
+        "RandomForest": "RandomForestModel"
     }
 
     def __init__(self):
-        self.models: Dict[str, BaseMLModel] = {}
+        self.models = ModelRegistry(settings.model_versions_retained)
         self.clearml_service = ClearMLService()
         self.dataset_service = DatasetService()
+        self._loads = SingleFlight("load_model")
+        self.fanout_executor = ThreadPoolExecutor(max_workers=settings.fanout_workers, thread_name_prefix="fanout")
+        self.catalog = ListingIndex(["name", "created", "version"])
+        self._clearml_models: Dict[str, Dict[str, Any]] = {}
+        self._catalog_refreshed: Optional[float] = None
+        self._catalog_lock = threading.Lock()
+        self._catalog_refreshes = SingleFlight("model_catalog")
         os.makedirs(settings.models_dir, exist_ok=True)
+        self.store: Optional[ModelStore] = None
+        self._store_revisions: Dict[str, str] = {}
+        self._store_lock = threading.Lock()
+        self._store_stop = threading.Event()
+        if settings.model_store_enabled:
+            self._start_store()
+
+    def _start_store(self):
+        try:
+            self.store = ModelStore()
+        except Exception as e:
+            logger.error(f"Could not connect to the model store, serving local models only: {e}")
+            return
+        threading.Thread(target=self._watch_store, name="model-store-watch", daemon=True).start()
+
+    def _watch_store(self):
+        # the first sync runs right away so a new replica serves every published model
+        while True:
+            try:
+                self.sync_from_store()
+            except Exception as e:
+                logger.warning(f"Model store sync failed: {e}")
+            if self._store_stop.wait(settings.model_store_poll_interval):
+                return
+
+    def close(self):
+        self._store_stop.set()
+        self.fanout_executor.shutdown(wait=True)
+
+    def sync_from_store(self) -> int:
+        manifests, removed = self.store.poll()
+        loaded = 0
+        for manifest in manifests:
+            with self._store_lock:
+                if self._store_revisions.get(manifest["name"]) == manifest["revision"]:
+                    continue
+            if self._loads.do((manifest["name"], manifest["revision"]), self._load_from_store, manifest):
+                loaded += 1
+        for model_name in removed:
+            with self._store_lock:
+                self._store_revisions.pop(model_name, None)
+            self.models.remove(model_name)
+            self._index_model(model_name)
+            logger.info(f"Model {model_name} was removed from the model store")
+        return loaded
+
+    def _load_from_store(self, manifest: Dict[str, Any], precision: Optional[str] = None) -> bool:
+        model_name = manifest["name"]
+        try:
+            model_instance = self._wrap_model(load_artifact(self.store.fetch(manifest)))
+            precision = precision or manifest.get("precision")
+            if self._publish(model_name, model_instance, "store", precision=precision) is None:
+                return False
+            with self._store_lock:
+                self._store_revisions[model_name] = manifest["revision"]
+            logger.info(f"Loaded model {model_name} revision {manifest['revision']} from the model store")
+            return True
+        except Exception as e:
+            logger.error(f"Error loading model {model_name} from the model store: {e}")
+            return False
+
+    def _publish_to_store(self, model_name: str, model_path: str, precision: str):
+        with self._store_lock:
+            manifest = self.store.publish(model_name, model_path, precision)
+            if manifest is not None:
+                self._store_revisions[model_name] = manifest["revision"]
+
+    def _wrap_model(self, model) -> "BaseMLModel":
+        model_instance = _load_model_class("BaseMLModel")({})
+        model_instance.model = model
+        model_instance.is_trained = True
+        return model_instance
 
     def get_available_model_classes(self) -> List[str]:
         return list(self._model_classes.keys())
 
+    def _warm_up(self, model_instance: "BaseMLModel", sample: Optional[np.ndarray]):
+        if sample is None:
+            n_features = getattr(model_instance.model, "n_features_in_", None)
+            if n_features is None:
+                raise ValueError("cannot infer the input shape for a warm-up prediction")
+            sample = np.zeros((1, n_features))
+        model_instance.predict(sample[:settings.model_warmup_rows])
+
+    def _to_float32(self, model_name: str, model_instance: "BaseMLModel",
+                    sample: Optional[np.ndarray]) -> Optional["BaseMLModel"]:
+        compiled = to_float32(model_instance.model)
+        if compiled is None:
+            logger.warning(f"Model {model_name} has no float32 layout, serving it in float64")
+            return None
+        if sample is None:
+            logger.warning(f"Cannot infer input shape to check float32 drift of model {model_name}, "
+                           f"serving it in float64")
+            return None
+        sample = np.asarray(sample[:settings.float32_check_rows], dtype=np.float64)
+        drift = _relative_drift(model_instance.model, compiled, sample)
+        if drift > settings.float32_max_drift:
+            logger.warning(f"float32 drift {drift:.2e} of model {model_name} exceeds "
+                           f"{settings.float32_max_drift:.2e}, serving it in float64")
+            return None
+        logger.info(f"Model {model_name} float32 drift {drift:.2e} on {len(sample)} rows")
+        float32_instance = _load_model_class("BaseMLModel")({})
+        float32_instance.model = compiled
+        float32_instance.is_trained = True
+        return float32_instance
+
+    def _publish(self, model_name: str, model_instance: "BaseMLModel", source: str,
+                 sample: Optional[np.ndarray] = None, precision: Optional[str] = None,
+                 number: Optional[int] = None) -> Optional[ModelVersion]:
+        precision = precision or settings.model_precision
+        if precision == "float32":
+            n_features = getattr(model_instance.model, "n_features_in_", None)
+            if sample is None and n_features is not None:
+                # loaded models come without data, so drift is measured on synthetic inputs
+                sample = np.random.default_rng(0).normal(size=(settings.float32_check_rows, n_features))
+            float32_instance = self._to_float32(model_name, model_instance, sample)
+            if float32_instance is None:
+                precision = "float64"
+            else:
+                model_instance = float32_instance
+                sample = sample.astype(np.float32)
+        # the new version only takes traffic after a warm-up prediction; the old one keeps serving until then
+        version = self.models.register(model_name, model_instance, source, precision, number)
+        try:
+            self._warm_up(model_instance, sample)
+            version.warmed = True
+        except Exception as e:
+            logger.error(f"Warm-up of model {model_name} version {version.version} failed: {e}")
+            self.models.discard(model_name, version.version)
+            return None
+        # a training started later may already serve; the older result must not replace it
+        if not self.models.set_alias(model_name, version.version, DEFAULT_ALIAS, forward_only=number is not None):
+            logger.warning(f"Model {model_name} version {version.version} was superseded by a newer one, dropping it")
+            self.models.discard(model_name, version.version)
+            return None
+        self._index_model(model_name)
+        return version
+
+    @profiled("train_model")
     def train_model(self, model_name: str, model_class: str, dataset_name: str, 
-                   hyperparameters: Dict[str, Any], target_column: str = "target") -> bool:
+                   hyperparameters: Dict[str, Any], target_column: str = "target",
+                   precision: Optional[str] = None) -> Optional[str]:
+        # TRAINED or SUPERSEDED when the fit succeeded, None when it failed
+        task = None
         try:
             if model_class not in self._model_classes:
                 logger.error(f"Unknown model class: {model_class}")
-                return False
+                return None
+
+            if precision and precision not in PRECISIONS:
+                logger.error(f"Unknown precision: {precision}")
+                return None
+
+            if VERSION_SEPARATOR in model_name:
+                logger.error(f"Model name {model_name} must not contain '{VERSION_SEPARATOR}'")
+                return None
 
             df = self.dataset_service.load_dataset(dataset_name)
             if df is None:
                 logger.error(f"Could not load dataset {dataset_name}")
-                return False
+                return None
 
             if target_column not in df.columns:
                 logger.error(f"Target column {target_column} not found in dataset")
-                return False
+                return None
 
             X = df.drop(columns=[target_column]).values
             y = df[target_column].values
 
-            model_instance = self._model_classes[model_class](hyperparameters)
+            model_instance = _load_model_class(self._model_classes[model_class])(hyperparameters)
             task = self.clearml_service.create_experiment(model_name, model_class, hyperparameters)
+            number = self.models.reserve(model_name)
             
-            model_instance.train(X, y)
-            self.models[model_name] = model_instance
+            with observe(TRAINING_DURATION, model_class):
+                model_instance.train(X, y)
+            version = self._publish(model_name, model_instance, "train", X, precision, number)
+            if version is None:
+                # a training that started later already serves; its artifacts must not be overwritten either
+                if (self.models.serving_version(model_name) or 0) > number:
+                    return SUPERSEDED
+                return None
+            self._index_model(model_name, model_class)
 
-            self.clearml_service.save_model(task, model_instance.model, model_name, model_class)
-            if task is not None:
-                try:
-                    task.close()
-                except Exception as e:
-                    logger.warning(f"Error closing ClearML task: {e}")
+            model_path = self.clearml_service.save_model(task, model_instance.model, model_name, model_class)
+            if self.store is not None:
+                self._publish_to_store(model_name, model_path, version.precision)
             
             logger.info(f"Trained model {model_name} of class {model_class}")
-            return True
+            return TRAINED
         except Exception as e:
             logger.error(f"Error training model {model_name}: {e}", exc_info=True)
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return False
-
-    def predict(self, model_name: str, data: np.ndarray) -> Optional[np.ndarray]:
-        if model_name not in self.models:
-            logger.error(f"Model {model_name} not found")
             return None
+        finally:
+            if task is not None:
+                try:
+                    task.close()
+                except Exception as e:
+                    logger.warning(f"Error closing ClearML task: {e}")
 
+    @profiled("predict")
+    def predict(self, model_name: str, data: np.ndarray) -> Optional[np.ndarray]:
         try:
-            predictions = self.models[model_name].predict(data)
-            logger.info(f"Made predictions with model {model_name}")
+            with self.models.acquire(model_name) as version:
+                predictions = version.model.predict(data)
+            logger.info(f"Made predictions with model {model_name} version {version.version}")
             return predictions
+        except KeyError:
+            logger.error(f"Model {model_name} not found")
+            return None
         except Exception as e:
             logger.error(f"Error making predictions with model {model_name}: {e}")
             return None
 
+    def _predict_in_slot(self, model_name: str, data: np.ndarray, deadline: Optional[float]) -> Optional[np.ndarray]:
+        timeout = max(deadline - time.monotonic(), 0.001) if deadline is not None else None
+        with admission.model_slot(model_name, timeout):
+            return self.predict(model_name, data)
+
+    def predict_many(self, model_names: Sequence[str], data: np.ndarray,
+                     weights: Optional[Sequence[float]] = None,
+                     timeout: Optional[float] = None) -> Dict[str, Any]:
+        if not model_names:
+            raise ValueError("At least one model name is required")
+        if len(set(model_names)) != len(model_names):
+            raise ValueError("Model names must be unique")
+        if weights is not None:
+            if len(weights) != len(model_names):
+                raise ValueError(f"Got {len(weights)} weights for {len(model_names)} models")
+            if sum(weights) <= 0:
+                raise ValueError("Weights must sum to a positive value")
+
+        # every model reads the same parsed matrix; sklearn and numpy release the GIL for the heavy parts.
+        # Each model still counts against its own concurrency limit, and each task runs in a copy of the
+        # caller's context so request-scoped state such as profiling follows it into the pool
+        deadline = time.monotonic() + timeout if timeout else None
+        futures = {
+            name: self.fanout_executor.submit(contextvars.copy_context().run, self._predict_in_slot, name, data, deadline)
+            for name in model_names
+        }
+        predictions, errors, shed = {}, {}, []
+        for name, future in futures.items():
+            try:
+                predictions[name] = future.result()
+            except Overloaded as e:
+                # one busy model must not fail the models that did answer
+                shed.append(e)
+                errors[name] = str(e)
+                continue
+            if predictions[name] is None:
+                errors[name] = "Model not found or prediction failed"
+        predictions = {name: p for name, p in predictions.items() if p is not None}
+        if not predictions and shed:
+            raise max(shed, key=lambda e: e.retry_after)
+
+        combined = None
+        if not errors:
+            combined = np.average(np.stack(list(predictions.values())), axis=0, weights=weights)
+        return {
+            "predictions": predictions,
+            "combined": combined,
+            "errors": errors,
+        }
+
+    def fanout_input_dtype(self, model_names: Sequence[str]):
+        dtypes = {self.input_dtype(name) for name in model_names}
+        return np.float32 if dtypes == {np.float32} else np.float64
+
     def retrain_model(self, model_name: str, model_class: str, dataset_name: str,
-                     hyperparameters: Dict[str, Any], target_column: str = "target") -> bool:
-        return self.train_model(model_name, model_class, dataset_name, hyperparameters, target_column)
+                     hyperparameters: Dict[str, Any], target_column: str = "target",
+                     precision: Optional[str] = None) -> Optional[str]:
+        return self.train_model(model_name, model_class, dataset_name, hyperparameters, target_column, precision)
 
     def delete_model(self, model_name: str) -> bool:
-        if model_name in self.models:
-            del self.models[model_name]
+        self.models.remove(model_name)
+        if self.store is not None:
+            self.store.remove(model_name)
+            with self._store_lock:
+                self._store_revisions.pop(model_name, None)
         
         success = self.clearml_service.delete_model(model_name)
+        with self._catalog_lock:
+            self._clearml_models.pop(model_name, None)
+        self._index_model(model_name)
         logger.info(f"Deleted model {model_name}")
         return success
 
+    def _catalog_record(self, model_name: str, model_class: Optional[str] = None) -> Dict[str, Any]:
+        clearml_info = self._clearml_models.get(model_name) or {}
+        previous = self.catalog.get(model_name) or {}
+        return {
+            "name": model_name,
+            "id": clearml_info.get("id", "local"),
+            "created": clearml_info.get("created"),
+            "loaded": model_name in self.models,
+            "version": self.models.serving_version(model_name),
+            "model_class": model_class or clearml_info.get("model_class") or previous.get("model_class")
+        }
+
+    def _index_model(self, model_name: str, model_class: Optional[str] = None):
+        # local changes reach the listing right away; the ClearML part is refreshed on an interval
+        with self._catalog_lock:
+            if model_name in self.models or model_name in self._clearml_models:
+                self.catalog.put(model_name, self._catalog_record(model_name, model_class))
+            else:
+                self.catalog.remove(model_name)
+
+    def _rebuild_catalog(self):
+        clearml_models = {m["name"]: m for m in self.clearml_service.list_models()}
+        with self._catalog_lock:
+            self._clearml_models = clearml_models
+            names = set(clearml_models) | set(self.models.keys())
+            self.catalog.replace({name: self._catalog_record(name) for name in names})
+            self._catalog_refreshed = time.monotonic()
+        logger.info(f"Indexed {len(names)} models")
+
+    def refresh_catalog(self):
+        refreshed = self._catalog_refreshed
+        if refreshed is None or time.monotonic() - refreshed >= settings.model_list_refresh_interval:
+            self._catalog_refreshes.do("refresh", self._rebuild_catalog)
+
     def list_models(self) -> List[Dict[str, Any]]:
-        result = []
-        
-        clearml_models = self.clearml_service.list_models()
-        clearml_model_names = {m["name"] for m in clearml_models}
-        
-        for model_info in clearml_models:
-            result.append({
-                "name": model_info["name"],
-                "id": model_info["id"],
-                "created": model_info["created"],
-                "loaded": model_info["name"] in self.models
-            })
-        
-        for model_name in self.models.keys():
-            if model_name not in clearml_model_names:
-                result.append({
-                    "name": model_name,
-                    "id": "local",
-                    "created": "N/A",
-                    "loaded": True
-                })
-        
-        return result
+        self.refresh_catalog()
+        return self.catalog.all()
+
+    def page_models(self, prefix: Optional[str] = None, model_class: Optional[str] = None,
+                    loaded: Optional[bool] = None, sort_by: str = "name", descending: bool = False,
+                    cursor: Optional[str] = None, limit: Optional[int] = None, include_total: bool = False):
+        self.refresh_catalog()
+        match = None
+        if prefix or model_class or loaded is not None:
+            def match(record: Dict[str, Any]) -> bool:
+                return ((not prefix or record["name"].startswith(prefix))
+                        and (not model_class or record["model_class"] == model_class)
+                        and (loaded is None or record["loaded"] == loaded))
+        limit = min(limit or settings.list_page_size, settings.list_max_page_size)
+        return self.catalog.page(match, sort_by, descending, cursor, limit, include_total)
 
-    def load_model_from_clearml(self, model_name: str) -> bool:
+    def load_model_from_clearml(self, model_name: str, precision: Optional[str] = None) -> bool:
         if model_name in self.models:
             logger.info(f"Model {model_name} is already loaded")
             return True
-        
+
+        if precision and precision not in PRECISIONS:
+            logger.error(f"Unknown precision: {precision}")
+            return False
+
+        return self._loads.do((model_name, precision), self._load_model_from_clearml, model_name, precision)
+
+    def _load_model_from_clearml(self, model_name: str, precision: Optional[str]) -> bool:
+        if model_name in self.models:
+            logger.info(f"Model {model_name} is already loaded")
+            return True
+
+        if self.store is not None:
+            manifest = self.store.get_manifest(model_name)
+            if manifest is not None:
+                return self._load_from_store(manifest, precision)
+
         try:
             model = self.clearml_service.load_model(model_name)
             if model is None:
                 return False
 
-            model_instance = BaseMLModel({})
-            model_instance.model = model
-            model_instance.is_trained = True
-            self.models[model_name] = model_instance
+            model_instance = self._wrap_model(model)
+            if self._publish(model_name, model_instance, "clearml", precision=precision) is None:
+                return False
             logger.info(f"Loaded model {model_name} from ClearML")
             return True
         except Exception as e:
             logger.error(f"Error loading model {model_name} from ClearML: {e}")
             return False
 
+
+    def metric_label(self, model_ref: str) -> str:
+        name, _ = parse_model_ref(model_ref)
+        return name if name in self.models else UNKNOWN_MODEL
+
+    def input_dtype(self, model_name: str):
+        # lets the API layer build request matrices directly in the serving precision
+        return np.float32 if self.models.precision(model_name) == "float32" else np.float64
+
+    def list_model_versions(self, model_name: str) -> List[Dict[str, Any]]:
+        return self.models.versions(model_name)
+
+    def set_model_alias(self, model_name: str, version: int, alias: str = DEFAULT_ALIAS) -> bool:
+        success = self.models.set_alias(model_name, version, alias)
+        self._index_model(model_name)
+        return success
+
+    def rollback_model(self, model_name: str) -> Optional[int]:
+        version = self.models.previous_version(model_name)
+        if version is None or not self.models.set_alias(model_name, version, DEFAULT_ALIAS):
+            logger.error(f"No previous version of model {model_name} to roll back to")
+            return None
+        self._index_model(model_name)
+        logger.info(f"Rolled back model {model_name} to version {version}")
+        return version
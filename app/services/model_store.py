@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_PREFIX = "models/artifacts"
+MANIFEST_PREFIX = "models/manifests"
+
+
+def _s3_client():
+    # boto3 is only imported when the shared store is enabled
+    import boto3
+    endpoint = settings.minio_endpoint
+    if not endpoint.startswith(("http://", "https://")):
+        endpoint = f"{'https' if settings.minio_secure else 'http'}://{endpoint}"
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        aws_access_key_id=settings.minio_access_key,
+        aws_secret_access_key=settings.minio_secret_key
+    )
+
+
+class ModelStore:
+    # artifacts are immutable objects; each model has one small manifest pointing at its current artifact
+    def __init__(self, client=None):
+        self.bucket = settings.minio_bucket
+        self.cache_dir = settings.model_cache_dir
+        self.client = client or _s3_client()
+        self._lock = threading.Lock()
+        self._seen: Dict[str, str] = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._ensure_bucket()
+
+    def _ensure_bucket(self):
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        except Exception:
+            try:
+                self.client.create_bucket(Bucket=self.bucket)
+                logger.info(f"Created bucket {self.bucket}")
+            except Exception as e:
+                logger.warning(f"Could not create bucket {self.bucket}: {e}")
+
+    def _manifest_key(self, model_name: str) -> str:
+        return f"{MANIFEST_PREFIX}/{model_name}.json"
+
+    def publish(self, model_name: str, local_path: str, precision: str = "float64") -> Optional[Dict[str, Any]]:
+        revision = uuid.uuid4().hex
+        artifact_key = f"{ARTIFACT_PREFIX}/{model_name}/{revision}{os.path.splitext(local_path)[1]}"
+        manifest = {
+            "name": model_name,
+            "revision": revision,
+            "artifact": artifact_key,
+            "precision": precision,
+            "created": time.time(),
+        }
+        try:
+            self.client.upload_file(local_path, self.bucket, artifact_key)
+            # the manifest goes last so no replica ever sees a revision whose artifact is missing
+            self.client.put_object(Bucket=self.bucket, Key=self._manifest_key(model_name),
+                                   Body=json.dumps(manifest).encode(), ContentType="application/json")
+        except Exception as e:
+            logger.error(f"Could not publish model {model_name} to the model store: {e}")
+            return None
+        self._cache_copy(local_path, manifest)
+        logger.info(f"Published model {model_name} revision {revision} to the model store")
+        return manifest
+
+    def get_manifest(self, model_name: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._manifest_key(model_name))
+            return json.loads(response["Body"].read())
+        except Exception:
+            return None
+
+    def fetch(self, manifest: Dict[str, Any]) -> str:
+        # read-through cache: each immutable artifact is downloaded at most once per replica
+        path = self._cache_path(manifest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            try:
+                self.client.download_file(self.bucket, manifest["artifact"], tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            logger.info(f"Cached model {manifest['name']} revision {manifest['revision']}")
+        self._evict(manifest)
+        return path
+
+    def remove(self, model_name: str) -> bool:
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=self._manifest_key(model_name))
+            for key in self._list_keys(f"{ARTIFACT_PREFIX}/{model_name}/"):
+                self.client.delete_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            logger.error(f"Could not remove model {model_name} from the model store: {e}")
+            return False
+        shutil.rmtree(os.path.join(self.cache_dir, model_name), ignore_errors=True)
+        with self._lock:
+            self._seen.pop(model_name, None)
+        return True
+
+    def poll(self) -> Tuple[List[Dict[str, Any]], List[str]]:
+        # one LIST call per poll; manifests are only downloaded when their ETag changed
+        etags = self._list_manifests()
+        with self._lock:
+            changed = [name for name, etag in etags.items() if self._seen.get(name) != etag]
+            removed = [name for name in self._seen if name not in etags]
+            for name in removed:
+                self._seen.pop(name)
+        manifests = []
+        for name in changed:
+            manifest = self.get_manifest(name)
+            if manifest is not None:
+                manifests.append(manifest)
+                with self._lock:
+                    self._seen[name] = etags[name]
+        return manifests, removed
+
+    def _list_manifests(self) -> Dict[str, str]:
+        etags = {}
+        for obj in self._list_objects(f"{MANIFEST_PREFIX}/"):
+            name = obj["Key"][len(MANIFEST_PREFIX) + 1:]
+            if name.endswith(".json"):
+                etags[name[:-len(".json")]] = obj["ETag"]
+        return etags
+
+    def _list_keys(self, prefix: str) -> List[str]:
+        return [obj["Key"] for obj in self._list_objects(prefix)]
+
+    def _list_objects(self, prefix: str) -> List[Dict[str, Any]]:
+        objects = []
+        kwargs = {"Bucket": self.bucket, "Prefix": prefix}
+        while True:
+            response = self.client.list_objects_v2(**kwargs)
+            objects.extend(response.get("Contents", []))
+            if not response.get("IsTruncated"):
+                return objects
+            kwargs["ContinuationToken"] = response["NextContinuationToken"]
+
+    def _cache_path(self, manifest: Dict[str, Any]) -> str:
+        return os.path.join(self.cache_dir, manifest["name"], os.path.basename(manifest["artifact"]))
+
+    def _cache_copy(self, local_path: str, manifest: Dict[str, Any]):
+        path = self._cache_path(manifest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(local_path, path)
+        self._evict(manifest)
+
+    def _evict(self, manifest: Dict[str, Any]):
+        # only the current revision of a model is kept on local disk
+        model_dir = os.path.join(self.cache_dir, manifest["name"])
+        current = os.path.basename(manifest["artifact"])
+        for filename in os.listdir(model_dir):
+            if filename != current and not filename.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(model_dir, filename))
+                except OSError:
+                    pass
@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.services.model_artifacts import save_artifact, load_artifact
+
+FORMATS = [
+    ("joblib", None),
+    ("joblib", "zlib"),
+    ("joblib", "lz4"),
+    ("npz", None),
+    ("npz", "zlib"),
+]
+
+
+def build_models(n_samples: int, n_features: int, n_estimators: int, max_depth: int):
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(n_samples, n_features))
+    y = X @ rng.normal(size=n_features) + rng.normal(scale=0.1, size=n_samples)
+    return X, {
+        "LinearRegression": LinearRegression().fit(X, y),
+        "RandomForest": RandomForestRegressor(
+            n_estimators=n_estimators, max_depth=max_depth, random_state=42, n_jobs=-1
+        ).fit(X, y),
+    }
+
+
+def bench(model, X, artifact_format, compression, level, workdir, repeats):
+    base = os.path.join(workdir, f"{type(model).__name__}_{artifact_format}_{compression or 'raw'}")
+    save_times, load_times = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        path = save_artifact(model, base, artifact_format, compression, level)
+        save_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        loaded = load_artifact(path)
+        load_times.append(time.perf_counter() - start)
+
+    max_abs_diff = float(np.max(np.abs(loaded.predict(X[:1000]) - model.predict(X[:1000]))))
+    return {
+        "model": type(model).__name__,
+        "format": artifact_format,
+        "compression": compression,
+        "level": level if compression else None,
+        "size_bytes": os.path.getsize(path),
+        "save_s": min(save_times),
+        "load_s": min(load_times),
+        "max_abs_diff": max_abs_diff,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare model artifact formats by size, save and load time")
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--features", type=int, default=10)
+    parser.add_argument("--estimators", type=int, default=100)
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--level", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    X, models = build_models(args.samples, args.features, args.estimators, args.max_depth)
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for model in models.values():
+            for artifact_format, compression in FORMATS:
+                try:
+                    results.append(bench(model, X, artifact_format, compression, args.level, workdir, args.repeats))
+                except (ImportError, ValueError) as e:
+                    results.append({
+                        "model": type(model).__name__,
+                        "format": artifact_format,
+                        "compression": compression,
+                        "error": str(e),
+                    })
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
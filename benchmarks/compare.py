@@ -0,0 +1,43 @@
+import argparse
+import json
+import sys
+
+
+def index_results(report: dict) -> dict:
+    results = {}
+    for run in report["runs"]:
+        for result in run["results"]:
+            key = (run["protocol"], result["workload"], result["concurrency"], result["batch_size"])
+            results[key] = result
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two serving benchmark reports and flag regressions")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative slowdown, 0.1 = 10%%")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = index_results(json.load(f))
+    with open(args.current) as f:
+        current = index_results(json.load(f))
+
+    regressions = []
+    for key in sorted(baseline.keys() & current.keys(), key=str):
+        before, after = baseline[key], current[key]
+        p95_ratio = after["p95_ms"] / before["p95_ms"] if before["p95_ms"] else 1.0
+        rps_ratio = after["throughput_rps"] / before["throughput_rps"] if before["throughput_rps"] else 1.0
+        regressed = p95_ratio > 1 + args.threshold or rps_ratio < 1 - args.threshold
+        protocol, workload, concurrency, batch_size = key
+        print(f"{protocol:5} {workload:8} c={concurrency:<4} batch={str(batch_size):<6} "
+              f"p95 x{p95_ratio:.2f}  throughput x{rps_ratio:.2f}{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(key)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["clearml", "dvc", "sklearn", "pandas", "joblib"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, repeats: int) -> dict:
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "module": module,
+        "seconds": min(r["seconds"] for r in runs),
+        "heavy_modules_loaded": runs[0]["loaded"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import-time budget of the API entry points")
+    parser.add_argument("--modules", nargs="+", default=["app.api.rest_api", "app.api.grpc_server"])
+    parser.add_argument("--budget", type=float, default=1.5, help="maximum import time in seconds")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeats) for module in args.modules]
+    print(json.dumps(results, indent=2))
+
+    failed = [r for r in results if r["seconds"] > args.budget or r["heavy_modules_loaded"]]
+    for r in failed:
+        print(f"{r['module']}: {r['seconds']:.2f}s (budget {args.budget:.2f}s), "
+              f"eagerly imported: {', '.join(r['heavy_modules_loaded']) or 'none'}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
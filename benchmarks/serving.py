@@ -0,0 +1,273 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+DATASET_NAME = "bench_dataset.csv"
+PREDICT_MODEL = "bench_model"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def generate_dataset(path: str, rows: int, features: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, features))
+    y = X @ rng.normal(size=features) + rng.normal(scale=0.1, size=rows)
+    df = pd.DataFrame(X, columns=[f"feature{i + 1}" for i in range(features)])
+    df["target"] = y
+    df.to_csv(path, index=False)
+
+
+def run_server(protocol: str):
+    import standins
+    standins.install()
+    if protocol == "rest":
+        import uvicorn
+        from app.api.rest_api import app
+        from app.config import settings
+        uvicorn.run(app, host="127.0.0.1", port=settings.rest_port, log_level="warning")
+    else:
+        from app.api.grpc_server import serve
+        serve()
+
+
+def peak_rss_mb(pid: int):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class RestClient:
+    def __init__(self, port: int):
+        import requests
+        self._requests = requests
+        self.base_url = f"http://127.0.0.1:{port}"
+        self._local = threading.local()
+
+    def _session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = self._requests.Session()
+        return self._local.session
+
+    def health(self) -> bool:
+        try:
+            return self._requests.get(f"{self.base_url}/health", timeout=1).status_code == 200
+        except self._requests.RequestException:
+            return False
+
+    def train(self, model_name: str, model_class: str, hyperparameters: dict) -> bool:
+        response = self._session().post(f"{self.base_url}/api/v1/models/train", json={
+            "model_name": model_name,
+            "model_class": model_class,
+            "dataset_name": DATASET_NAME,
+            "hyperparameters": hyperparameters,
+        })
+        return response.status_code == 200
+
+    def prepare_predict(self, model_name: str, batch: np.ndarray):
+        return {"model_name": model_name, "data": batch.tolist()}
+
+    def predict(self, payload) -> bool:
+        return self._session().post(f"{self.base_url}/api/v1/models/predict", json=payload).status_code == 200
+
+    def close(self):
+        pass
+
+
+class GrpcClient:
+    def __init__(self, port: int):
+        import grpc
+        from app.api import grpc_api_pb2, grpc_api_pb2_grpc
+        self._grpc = grpc
+        self._pb2 = grpc_api_pb2
+        self.channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+        self.stub = grpc_api_pb2_grpc.MLServiceStub(self.channel)
+
+    def health(self) -> bool:
+        try:
+            self.stub.Health(self._pb2.HealthRequest(), timeout=1)
+            return True
+        except self._grpc.RpcError:
+            return False
+
+    def train(self, model_name: str, model_class: str, hyperparameters: dict) -> bool:
+        response = self.stub.TrainModel(self._pb2.TrainModelRequest(
+            model_name=model_name,
+            model_class=model_class,
+            dataset_name=DATASET_NAME,
+            hyperparameters_json=json.dumps(hyperparameters),
+            target_column="target"
+        ))
+        return response.success
+
+    def prepare_predict(self, model_name: str, batch: np.ndarray):
+        return self._pb2.PredictRequest(
+            model_name=model_name,
+            data=[self._pb2.PredictDataPoint(features=row) for row in batch.tolist()]
+        )
+
+    def predict(self, payload) -> bool:
+        try:
+            self.stub.Predict(payload)
+            return True
+        except self._grpc.RpcError:
+            return False
+
+    def close(self):
+        self.channel.close()
+
+
+def drive(fn, payloads, concurrency: int):
+    latencies = [0.0] * len(payloads)
+    errors = 0
+    errors_lock = threading.Lock()
+
+    def call(i):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            ok = fn(payloads[i])
+        except Exception:
+            ok = False
+        latencies[i] = time.perf_counter() - start
+        if not ok:
+            with errors_lock:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(len(payloads))))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(payloads),
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(payloads) / elapsed if elapsed > 0 else None,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+    }
+
+
+def wait_ready(client, process, timeout: float):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if not process.is_alive():
+            raise RuntimeError("Server process exited during startup")
+        if client.health():
+            return
+        time.sleep(0.1)
+    raise RuntimeError("Server did not become healthy in time")
+
+
+def bench_protocol(protocol: str, args, workdir: str) -> dict:
+    port = free_port()
+    os.environ["REST_PORT" if protocol == "rest" else "GRPC_PORT"] = str(port)
+    os.environ["METRICS_PORT"] = str(free_port())
+
+    ctx = multiprocessing.get_context("spawn")
+    process = ctx.Process(target=run_server, args=(protocol,), daemon=True)
+    startup = time.perf_counter()
+    process.start()
+    client = RestClient(port) if protocol == "rest" else GrpcClient(port)
+    results = []
+    try:
+        wait_ready(client, process, args.startup_timeout)
+        startup_s = time.perf_counter() - startup
+        hyperparameters = json.loads(args.hyperparameters)
+
+        if not client.train(PREDICT_MODEL, args.model_class, hyperparameters):
+            raise RuntimeError("Could not train the benchmark model")
+
+        rng = np.random.default_rng(0)
+        for concurrency in args.concurrency:
+            if args.train_requests:
+                names = [f"bench_train_{concurrency}_{i}" for i in range(args.train_requests)]
+                stats = drive(lambda name: client.train(name, args.model_class, hyperparameters), names, concurrency)
+                results.append({"workload": "train", "concurrency": concurrency, "batch_size": None, **stats})
+
+            for batch_size in args.batch_sizes:
+                batch = rng.normal(size=(batch_size, args.features))
+                payload = client.prepare_predict(PREDICT_MODEL, batch)
+                for _ in range(args.warmup):
+                    client.predict(payload)
+                stats = drive(client.predict, [payload] * args.requests, concurrency)
+                stats["rows_per_s"] = stats["throughput_rps"] * batch_size if stats["throughput_rps"] else None
+                results.append({"workload": "predict", "concurrency": concurrency, "batch_size": batch_size, **stats})
+
+        return {
+            "protocol": protocol,
+            "startup_s": startup_s,
+            "server_peak_rss_mb": peak_rss_mb(process.pid),
+            "results": results,
+        }
+    finally:
+        client.close()
+        process.terminate()
+        process.join(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load and benchmark the REST and gRPC serving paths")
+    parser.add_argument("--protocol", choices=["rest", "grpc", "both"], default="both")
+    parser.add_argument("--rows", type=int, default=10000, help="rows in the synthetic training dataset")
+    parser.add_argument("--features", type=int, default=3)
+    parser.add_argument("--model-class", default="RandomForest")
+    parser.add_argument("--hyperparameters", default='{"n_estimators": 50, "max_depth": 10, "random_state": 42}')
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--requests", type=int, default=200, help="predict requests per batch size and concurrency")
+    parser.add_argument("--train-requests", type=int, default=0, help="train requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["MODELS_DIR"] = os.path.join(workdir, "models")
+        os.environ["DATASETS_DIR"] = os.path.join(workdir, "datasets")
+        os.makedirs(os.environ["DATASETS_DIR"])
+        generate_dataset(os.path.join(os.environ["DATASETS_DIR"], DATASET_NAME), args.rows, args.features)
+
+        protocols = ["rest", "grpc"] if args.protocol == "both" else [args.protocol]
+        report = {
+            "config": vars(args),
+            "runs": [bench_protocol(protocol, args, workdir) for protocol in protocols],
+            "client_peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import io
+import os
+import shutil
+import hashlib
+import itertools
+import tempfile
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+_lock = threading.Lock()
+_ids = itertools.count(1)
+_registry = {}
+
+
+class LocalTask:
+    def __init__(self, project_name: str, task_name: str, tags=None):
+        self.project_name = project_name
+        self.name = task_name
+        self.tags = tags or []
+        self.parameters = {}
+
+    @classmethod
+    def init(cls, project_name: str, task_name: str, tags=None, **kwargs):
+        return cls(project_name, task_name, tags)
+
+    def connect(self, mutable, name: str = None):
+        self.parameters[name] = mutable
+        return mutable
+
+    def close(self):
+        pass
+
+
+class LocalModel:
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.id = f"local-{next(_ids)}"
+        self.created = datetime.now()
+        self.path = path
+        self.labels = {}
+
+    @classmethod
+    def query_models(cls, project_name: str = None, only_published: bool = False, **kwargs):
+        with _lock:
+            return list(_registry.values())
+
+    def get_local_copy(self):
+        return self.path
+
+    def delete(self):
+        with _lock:
+            _registry.pop(self.name, None)
+
+
+class LocalOutputModel:
+    def __init__(self, task=None, name: str = None, framework: str = None, **kwargs):
+        self.task = task
+        self.name = name
+        self.framework = framework
+        self._model = None
+
+    def update_weights(self, weights_filename: str):
+        self._model = LocalModel(self.name, weights_filename)
+        with _lock:
+            _registry[self.name] = self._model
+
+    def set_labels(self, labels: dict):
+        if self._model is not None:
+            self._model.labels = labels
+
+
+class LocalRepo:
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self.tracked = set()
+
+    def add(self, path: str):
+        self.tracked.add(path)
+
+    def commit(self, message: str = None):
+        pass
+
+    def remove(self, path: str):
+        self.tracked.discard(path)
+
+
+class LocalS3:
+    # the subset of the boto3 S3 client used by ModelStore, backed by a directory shared by all "replicas"
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def _path(self, bucket: str, key: str) -> str:
+        return os.path.join(self.root_dir, bucket, *key.split("/"))
+
+    def head_bucket(self, Bucket: str):
+        if not os.path.isdir(os.path.join(self.root_dir, Bucket)):
+            raise KeyError(Bucket)
+
+    def create_bucket(self, Bucket: str):
+        os.makedirs(os.path.join(self.root_dir, Bucket), exist_ok=True)
+
+    def upload_file(self, Filename: str, Bucket: str, Key: str):
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(Filename, path)
+
+    def download_file(self, Bucket: str, Key: str, Filename: str):
+        shutil.copyfile(self._path(Bucket, Key), Filename)
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **kwargs):
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(Body)
+
+    def get_object(self, Bucket: str, Key: str):
+        with open(self._path(Bucket, Key), "rb") as f:
+            return {"Body": io.BytesIO(f.read())}
+
+    def delete_object(self, Bucket: str, Key: str):
+        try:
+            os.remove(self._path(Bucket, Key))
+        except FileNotFoundError:
+            pass
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", **kwargs):
+        bucket_dir = os.path.join(self.root_dir, Bucket)
+        contents = []
+        for dirpath, _, filenames in os.walk(bucket_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                key = os.path.relpath(path, bucket_dir).replace(os.sep, "/")
+                if key.startswith(Prefix):
+                    with open(path, "rb") as f:
+                        etag = hashlib.md5(f.read()).hexdigest()
+                    contents.append({"Key": key, "ETag": f'"{etag}"'})
+        return {"Contents": sorted(contents, key=lambda o: o["Key"]), "IsTruncated": False}
+
+
+def install(store_dir: str = None):
+    from app.services import clearml_service, dataset_service, model_store
+
+    local_clearml = SimpleNamespace(Task=LocalTask, Model=LocalModel, OutputModel=LocalOutputModel)
+    clearml_service._clearml = lambda: local_clearml
+    dataset_service.DatasetService._open_dvc_repo = lambda self: LocalRepo(self.datasets_dir)
+    local_s3 = LocalS3(store_dir or tempfile.mkdtemp(prefix="model-store-"))
+    model_store._s3_client = lambda: local_s3
@@ -3,59 +3,124 @@ import pandas as pd
 import json
 import requests
 import os
-from typing import Dict, Any
+import threading
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Optional
 
 st.set_page_config(page_title="MLOps HW1 Dashboard", layout="wide")
 
 API_BASE_URL = os.getenv("API_BASE_URL", "http://mlops-service:8000")
 
-def get_model_classes():
+STATE_TTL = int(os.getenv("DASHBOARD_STATE_TTL", "30"))
+PREVIEW_ROWS = 20
+# selectors show at most this many matches; the search box narrows them down
+SELECT_LIMIT = int(os.getenv("DASHBOARD_SELECT_LIMIT", "50"))
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class StateCache:
+    # shared by every Streamlit session, so the ETag and the state it belongs to are read and written together
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.etag = None
+        self.state = None
+
+@st.cache_resource
+def _state_cache() -> StateCache:
+    return StateCache()
+
+@st.cache_data(ttl=STATE_TTL, show_spinner=False)
+def fetch_state() -> Dict[str, Any]:
+    cache = _state_cache()
+    with cache.lock:
+        etag, state = cache.etag, cache.state
+    headers = {"If-None-Match": etag} if etag and state is not None else {}
+    response = get_session().get(f"{API_BASE_URL}/api/v1/state", headers=headers)
+    if response.status_code == 304:
+        return state
+    response.raise_for_status()
+    state = response.json()
+    with cache.lock:
+        cache.etag, cache.state = response.headers.get("ETag"), state
+    return state
+
+@st.cache_data(ttl=STATE_TTL, show_spinner=False)
+def fetch_names(kind: str, prefix: str = "", loaded: Optional[bool] = None) -> Dict[str, Any]:
+    params = {"limit": SELECT_LIMIT}
+    if prefix:
+        params["prefix"] = prefix
+    if loaded is not None:
+        params["loaded"] = str(loaded).lower()
+    response = get_session().get(f"{API_BASE_URL}/api/v1/{kind}", params=params)
+    response.raise_for_status()
+    page = response.json()
+    return {"names": [record["name"] for record in page[kind]], "more": page["next_cursor"] is not None}
+
+def invalidate_state():
+    fetch_state.clear()
+    fetch_names.clear()
+
+def get_state() -> Dict[str, Any]:
     try:
-        response = requests.get(f"{API_BASE_URL}/api/v1/models/classes")
-        if response.status_code == 200:
-            return response.json().get("model_classes", [])
+        return fetch_state()
     except Exception as e:
-        st.error(f"Error fetching model classes: {e}")
-    return []
+        st.error(f"Error fetching state: {e}")
+    return {"models": [], "models_total": 0, "datasets": [], "datasets_total": 0, "model_classes": []}
+
+def get_model_classes():
+    return get_state().get("model_classes", [])
 
 def list_models():
-    try:
-        response = requests.get(f"{API_BASE_URL}/api/v1/models")
-        if response.status_code == 200:
-            return response.json().get("models", [])
-    except Exception as e:
-        st.error(f"Error fetching models: {e}")
-    return []
+    return get_state().get("models", [])
 
 def list_datasets():
+    return get_state().get("datasets", [])
+
+def show_listing(records: List[Dict[str, Any]], total: Optional[int]):
+    st.dataframe(pd.DataFrame(records))
+    if total is not None and total > len(records):
+        st.caption(f"Showing the first {len(records)} of {total}; use the search boxes below to find others")
+
+def search_names(kind: str, key: str, loaded: Optional[bool] = None) -> List[str]:
+    prefix = st.text_input("Search by name prefix", key=key)
     try:
-        response = requests.get(f"{API_BASE_URL}/api/v1/datasets")
-        if response.status_code == 200:
-            return response.json().get("datasets", [])
+        page = fetch_names(kind, prefix.strip(), loaded)
     except Exception as e:
-        st.error(f"Error fetching datasets: {e}")
-    return []
+        st.error(f"Error fetching {kind}: {e}")
+        return []
+    if page["more"]:
+        st.caption(f"Showing the first {SELECT_LIMIT} matches; type more of the name to narrow them down")
+    return page["names"]
 
 def train_model(model_name: str, model_class: str, dataset_name: str, 
-                hyperparameters: Dict[str, Any], target_column: str):
+                hyperparameters: Dict[str, Any], target_column: str, precision: str = "float64"):
     try:
-        response = requests.post(
+        response = get_session().post(
             f"{API_BASE_URL}/api/v1/models/train",
             json={
                 "model_name": model_name,
                 "model_class": model_class,
                 "dataset_name": dataset_name,
                 "hyperparameters": hyperparameters,
-                "target_column": target_column
+                "target_column": target_column,
+                "precision": precision
             }
         )
+        if response.status_code == 200:
+            invalidate_state()
         return response.status_code == 200, response.json()
     except Exception as e:
         return False, {"error": str(e)}
 
 def predict(model_name: str, data: list):
     try:
-        response = requests.post(
+        response = get_session().post(
             f"{API_BASE_URL}/api/v1/models/predict",
             json={
                 "model_name": model_name,
@@ -68,9 +133,42 @@ def predict(model_name: str, data: list):
     except Exception as e:
         return False, {"error": str(e)}
 
+def submit_batch(model_name: str, file):
+    try:
+        file.seek(0)
+        response = get_session().post(
+            f"{API_BASE_URL}/api/v1/batch/upload",
+            data={"model_name": model_name},
+            files={"file": (file.name, file, "text/csv")}
+        )
+        if response.status_code == 200:
+            return True, response.json()
+        return False, response.json()
+    except Exception as e:
+        return False, {"error": str(e)}
+
+def stream_batch_progress(job_id: str):
+    with get_session().get(f"{API_BASE_URL}/api/v1/batch/{job_id}/progress", stream=True) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line)
+
+def get_batch_job(job_id: str):
+    response = get_session().get(f"{API_BASE_URL}/api/v1/batch/{job_id}")
+    response.raise_for_status()
+    return response.json()
+
+def download_batch_predictions(job_id: str) -> bytes:
+    response = get_session().get(f"{API_BASE_URL}/api/v1/batch/{job_id}/download")
+    response.raise_for_status()
+    return response.content
+
 def delete_model(model_name: str):
     try:
-        response = requests.delete(f"{API_BASE_URL}/api/v1/models/{model_name}")
+        response = get_session().delete(f"{API_BASE_URL}/api/v1/models/{model_name}")
+        if response.status_code == 200:
+            invalidate_state()
         return response.status_code == 200
     except Exception as e:
         st.error(f"Error deleting model: {e}")
@@ -78,7 +176,9 @@ def delete_model(model_name: str):
 
 def delete_dataset(dataset_name: str):
     try:
-        response = requests.delete(f"{API_BASE_URL}/api/v1/datasets/{dataset_name}")
+        response = get_session().delete(f"{API_BASE_URL}/api/v1/datasets/{dataset_name}")
+        if response.status_code == 200:
+            invalidate_state()
         return response.status_code == 200
     except Exception as e:
         st.error(f"Error deleting dataset: {e}")
@@ -89,8 +189,10 @@ def upload_dataset(file, filename: str):
         file.seek(0)
         file_content = file.read()
         files = {"file": (filename, file_content, file.type if hasattr(file, 'type') else "application/octet-stream")}
-        response = requests.post(f"{API_BASE_URL}/api/v1/datasets/upload", files=files)
+        response = get_session().post(f"{API_BASE_URL}/api/v1/datasets/upload", files=files)
         file.seek(0)
+        if response.status_code == 200:
+            invalidate_state()
         return response.status_code == 200
     except Exception as e:
         st.error(f"Error uploading dataset: {e}")
@@ -98,7 +200,9 @@ def upload_dataset(file, filename: str):
 
 def load_model_from_clearml(model_name: str):
     try:
-        response = requests.post(f"{API_BASE_URL}/api/v1/models/{model_name}/load")
+        response = get_session().post(f"{API_BASE_URL}/api/v1/models/{model_name}/load")
+        if response.status_code == 200:
+            invalidate_state()
         return response.status_code == 200
     except Exception as e:
         st.error(f"Error loading model: {e}")
@@ -121,10 +225,10 @@ with tab1:
     st.subheader("Available Datasets")
     datasets = list_datasets()
     if datasets:
-        df = pd.DataFrame(datasets)
-        st.dataframe(df)
+        show_listing(datasets, get_state().get("datasets_total"))
         
-        selected_dataset = st.selectbox("Select dataset to delete", [""] + [d["name"] for d in datasets])
+        dataset_names = search_names("datasets", "dataset_delete_search")
+        selected_dataset = st.selectbox("Select dataset to delete", [""] + dataset_names)
         if selected_dataset and st.button("Delete Dataset"):
             if delete_dataset(selected_dataset):
                 st.success(f"Dataset {selected_dataset} deleted successfully")
@@ -141,8 +245,7 @@ with tab2:
     else:
         model_class = st.selectbox("Select Model Class", model_classes)
         model_name = st.text_input("Model Name")
-        datasets = list_datasets()
-        dataset_names = [d["name"] for d in datasets] if datasets else []
+        dataset_names = search_names("datasets", "train_dataset_search")
         dataset_name = st.selectbox("Select Dataset", dataset_names) if dataset_names else None
         
         if dataset_name:
@@ -155,12 +258,13 @@ with tab2:
             hyperparameters_json = st.text_area("Hyperparameters JSON", value=default_json, height=200)
             
             target_column = st.text_input("Target Column", value="target")
+            precision = st.selectbox("Inference Precision", ["float64", "float32"])
             
             if st.button("Train Model"):
                 try:
                     hyperparameters = json.loads(hyperparameters_json)
                     success, response = train_model(model_name, model_class, dataset_name, 
-                                                   hyperparameters, target_column)
+                                                   hyperparameters, target_column, precision)
                     if success:
                         st.success(response.get("message", "Model trained successfully"))
                     else:
@@ -173,11 +277,10 @@ with tab2:
     st.subheader("Trained Models")
     models = list_models()
     if models:
-        df = pd.DataFrame(models)
-        st.dataframe(df)
+        show_listing(models, get_state().get("models_total"))
         
         selected_model = st.selectbox("Select model to load from ClearML (optional)", 
-                                    [""] + [m["name"] for m in models])
+                                    [""] + search_names("models", "load_model_search", loaded=False))
         if selected_model and st.button("Load Model"):
             if load_model_from_clearml(selected_model):
                 st.success(f"Model {selected_model} loaded successfully")
@@ -186,7 +289,7 @@ with tab2:
                 st.warning(f"Model {selected_model} is already loaded or not found in ClearML. Local models are automatically available for inference.")
         
         selected_model_delete = st.selectbox("Select model to delete", 
-                                           [""] + [m["name"] for m in models])
+                                           [""] + search_names("models", "delete_model_search"))
         if selected_model_delete and st.button("Delete Model"):
             if delete_model(selected_model_delete):
                 st.success(f"Model {selected_model_delete} deleted successfully")
@@ -201,12 +304,12 @@ with tab3:
     if not models:
         st.info("No models available for inference")
     else:
-        loaded_models = [m for m in models if m.get("loaded", False)]
+        loaded_models = search_names("models", "predict_model_search", loaded=True)
         if not loaded_models:
             st.warning("No loaded models available. Models are automatically loaded after training.")
             st.info("If you need to load a model from ClearML, use the 'Load Model' button in the Training tab.")
         else:
-            selected_model = st.selectbox("Select Model", [m["name"] for m in loaded_models])
+            selected_model = st.selectbox("Select Model", loaded_models)
             
             st.subheader("Input Data")
             st.info("Note: The model was trained on 3 features (feature1, feature2, feature3). Please provide 3 features for prediction.")
@@ -226,14 +329,39 @@ with tab3:
                     data.append(sample)
             else:
                 uploaded_file = st.file_uploader("Upload CSV file", type=["csv"])
+                data = []
                 if uploaded_file is not None:
-                    df = pd.read_csv(uploaded_file)
-                    st.dataframe(df)
-                    data = df.values.tolist()
-                else:
-                    data = []
+                    st.dataframe(pd.read_csv(uploaded_file, nrows=PREVIEW_ROWS))
+                    if st.button("Score File"):
+                        success, job = submit_batch(selected_model, uploaded_file)
+                        if not success:
+                            st.error(f"Batch scoring failed: {job.get('detail', job.get('error', 'Unknown error'))}")
+                        else:
+                            progress_bar = st.progress(0.0, text="Scoring...")
+                            try:
+                                for status in stream_batch_progress(job["id"]):
+                                    total = status.get("total_rows") or 0
+                                    done = status.get("rows_processed", 0)
+                                    progress_bar.progress(min(done / total, 1.0) if total else 0.0,
+                                                          text=f"Scored {done} of {total or '?'} rows")
+                                job = get_batch_job(job["id"])
+                            except Exception as e:
+                                st.error(f"Error tracking batch job: {e}")
+                                job = {"status": "failed", "error": str(e)}
+                            if job["status"] == "completed":
+                                st.success(f"Scored {job['rows_processed']} rows ({job['rows_per_second']:.0f} rows/s)")
+                                st.subheader("Predictions Preview")
+                                st.dataframe(pd.DataFrame({"predictions": job["preview"]}))
+                                st.download_button(
+                                    "Download Predictions",
+                                    data=download_batch_predictions(job["id"]),
+                                    file_name=f"predictions_{uploaded_file.name}",
+                                    mime="text/csv"
+                                )
+                            else:
+                                st.error(f"Batch scoring failed: {job.get('error', 'Unknown error')}")
             
-            if st.button("Predict") and data:
+            if input_method == "Manual Entry" and st.button("Predict") and data:
                 success, result = predict(selected_model, data)
                 if success:
                     st.subheader("Predictions")
@@ -245,4 +373,3 @@ with tab3:
                     st.error(f"Prediction failed: {error_msg}")
                     if "features" in error_msg.lower():
                         st.info("Make sure the number of features in your input matches the number of features the model was trained on (3 features).")
-
@@ -4,14 +4,8 @@ import numpy as np
 import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
-try:
-    from app.api import grpc_api_pb2
-    from app.api import grpc_api_pb2_grpc
-except ImportError:
-    import subprocess
-    subprocess.run([sys.executable, "-m", "grpc_tools.protoc", "-I.", "--python_out=.", "--grpc_python_out=.", "app/api/grpc_api.proto"])
-    from app.api import grpc_api_pb2
-    from app.api import grpc_api_pb2_grpc
+from app.api import grpc_api_pb2
+from app.api import grpc_api_pb2_grpc
 
 def main():
     channel = grpc.insecure_channel('localhost:50051')
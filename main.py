@@ -1,7 +1,4 @@
-import uvicorn
-from app.api.rest_api import app
-from app.config import settings
+from app.server import run
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=settings.rest_port)
-
+    run()
@@ -0,0 +1,15 @@
+from mlops_client.client import MLOpsClient, AsyncMLOpsClient
+from mlops_client.batching import PredictBatcher, AsyncPredictBatcher
+from mlops_client.pool import get_channel, get_session, close_all
+from mlops_client.transport import ClientError
+
+__all__ = [
+    "MLOpsClient",
+    "AsyncMLOpsClient",
+    "PredictBatcher",
+    "AsyncPredictBatcher",
+    "ClientError",
+    "get_channel",
+    "get_session",
+    "close_all",
+]
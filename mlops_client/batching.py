@@ -0,0 +1,156 @@
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+import numpy as np
+from mlops_client.transport import as_matrix
+
+logger = logging.getLogger(__name__)
+
+BatchKey = Tuple[str, int, str]
+
+
+class _Batch:
+    def __init__(self):
+        self.parts: List[np.ndarray] = []
+        self.waiters: List = []
+        self.rows = 0
+        self.started = time.monotonic()
+
+    def add(self, X: np.ndarray, waiter):
+        self.parts.append(X)
+        self.waiters.append(waiter)
+        self.rows += X.shape[0]
+
+    def split(self, predictions: np.ndarray) -> List[np.ndarray]:
+        offsets = np.cumsum([part.shape[0] for part in self.parts])[:-1]
+        return np.split(predictions, offsets)
+
+
+def _batch_key(model_name: str, X: np.ndarray) -> BatchKey:
+    # only requests with the same model, width and dtype can share one matrix
+    return model_name, X.shape[1], X.dtype.name
+
+
+class PredictBatcher:
+    def __init__(self, transport, max_batch_rows: int = 1024, max_delay: float = 0.005, max_in_flight: int = 4):
+        self.transport = transport
+        self.max_batch_rows = max_batch_rows
+        self.max_delay = max_delay
+        self._pending: Dict[BatchKey, _Batch] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="predict-batch")
+        self._thread = threading.Thread(target=self._run, name="predict-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, model_name: str, X) -> Future:
+        X = as_matrix(X)
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Batcher is closed")
+            key = _batch_key(model_name, X)
+            batch = self._pending.setdefault(key, _Batch())
+            batch.add(X, future)
+            if batch.rows >= self.max_batch_rows:
+                self._dispatch(key)
+            else:
+                self._cond.notify()
+        return future
+
+    def predict(self, model_name: str, X, timeout: float = None) -> np.ndarray:
+        return self.submit(model_name, X).result(timeout)
+
+    def _run(self):
+        with self._cond:
+            while not self._closed or self._pending:
+                now = time.monotonic()
+                deadline = None
+                for key in list(self._pending):
+                    due = self._pending[key].started + self.max_delay
+                    if due <= now or self._closed:
+                        self._dispatch(key)
+                    elif deadline is None or due < deadline:
+                        deadline = due
+                if self._closed:
+                    continue
+                self._cond.wait(None if deadline is None else deadline - now)
+
+    def _dispatch(self, key: BatchKey):
+        batch = self._pending.pop(key)
+        self._executor.submit(self._send, key[0], batch)
+
+    def _send(self, model_name: str, batch: _Batch):
+        try:
+            X = batch.parts[0] if len(batch.parts) == 1 else np.concatenate(batch.parts)
+            predictions = self.transport.predict(model_name, X)
+            for future, part in zip(batch.waiters, batch.split(predictions)):
+                future.set_result(part)
+        except Exception as e:
+            logger.error(f"Batched predict for {model_name} ({batch.rows} rows) failed: {e}")
+            for future in batch.waiters:
+                future.set_exception(e)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+
+class AsyncPredictBatcher:
+    def __init__(self, transport, max_batch_rows: int = 1024, max_delay: float = 0.005):
+        self.transport = transport
+        self.max_batch_rows = max_batch_rows
+        self.max_delay = max_delay
+        self._pending: Dict[BatchKey, _Batch] = {}
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        self._tasks = set()
+
+    async def predict(self, model_name: str, X) -> np.ndarray:
+        X = as_matrix(X)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = _batch_key(model_name, X)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _Batch()
+            self._timers[key] = loop.call_later(self.max_delay, self._dispatch, key)
+        batch.add(X, future)
+        if batch.rows >= self.max_batch_rows:
+            self._dispatch(key)
+        return await future
+
+    def _dispatch(self, key: BatchKey):
+        batch = self._pending.pop(key, None)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if batch is None:
+            return
+        task = asyncio.ensure_future(self._send(key[0], batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, model_name: str, batch: _Batch):
+        try:
+            X = batch.parts[0] if len(batch.parts) == 1 else np.concatenate(batch.parts)
+            predictions = await self.transport.predict(model_name, X)
+            for future, part in zip(batch.waiters, batch.split(predictions)):
+                if not future.done():
+                    future.set_result(part)
+        except Exception as e:
+            logger.error(f"Batched predict for {model_name} ({batch.rows} rows) failed: {e}")
+            for future in batch.waiters:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def close(self):
+        for key in list(self._pending):
+            self._dispatch(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,111 @@
+from typing import Any, Dict, List, Optional
+import numpy as np
+from mlops_client.batching import AsyncPredictBatcher, PredictBatcher
+from mlops_client.transport import (
+    AsyncGrpcTransport, AsyncRestTransport, GrpcTransport, RestTransport, as_matrix
+)
+
+PROTOCOLS = ("grpc", "rest")
+
+
+def _check_protocol(protocol: str):
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"Unknown protocol {protocol}, expected one of {', '.join(PROTOCOLS)}")
+
+
+class MLOpsClient:
+    def __init__(self, target: str = "localhost:50051", protocol: str = "grpc", timeout: Optional[float] = 30.0,
+                 batching: bool = False, max_batch_rows: int = 1024, max_delay: float = 0.005):
+        _check_protocol(protocol)
+        if protocol == "grpc":
+            self.transport = GrpcTransport(target, timeout)
+        else:
+            self.transport = RestTransport(target, timeout)
+        self.batcher = PredictBatcher(self.transport, max_batch_rows, max_delay) if batching else None
+
+    def health(self) -> str:
+        return self.transport.health()
+
+    def predict(self, model_name: str, X) -> np.ndarray:
+        if self.batcher is not None:
+            return self.batcher.predict(model_name, X)
+        return self.transport.predict(model_name, as_matrix(X))
+
+    def predict_async(self, model_name: str, X):
+        # returns a Future; with batching enabled concurrent calls share one request
+        if self.batcher is None:
+            raise RuntimeError("predict_async requires batching=True")
+        return self.batcher.submit(model_name, X)
+
+    def train(self, model_name: str, model_class: str, dataset_name: str,
+              hyperparameters: Optional[Dict[str, Any]] = None, target_column: str = "target",
+              precision: Optional[str] = None) -> str:
+        return self.transport.train(model_name, model_class, dataset_name, hyperparameters or {}, target_column,
+                                    precision)
+
+    def load_model(self, model_name: str) -> str:
+        return self.transport.load_model(model_name)
+
+    def list_models(self, prefix: Optional[str] = None, model_class: Optional[str] = None,
+                    loaded: Optional[bool] = None) -> List[Dict[str, Any]]:
+        return self.transport.list_models(prefix, model_class, loaded)
+
+    def list_datasets(self, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.transport.list_datasets(prefix)
+
+    def close(self):
+        if self.batcher is not None:
+            self.batcher.close()
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncMLOpsClient:
+    def __init__(self, target: str = "localhost:50051", protocol: str = "grpc", timeout: Optional[float] = 30.0,
+                 batching: bool = False, max_batch_rows: int = 1024, max_delay: float = 0.005):
+        _check_protocol(protocol)
+        if protocol == "grpc":
+            self.transport = AsyncGrpcTransport(target, timeout)
+        else:
+            self.transport = AsyncRestTransport(target, timeout)
+        self.batcher = AsyncPredictBatcher(self.transport, max_batch_rows, max_delay) if batching else None
+
+    async def health(self) -> str:
+        return await self.transport.health()
+
+    async def predict(self, model_name: str, X) -> np.ndarray:
+        if self.batcher is not None:
+            return await self.batcher.predict(model_name, X)
+        return await self.transport.predict(model_name, as_matrix(X))
+
+    async def train(self, model_name: str, model_class: str, dataset_name: str,
+                    hyperparameters: Optional[Dict[str, Any]] = None, target_column: str = "target",
+                    precision: Optional[str] = None) -> str:
+        return await self.transport.train(model_name, model_class, dataset_name, hyperparameters or {},
+                                          target_column, precision)
+
+    async def load_model(self, model_name: str) -> str:
+        return await self.transport.load_model(model_name)
+
+    async def list_models(self, prefix: Optional[str] = None, model_class: Optional[str] = None,
+                          loaded: Optional[bool] = None) -> List[Dict[str, Any]]:
+        return await self.transport.list_models(prefix, model_class, loaded)
+
+    async def list_datasets(self, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self.transport.list_datasets(prefix)
+
+    async def close(self):
+        if self.batcher is not None:
+            await self.batcher.close()
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
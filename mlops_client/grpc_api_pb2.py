@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: app/api/grpc_api.proto
+# Protobuf Python Version: 4.25.0
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16\x61pp/api/grpc_api.proto\x12\x05mlops\"\x0f\n\rHealthRequest\" \n\x0eHealthResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\"\x18\n\x16GetModelClassesRequest\"0\n\x17GetModelClassesResponse\x12\x15\n\rmodel_classes\x18\x01 \x03(\t\"\x9a\x01\n\x11TrainModelRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x13\n\x0bmodel_class\x18\x02 \x01(\t\x12\x14\n\x0c\x64\x61taset_name\x18\x03 \x01(\t\x12\x1c\n\x14hyperparameters_json\x18\x04 \x01(\t\x12\x15\n\rtarget_column\x18\x05 \x01(\t\x12\x11\n\tprecision\x18\x06 \x01(\t\"6\n\x12TrainModelResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"K\n\x0ePredictRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12%\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x17.mlops.PredictDataPoint\"$\n\x10PredictDataPoint\x12\x10\n\x08\x66\x65\x61tures\x18\x01 \x03(\x02\"&\n\x0fPredictResponse\x12\x13\n\x0bpredictions\x18\x01 \x03(\x02\"c\n\x14PredictMatrixRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\x12\x0c\n\x04rows\x18\x03 \x01(\x05\x12\x0c\n\x04\x63ols\x18\x04 \x01(\x05\x12\r\n\x05\x64type\x18\x05 \x01(\t\"I\n\x15PredictMatrixResponse\x12\x13\n\x0bpredictions\x18\x01 \x01(\x0c\x12\r\n\x05\x64type\x18\x02 \x01(\t\x12\x0c\n\x04rows\x18\x03 \x01(\x05\"b\n\x13PredictMultiRequest\x12\x13\n\x0bmodel_names\x18\x01 \x03(\t\x12\x0f\n\x07weights\x18\x02 \x03(\x02\x12%\n\x04\x64\x61ta\x18\x03 \x03(\x0b\x32\x17.mlops.PredictDataPoint\"J\n\x10ModelPredictions\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x13\n\x0bpredictions\x18\x02 \x03(\x02\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"R\n\x14PredictMultiResponse\x12(\n\x07results\x18\x01 \x03(\x0b\x32\x17.mlops.ModelPredictions\x12\x10\n\x08\x63ombined\x18\x02 \x03(\x02\"\x9c\x01\n\x13RetrainModelRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x13\n\x0bmodel_class\x18\x02 \x01(\t\x12\x14\n\x0c\x64\x61taset_name\x18\x03 \x01(\t\x12\x1c\n\x14hyperparameters_json\x18\x04 \x01(\t\x12\x15\n\rtarget_column\x18\x05 \x01(\t\x12\x11\n\tprecision\x18\x06 \x01(\t\"8\n\x14RetrainModelResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"(\n\x12\x44\x65leteModelRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\"7\n\x13\x44\x65leteModelResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\xa9\x01\n\x11ListModelsRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x12\n\npage_token\x18\x02 \x01(\t\x12\x13\n\x0bname_prefix\x18\x03 \x01(\t\x12\x13\n\x0bmodel_class\x18\x04 \x01(\t\x12\x13\n\x06loaded\x18\x05 \x01(\x08H\x00\x88\x01\x01\x12\x0f\n\x07sort_by\x18\x06 \x01(\t\x12\x12\n\ndescending\x18\x07 \x01(\x08\x42\t\n\x07_loaded\"^\n\x12ListModelsResponse\x12 \n\x06models\x18\x01 \x03(\x0b\x32\x10.mlops.ModelInfo\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\x12\r\n\x05total\x18\x03 \x01(\x05\"l\n\tModelInfo\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\n\n\x02id\x18\x02 \x01(\t\x12\x0f\n\x07\x63reated\x18\x03 \x01(\t\x12\x0e\n\x06loaded\x18\x04 \x01(\x08\x12\x0f\n\x07version\x18\x05 \x01(\x05\x12\x13\n\x0bmodel_class\x18\x06 \x01(\t\"v\n\x13ListDatasetsRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x12\n\npage_token\x18\x02 \x01(\t\x12\x13\n\x0bname_prefix\x18\x03 \x01(\t\x12\x0f\n\x07sort_by\x18\x04 \x01(\t\x12\x12\n\ndescending\x18\x05 \x01(\x08\"d\n\x14ListDatasetsResponse\x12$\n\x08\x64\x61tasets\x18\x01 \x03(\x0b\x32\x12.mlops.DatasetInfo\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\x12\r\n\x05total\x18\x03 \x01(\x05\"I\n\x0b\x44\x61tasetInfo\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x03\x12\x0c\n\x04path\x18\x03 \x01(\t\x12\x10\n\x08modified\x18\x04 \x01(\x01\"9\n\x10LoadModelRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x11\n\tprecision\x18\x02 \x01(\t\"5\n\x11LoadModelResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x15\n\x13ListProfilesRequest\"<\n\x14ListProfilesResponse\x12$\n\x08profiles\x18\x01 \x03(\x0b\x32\x12.mlops.ProfileInfo\"`\n\x0bProfileInfo\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x11\n\toperation\x18\x02 \x01(\t\x12\r\n\x05label\x18\x03 \x01(\t\x12\x11\n\ttimestamp\x18\x04 \x01(\x01\x12\x10\n\x08\x64uration\x18\x05 \x01(\x01\"\x1f\n\x11GetProfileRequest\x12\n\n\x02id\x18\x01 \x01(\x03\"0\n\x12GetProfileResponse\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x0c\n\x04text\x18\x02 \x01(\t2\x8f\x08\n\tMLService\x12\x35\n\x06Health\x12\x14.mlops.HealthRequest\x1a\x15.mlops.HealthResponse\x12P\n\x0fGetModelClasses\x12\x1d.mlops.GetModelClassesRequest\x1a\x1e.mlops.GetModelClassesResponse\x12\x41\n\nTrainModel\x12\x18.mlops.TrainModelRequest\x1a\x19.mlops.TrainModelResponse\x12\x38\n\x07Predict\x12\x15.mlops.PredictRequest\x1a\x16.mlops.PredictResponse\x12J\n\rPredictMatrix\x12\x1b.mlops.PredictMatrixRequest\x1a\x1c.mlops.PredictMatrixResponse\x12G\n\x0cPredictMulti\x12\x1a.mlops.PredictMultiRequest\x1a\x1b.mlops.PredictMultiResponse\x12G\n\x0cRetrainModel\x12\x1a.mlops.RetrainModelRequest\x1a\x1b.mlops.RetrainModelResponse\x12\x44\n\x0b\x44\x65leteModel\x12\x19.mlops.DeleteModelRequest\x1a\x1a.mlops.DeleteModelResponse\x12\x41\n\nListModels\x12\x18.mlops.ListModelsRequest\x1a\x19.mlops.ListModelsResponse\x12G\n\x0cListDatasets\x12\x1a.mlops.ListDatasetsRequest\x1a\x1b.mlops.ListDatasetsResponse\x12<\n\x0cStreamModels\x12\x18.mlops.ListModelsRequest\x1a\x10.mlops.ModelInfo0\x01\x12\x42\n\x0eStreamDatasets\x12\x1a.mlops.ListDatasetsRequest\x1a\x12.mlops.DatasetInfo0\x01\x12>\n\tLoadModel\x12\x17.mlops.LoadModelRequest\x1a\x18.mlops.LoadModelResponse\x12G\n\x0cListProfiles\x12\x1a.mlops.ListProfilesRequest\x1a\x1b.mlops.ListProfilesResponse\x12\x41\n\nGetProfile\x12\x18.mlops.GetProfileRequest\x1a\x19.mlops.GetProfileResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'mlops_client.grpc_api_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_HEALTHREQUEST']._serialized_start=33
+  _globals['_HEALTHREQUEST']._serialized_end=48
+  _globals['_HEALTHRESPONSE']._serialized_start=50
+  _globals['_HEALTHRESPONSE']._serialized_end=82
+  _globals['_GETMODELCLASSESREQUEST']._serialized_start=84
+  _globals['_GETMODELCLASSESREQUEST']._serialized_end=108
+  _globals['_GETMODELCLASSESRESPONSE']._serialized_start=110
+  _globals['_GETMODELCLASSESRESPONSE']._serialized_end=158
+  _globals['_TRAINMODELREQUEST']._serialized_start=161
+  _globals['_TRAINMODELREQUEST']._serialized_end=315
+  _globals['_TRAINMODELRESPONSE']._serialized_start=317
+  _globals['_TRAINMODELRESPONSE']._serialized_end=371
+  _globals['_PREDICTREQUEST']._serialized_start=373
+  _globals['_PREDICTREQUEST']._serialized_end=448
+  _globals['_PREDICTDATAPOINT']._serialized_start=450
+  _globals['_PREDICTDATAPOINT']._serialized_end=486
+  _globals['_PREDICTRESPONSE']._serialized_start=488
+  _globals['_PREDICTRESPONSE']._serialized_end=526
+  _globals['_PREDICTMATRIXREQUEST']._serialized_start=528
+  _globals['_PREDICTMATRIXREQUEST']._serialized_end=627
+  _globals['_PREDICTMATRIXRESPONSE']._serialized_start=629
+  _globals['_PREDICTMATRIXRESPONSE']._serialized_end=702
+  _globals['_PREDICTMULTIREQUEST']._serialized_start=704
+  _globals['_PREDICTMULTIREQUEST']._serialized_end=802
+  _globals['_MODELPREDICTIONS']._serialized_start=804
+  _globals['_MODELPREDICTIONS']._serialized_end=878
+  _globals['_PREDICTMULTIRESPONSE']._serialized_start=880
+  _globals['_PREDICTMULTIRESPONSE']._serialized_end=962
+  _globals['_RETRAINMODELREQUEST']._serialized_start=965
+  _globals['_RETRAINMODELREQUEST']._serialized_end=1121
+  _globals['_RETRAINMODELRESPONSE']._serialized_start=1123
+  _globals['_RETRAINMODELRESPONSE']._serialized_end=1179
+  _globals['_DELETEMODELREQUEST']._serialized_start=1181
+  _globals['_DELETEMODELREQUEST']._serialized_end=1221
+  _globals['_DELETEMODELRESPONSE']._serialized_start=1223
+  _globals['_DELETEMODELRESPONSE']._serialized_end=1278
+  _globals['_LISTMODELSREQUEST']._serialized_start=1281
+  _globals['_LISTMODELSREQUEST']._serialized_end=1450
+  _globals['_LISTMODELSRESPONSE']._serialized_start=1452
+  _globals['_LISTMODELSRESPONSE']._serialized_end=1546
+  _globals['_MODELINFO']._serialized_start=1548
+  _globals['_MODELINFO']._serialized_end=1656
+  _globals['_LISTDATASETSREQUEST']._serialized_start=1658
+  _globals['_LISTDATASETSREQUEST']._serialized_end=1776
+  _globals['_LISTDATASETSRESPONSE']._serialized_start=1778
+  _globals['_LISTDATASETSRESPONSE']._serialized_end=1878
+  _globals['_DATASETINFO']._serialized_start=1880
+  _globals['_DATASETINFO']._serialized_end=1953
+  _globals['_LOADMODELREQUEST']._serialized_start=1955
+  _globals['_LOADMODELREQUEST']._serialized_end=2012
+  _globals['_LOADMODELRESPONSE']._serialized_start=2014
+  _globals['_LOADMODELRESPONSE']._serialized_end=2067
+  _globals['_LISTPROFILESREQUEST']._serialized_start=2069
+  _globals['_LISTPROFILESREQUEST']._serialized_end=2090
+  _globals['_LISTPROFILESRESPONSE']._serialized_start=2092
+  _globals['_LISTPROFILESRESPONSE']._serialized_end=2152
+  _globals['_PROFILEINFO']._serialized_start=2154
+  _globals['_PROFILEINFO']._serialized_end=2250
+  _globals['_GETPROFILEREQUEST']._serialized_start=2252
+  _globals['_GETPROFILEREQUEST']._serialized_end=2283
+  _globals['_GETPROFILERESPONSE']._serialized_start=2285
+  _globals['_GETPROFILERESPONSE']._serialized_end=2333
+  _globals['_MLSERVICE']._serialized_start=2336
+  _globals['_MLSERVICE']._serialized_end=3375
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,528 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from mlops_client import grpc_api_pb2 as app_dot_api_dot_grpc__api__pb2
+
+
+class MLServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Health = channel.unary_unary(
+                '/mlops.MLService/Health',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.HealthRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.HealthResponse.FromString,
+                )
+        self.GetModelClasses = channel.unary_unary(
+                '/mlops.MLService/GetModelClasses',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.GetModelClassesRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.GetModelClassesResponse.FromString,
+                )
+        self.TrainModel = channel.unary_unary(
+                '/mlops.MLService/TrainModel',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.TrainModelRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.TrainModelResponse.FromString,
+                )
+        self.Predict = channel.unary_unary(
+                '/mlops.MLService/Predict',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.PredictRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.PredictResponse.FromString,
+                )
+        self.PredictMatrix = channel.unary_unary(
+                '/mlops.MLService/PredictMatrix',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.PredictMatrixRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.PredictMatrixResponse.FromString,
+                )
+        self.PredictMulti = channel.unary_unary(
+                '/mlops.MLService/PredictMulti',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.PredictMultiRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.PredictMultiResponse.FromString,
+                )
+        self.RetrainModel = channel.unary_unary(
+                '/mlops.MLService/RetrainModel',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.RetrainModelRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.RetrainModelResponse.FromString,
+                )
+        self.DeleteModel = channel.unary_unary(
+                '/mlops.MLService/DeleteModel',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.DeleteModelRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.DeleteModelResponse.FromString,
+                )
+        self.ListModels = channel.unary_unary(
+                '/mlops.MLService/ListModels',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.ListModelsRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.ListModelsResponse.FromString,
+                )
+        self.ListDatasets = channel.unary_unary(
+                '/mlops.MLService/ListDatasets',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.ListDatasetsRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.ListDatasetsResponse.FromString,
+                )
+        self.StreamModels = channel.unary_stream(
+                '/mlops.MLService/StreamModels',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.ListModelsRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.ModelInfo.FromString,
+                )
+        self.StreamDatasets = channel.unary_stream(
+                '/mlops.MLService/StreamDatasets',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.ListDatasetsRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.DatasetInfo.FromString,
+                )
+        self.LoadModel = channel.unary_unary(
+                '/mlops.MLService/LoadModel',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.LoadModelRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.LoadModelResponse.FromString,
+                )
+        self.ListProfiles = channel.unary_unary(
+                '/mlops.MLService/ListProfiles',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.ListProfilesRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.ListProfilesResponse.FromString,
+                )
+        self.GetProfile = channel.unary_unary(
+                '/mlops.MLService/GetProfile',
+                request_serializer=app_dot_api_dot_grpc__api__pb2.GetProfileRequest.SerializeToString,
+                response_deserializer=app_dot_api_dot_grpc__api__pb2.GetProfileResponse.FromString,
+                )
+
+
+class MLServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def Health(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetModelClasses(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TrainModel(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Predict(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PredictMatrix(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PredictMulti(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RetrainModel(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeleteModel(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListModels(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListDatasets(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamModels(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamDatasets(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def LoadModel(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListProfiles(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetProfile(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_MLServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Health': grpc.unary_unary_rpc_method_handler(
+                    servicer.Health,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.HealthRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.HealthResponse.SerializeToString,
+            ),
+            'GetModelClasses': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetModelClasses,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.GetModelClassesRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.GetModelClassesResponse.SerializeToString,
+            ),
+            'TrainModel': grpc.unary_unary_rpc_method_handler(
+                    servicer.TrainModel,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.TrainModelRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.TrainModelResponse.SerializeToString,
+            ),
+            'Predict': grpc.unary_unary_rpc_method_handler(
+                    servicer.Predict,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.PredictRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.PredictResponse.SerializeToString,
+            ),
+            'PredictMatrix': grpc.unary_unary_rpc_method_handler(
+                    servicer.PredictMatrix,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.PredictMatrixRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.PredictMatrixResponse.SerializeToString,
+            ),
+            'PredictMulti': grpc.unary_unary_rpc_method_handler(
+                    servicer.PredictMulti,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.PredictMultiRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.PredictMultiResponse.SerializeToString,
+            ),
+            'RetrainModel': grpc.unary_unary_rpc_method_handler(
+                    servicer.RetrainModel,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.RetrainModelRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.RetrainModelResponse.SerializeToString,
+            ),
+            'DeleteModel': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteModel,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.DeleteModelRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.DeleteModelResponse.SerializeToString,
+            ),
+            'ListModels': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListModels,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.ListModelsRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.ListModelsResponse.SerializeToString,
+            ),
+            'ListDatasets': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListDatasets,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.ListDatasetsRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.ListDatasetsResponse.SerializeToString,
+            ),
+            'StreamModels': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamModels,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.ListModelsRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.ModelInfo.SerializeToString,
+            ),
+            'StreamDatasets': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamDatasets,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.ListDatasetsRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.DatasetInfo.SerializeToString,
+            ),
+            'LoadModel': grpc.unary_unary_rpc_method_handler(
+                    servicer.LoadModel,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.LoadModelRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.LoadModelResponse.SerializeToString,
+            ),
+            'ListProfiles': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListProfiles,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.ListProfilesRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.ListProfilesResponse.SerializeToString,
+            ),
+            'GetProfile': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetProfile,
+                    request_deserializer=app_dot_api_dot_grpc__api__pb2.GetProfileRequest.FromString,
+                    response_serializer=app_dot_api_dot_grpc__api__pb2.GetProfileResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'mlops.MLService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class MLService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def Health(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/Health',
+            app_dot_api_dot_grpc__api__pb2.HealthRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.HealthResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetModelClasses(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/GetModelClasses',
+            app_dot_api_dot_grpc__api__pb2.GetModelClassesRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.GetModelClassesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def TrainModel(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/TrainModel',
+            app_dot_api_dot_grpc__api__pb2.TrainModelRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.TrainModelResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Predict(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/Predict',
+            app_dot_api_dot_grpc__api__pb2.PredictRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.PredictResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PredictMatrix(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/PredictMatrix',
+            app_dot_api_dot_grpc__api__pb2.PredictMatrixRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.PredictMatrixResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PredictMulti(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/PredictMulti',
+            app_dot_api_dot_grpc__api__pb2.PredictMultiRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.PredictMultiResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def RetrainModel(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/RetrainModel',
+            app_dot_api_dot_grpc__api__pb2.RetrainModelRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.RetrainModelResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DeleteModel(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/DeleteModel',
+            app_dot_api_dot_grpc__api__pb2.DeleteModelRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.DeleteModelResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ListModels(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/ListModels',
+            app_dot_api_dot_grpc__api__pb2.ListModelsRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.ListModelsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ListDatasets(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/ListDatasets',
+            app_dot_api_dot_grpc__api__pb2.ListDatasetsRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.ListDatasetsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StreamModels(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/mlops.MLService/StreamModels',
+            app_dot_api_dot_grpc__api__pb2.ListModelsRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.ModelInfo.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StreamDatasets(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/mlops.MLService/StreamDatasets',
+            app_dot_api_dot_grpc__api__pb2.ListDatasetsRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.DatasetInfo.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def LoadModel(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/LoadModel',
+            app_dot_api_dot_grpc__api__pb2.LoadModelRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.LoadModelResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ListProfiles(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/ListProfiles',
+            app_dot_api_dot_grpc__api__pb2.ListProfilesRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.ListProfilesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetProfile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlops.MLService/GetProfile',
+            app_dot_api_dot_grpc__api__pb2.GetProfileRequest.SerializeToString,
+            app_dot_api_dot_grpc__api__pb2.GetProfileResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
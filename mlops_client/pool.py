@@ -0,0 +1,52 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+import grpc
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+DEFAULT_CHANNEL_OPTIONS: List[Tuple[str, int]] = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_send_message_length", MAX_MESSAGE_BYTES),
+    ("grpc.max_receive_message_length", MAX_MESSAGE_BYTES),
+]
+
+_lock = threading.Lock()
+_channels: Dict[str, grpc.Channel] = {}
+_sessions: Dict[str, requests.Session] = {}
+
+
+def get_channel(target: str, options: Optional[List[Tuple[str, int]]] = None) -> grpc.Channel:
+    # one HTTP/2 connection per target is shared by every client in the process
+    with _lock:
+        channel = _channels.get(target)
+        if channel is None:
+            channel = grpc.insecure_channel(target, options=options or DEFAULT_CHANNEL_OPTIONS)
+            _channels[target] = channel
+        return channel
+
+
+def get_session(base_url: str, pool_maxsize: int = 32) -> requests.Session:
+    with _lock:
+        session = _sessions.get(base_url)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[base_url] = session
+        return session
+
+
+def close_all():
+    with _lock:
+        for channel in _channels.values():
+            channel.close()
+        for session in _sessions.values():
+            session.close()
+        _channels.clear()
+        _sessions.clear()
@@ -0,0 +1,330 @@
+import json
+from urllib.parse import quote
+from typing import Any, Dict, List, Optional
+import grpc
+import numpy as np
+from mlops_client import grpc_api_pb2
+from mlops_client import grpc_api_pb2_grpc
+from mlops_client.codec import MATRIX_DTYPES
+from mlops_client.pool import DEFAULT_CHANNEL_OPTIONS, get_channel, get_session
+
+
+class ClientError(Exception):
+    pass
+
+
+def as_matrix(X) -> np.ndarray:
+    X = np.asarray(X)
+    if X.dtype.name not in MATRIX_DTYPES:
+        X = X.astype(np.float64)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    return np.ascontiguousarray(X)
+
+
+def _matrix_request(model_name: str, X: np.ndarray):
+    return grpc_api_pb2.PredictMatrixRequest(
+        model_name=model_name,
+        data=X.tobytes(),
+        rows=X.shape[0],
+        cols=X.shape[1],
+        dtype=X.dtype.name
+    )
+
+
+def _train_request(model_name: str, model_class: str, dataset_name: str,
+                   hyperparameters: Dict[str, Any], target_column: str, precision: Optional[str]):
+    return grpc_api_pb2.TrainModelRequest(
+        model_name=model_name,
+        model_class=model_class,
+        dataset_name=dataset_name,
+        hyperparameters_json=json.dumps(hyperparameters),
+        target_column=target_column,
+        precision=precision or ""
+    )
+
+
+# listings are fetched in pages of this size; the client methods still return every matching record
+LIST_PAGE_SIZE = 500
+
+
+def _model_info(m) -> Dict[str, Any]:
+    return {
+        "name": m.name,
+        "id": m.id,
+        "created": m.created or None,
+        "loaded": m.loaded,
+        "version": m.version or None,
+        "model_class": m.model_class or None
+    }
+
+
+def _dataset_info(d) -> Dict[str, Any]:
+    return {"name": d.name, "size": d.size, "path": d.path, "modified": d.modified}
+
+
+def _list_models_request(prefix: Optional[str], model_class: Optional[str], loaded: Optional[bool]):
+    request = grpc_api_pb2.ListModelsRequest(
+        page_size=LIST_PAGE_SIZE,
+        name_prefix=prefix or "",
+        model_class=model_class or ""
+    )
+    if loaded is not None:
+        request.loaded = loaded
+    return request
+
+
+def _list_datasets_request(prefix: Optional[str]):
+    return grpc_api_pb2.ListDatasetsRequest(page_size=LIST_PAGE_SIZE, name_prefix=prefix or "")
+
+
+def _list_params(**filters) -> Dict[str, Any]:
+    params = {"limit": LIST_PAGE_SIZE}
+    for key, value in filters.items():
+        if isinstance(value, bool):
+            params[key] = "true" if value else "false"
+        elif value is not None:
+            params[key] = value
+    return params
+
+
+def _model_path(model_name: str, action: str) -> str:
+    # model names may contain '/', '?' or '#', which would otherwise change the route
+    return f"/api/v1/models/{quote(model_name, safe='')}/{action}"
+
+
+def _deadline_headers(timeout: Optional[float]) -> Dict[str, str]:
+    # lets the server shed the request instead of queueing it past the point the client gives up
+    return {"X-Request-Timeout": str(timeout)} if timeout else {}
+
+
+class GrpcTransport:
+    def __init__(self, target: str, timeout: Optional[float] = None):
+        self.stub = grpc_api_pb2_grpc.MLServiceStub(get_channel(target))
+        self.timeout = timeout
+
+    def _call(self, method, request):
+        try:
+            return method(request, timeout=self.timeout)
+        except grpc.RpcError as e:
+            raise ClientError(f"{e.code().name}: {e.details()}") from e
+
+    def health(self) -> str:
+        return self._call(self.stub.Health, grpc_api_pb2.HealthRequest()).status
+
+    def predict(self, model_name: str, X: np.ndarray) -> np.ndarray:
+        response = self._call(self.stub.PredictMatrix, _matrix_request(model_name, X))
+        return np.frombuffer(response.predictions, dtype=response.dtype)
+
+    def train(self, model_name: str, model_class: str, dataset_name: str,
+              hyperparameters: Dict[str, Any], target_column: str = "target",
+              precision: Optional[str] = None) -> str:
+        request = _train_request(model_name, model_class, dataset_name, hyperparameters, target_column, precision)
+        return self._call(self.stub.TrainModel, request).message
+
+    def load_model(self, model_name: str) -> str:
+        return self._call(self.stub.LoadModel, grpc_api_pb2.LoadModelRequest(model_name=model_name)).message
+
+    def _stream(self, method, request) -> list:
+        try:
+            return list(method(request, timeout=self.timeout))
+        except grpc.RpcError as e:
+            raise ClientError(f"{e.code().name}: {e.details()}") from e
+
+    def list_models(self, prefix: Optional[str] = None, model_class: Optional[str] = None,
+                    loaded: Optional[bool] = None) -> List[Dict[str, Any]]:
+        request = _list_models_request(prefix, model_class, loaded)
+        return [_model_info(m) for m in self._stream(self.stub.StreamModels, request)]
+
+    def list_datasets(self, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [_dataset_info(d) for d in self._stream(self.stub.StreamDatasets, _list_datasets_request(prefix))]
+
+    def close(self):
+        pass
+
+
+class RestTransport:
+    def __init__(self, base_url: str, timeout: Optional[float] = None, pool_maxsize: int = 32):
+        self.base_url = base_url.rstrip("/")
+        self.session = get_session(self.base_url, pool_maxsize)
+        self.timeout = timeout
+        self.deadline_headers = _deadline_headers(timeout)
+
+    def _check(self, response):
+        if response.status_code >= 400:
+            raise ClientError(f"HTTP {response.status_code}: {response.text}")
+        return response
+
+    def health(self) -> str:
+        return self._check(self.session.get(f"{self.base_url}/health", timeout=self.timeout)).json()["status"]
+
+    def predict(self, model_name: str, X: np.ndarray) -> np.ndarray:
+        response = self._check(self.session.post(
+            f"{self.base_url}{_model_path(model_name, 'predict/raw')}",
+            data=X.tobytes(),
+            headers={
+                "Content-Type": "application/octet-stream",
+                "X-Shape": f"{X.shape[0]},{X.shape[1]}",
+                "X-Dtype": X.dtype.name,
+                **self.deadline_headers
+            },
+            timeout=self.timeout
+        ))
+        return np.frombuffer(response.content, dtype=response.headers.get("X-Dtype", "float64"))
+
+    def train(self, model_name: str, model_class: str, dataset_name: str,
+              hyperparameters: Dict[str, Any], target_column: str = "target",
+              precision: Optional[str] = None) -> str:
+        response = self._check(self.session.post(f"{self.base_url}/api/v1/models/train", json={
+            "model_name": model_name,
+            "model_class": model_class,
+            "dataset_name": dataset_name,
+            "hyperparameters": hyperparameters,
+            "target_column": target_column,
+            "precision": precision
+        }, timeout=self.timeout))
+        return response.json()["message"]
+
+    def load_model(self, model_name: str) -> str:
+        response = self._check(self.session.post(
+            f"{self.base_url}{_model_path(model_name, 'load')}", timeout=self.timeout
+        ))
+        return response.json()["message"]
+
+    def _pages(self, path: str, key: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        items = []
+        while True:
+            body = self._check(self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)).json()
+            items.extend(body[key])
+            if not body.get("next_cursor"):
+                return items
+            params = {**params, "cursor": body["next_cursor"]}
+
+    def list_models(self, prefix: Optional[str] = None, model_class: Optional[str] = None,
+                    loaded: Optional[bool] = None) -> List[Dict[str, Any]]:
+        params = _list_params(prefix=prefix, model_class=model_class, loaded=loaded)
+        return self._pages("/api/v1/models", "models", params)
+
+    def list_datasets(self, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._pages("/api/v1/datasets", "datasets", _list_params(prefix=prefix))
+
+    def close(self):
+        pass
+
+
+class AsyncGrpcTransport:
+    def __init__(self, target: str, timeout: Optional[float] = None):
+        # aio channels are bound to the event loop, so each async client owns one
+        self.channel = grpc.aio.insecure_channel(target, options=DEFAULT_CHANNEL_OPTIONS)
+        self.stub = grpc_api_pb2_grpc.MLServiceStub(self.channel)
+        self.timeout = timeout
+
+    async def _call(self, method, request):
+        try:
+            return await method(request, timeout=self.timeout)
+        except grpc.aio.AioRpcError as e:
+            raise ClientError(f"{e.code().name}: {e.details()}") from e
+
+    async def health(self) -> str:
+        return (await self._call(self.stub.Health, grpc_api_pb2.HealthRequest())).status
+
+    async def predict(self, model_name: str, X: np.ndarray) -> np.ndarray:
+        response = await self._call(self.stub.PredictMatrix, _matrix_request(model_name, X))
+        return np.frombuffer(response.predictions, dtype=response.dtype)
+
+    async def train(self, model_name: str, model_class: str, dataset_name: str,
+                    hyperparameters: Dict[str, Any], target_column: str = "target",
+                    precision: Optional[str] = None) -> str:
+        request = _train_request(model_name, model_class, dataset_name, hyperparameters, target_column, precision)
+        return (await self._call(self.stub.TrainModel, request)).message
+
+    async def load_model(self, model_name: str) -> str:
+        request = grpc_api_pb2.LoadModelRequest(model_name=model_name)
+        return (await self._call(self.stub.LoadModel, request)).message
+
+    async def _stream(self, method, request) -> list:
+        try:
+            return [item async for item in method(request, timeout=self.timeout)]
+        except grpc.aio.AioRpcError as e:
+            raise ClientError(f"{e.code().name}: {e.details()}") from e
+
+    async def list_models(self, prefix: Optional[str] = None, model_class: Optional[str] = None,
+                          loaded: Optional[bool] = None) -> List[Dict[str, Any]]:
+        request = _list_models_request(prefix, model_class, loaded)
+        return [_model_info(m) for m in await self._stream(self.stub.StreamModels, request)]
+
+    async def list_datasets(self, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        request = _list_datasets_request(prefix)
+        return [_dataset_info(d) for d in await self._stream(self.stub.StreamDatasets, request)]
+
+    async def close(self):
+        await self.channel.close()
+
+
+class AsyncRestTransport:
+    def __init__(self, base_url: str, timeout: Optional[float] = None, pool_maxsize: int = 32):
+        import httpx
+        self.base_url = base_url.rstrip("/")
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+        )
+        self.deadline_headers = _deadline_headers(timeout)
+
+    def _check(self, response):
+        if response.status_code >= 400:
+            raise ClientError(f"HTTP {response.status_code}: {response.text}")
+        return response
+
+    async def health(self) -> str:
+        return self._check(await self.client.get("/health")).json()["status"]
+
+    async def predict(self, model_name: str, X: np.ndarray) -> np.ndarray:
+        response = self._check(await self.client.post(
+            _model_path(model_name, "predict/raw"),
+            content=X.tobytes(),
+            headers={
+                "Content-Type": "application/octet-stream",
+                "X-Shape": f"{X.shape[0]},{X.shape[1]}",
+                "X-Dtype": X.dtype.name,
+                **self.deadline_headers
+            }
+        ))
+        return np.frombuffer(response.content, dtype=response.headers.get("X-Dtype", "float64"))
+
+    async def train(self, model_name: str, model_class: str, dataset_name: str,
+                    hyperparameters: Dict[str, Any], target_column: str = "target",
+                    precision: Optional[str] = None) -> str:
+        response = self._check(await self.client.post("/api/v1/models/train", json={
+            "model_name": model_name,
+            "model_class": model_class,
+            "dataset_name": dataset_name,
+            "hyperparameters": hyperparameters,
+            "target_column": target_column,
+            "precision": precision
+        }))
+        return response.json()["message"]
+
+    async def load_model(self, model_name: str) -> str:
+        return self._check(await self.client.post(_model_path(model_name, "load"))).json()["message"]
+
+    async def _pages(self, path: str, key: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        items = []
+        while True:
+            body = self._check(await self.client.get(path, params=params)).json()
+            items.extend(body[key])
+            if not body.get("next_cursor"):
+                return items
+            params = {**params, "cursor": body["next_cursor"]}
+
+    async def list_models(self, prefix: Optional[str] = None, model_class: Optional[str] = None,
+                          loaded: Optional[bool] = None) -> List[Dict[str, Any]]:
+        params = _list_params(prefix=prefix, model_class=model_class, loaded=loaded)
+        return await self._pages("/api/v1/models", "models", params)
+
+    async def list_datasets(self, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self._pages("/api/v1/datasets", "datasets", _list_params(prefix=prefix))
+
+    async def close(self):
+        await self.client.aclose()
@@ -23,6 +23,12 @@ setup(
         "aiofiles==23.2.1",
         "pyyaml==6.0.1",
         "requests==2.31.0",
+        "httpx==0.25.2",
+        "lz4==4.3.2",
+        "prometheus-client==0.19.0",
     ],
+    extras_require={
+        "test": ["pytest"],
+    },
 )
 
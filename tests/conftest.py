@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# app.config reads these at import time; the defaults point at /app, which is only writable in the container
+_workdir = tempfile.mkdtemp(prefix="mlops-tests-")
+os.environ.setdefault("MODELS_DIR", os.path.join(_workdir, "models"))
+os.environ.setdefault("DATASETS_DIR", os.path.join(_workdir, "datasets"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
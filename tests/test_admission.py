@@ -0,0 +1,149 @@
+import threading
+import time
+import anyio
+import anyio.to_thread
+import pytest
+from app.admission import AdmissionController, Overloaded, INFERENCE, TRAINING, SERVICE_TIME_HALF_LIFE
+from app.config import settings
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    monkeypatch.setattr(settings, "max_concurrent_predictions", 2)
+    monkeypatch.setattr(settings, "max_queued_predictions", 1)
+    monkeypatch.setattr(settings, "max_concurrent_predictions_per_model", 1)
+    return AdmissionController()
+
+
+def test_model_slot_applies_per_model_limit_inside_admitted_request(controller):
+    with controller.admit(INFERENCE):
+        with controller.model_slot("a"):
+            with pytest.raises(Overloaded) as error:
+                controller.acquire_model("a", timeout=0.05)
+            assert error.value.reason == "model_busy"
+            # other models of the same fan-out are not held back
+            with controller.model_slot("b"):
+                pass
+
+
+def test_model_slot_waits_for_single_model_requests(controller):
+    holding, release = threading.Event(), threading.Event()
+
+    def hold():
+        with controller.admit(INFERENCE, "a"):
+            holding.set()
+            release.wait(1)
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    holding.wait(1)
+    threading.Timer(0.1, release.set).start()
+    start = time.monotonic()
+    with controller.model_slot("a", timeout=1):
+        assert release.is_set()
+    assert time.monotonic() - start >= 0.09
+    worker.join()
+
+
+def test_full_queue_is_rejected(controller):
+    controller.acquire(INFERENCE)
+    controller.acquire(INFERENCE)
+    waiter = threading.Thread(target=controller.acquire, args=(INFERENCE, None, 1))
+    waiter.start()
+    time.sleep(0.05)
+    with pytest.raises(Overloaded) as error:
+        controller.acquire(INFERENCE, timeout=1)
+    assert error.value.reason == "queue_full"
+    controller.release(INFERENCE, None, 0.01)
+    waiter.join()
+
+
+def test_short_deadline_fails_fast(controller):
+    controller.acquire(INFERENCE)
+    controller.acquire(INFERENCE)
+    start = time.monotonic()
+    with pytest.raises(Overloaded) as error:
+        controller.acquire(INFERENCE, timeout=0.01)
+    assert error.value.reason == "deadline"
+    assert error.value.retry_after_seconds >= 1
+    assert time.monotonic() - start < 0.05
+
+
+def test_queued_request_times_out(controller):
+    controller.acquire(INFERENCE)
+    controller.acquire(INFERENCE)
+    controller._lanes[INFERENCE]._service_time = 0.01
+    with pytest.raises(Overloaded) as error:
+        controller.acquire(INFERENCE, timeout=0.1)
+    assert error.value.reason == "deadline"
+    assert controller._lanes[INFERENCE].waiting == 0
+
+
+def test_idle_lane_admits_after_a_slow_request(controller):
+    controller.acquire(INFERENCE)
+    controller.release(INFERENCE, None, 200.0)
+    assert controller._lanes[INFERENCE].service_time > 30
+    with controller.admit(INFERENCE, timeout=30):
+        pass
+
+
+def test_queue_estimate_recovers_after_a_slow_request(controller):
+    lane = controller._lanes[INFERENCE]
+    controller.acquire(INFERENCE)
+    controller.acquire(INFERENCE)
+    controller.release(INFERENCE, None, 200.0)
+    controller.acquire(INFERENCE)
+    with pytest.raises(Overloaded) as error:
+        controller.acquire(INFERENCE, timeout=30)
+    assert error.value.reason == "deadline"
+    # twelve half-lives without a completion bring the estimate back near its initial value
+    lane._updated -= 12 * SERVICE_TIME_HALF_LIFE
+    assert lane.service_time < 0.1
+    threading.Timer(0.05, controller.release, args=(INFERENCE, None, 0.01)).start()
+    controller.acquire(INFERENCE, timeout=30)
+    assert lane.in_flight == 2
+
+
+def test_training_waits_for_queued_predictions(controller):
+    controller.acquire(INFERENCE)
+    controller.acquire(INFERENCE)
+    order = []
+
+    def predict():
+        with controller.admit(INFERENCE, timeout=1):
+            order.append(INFERENCE)
+
+    def train():
+        with controller.admit(TRAINING):
+            order.append(TRAINING)
+
+    waiting_prediction = threading.Thread(target=predict)
+    waiting_prediction.start()
+    time.sleep(0.05)
+    training = threading.Thread(target=train)
+    training.start()
+    time.sleep(0.05)
+    assert order == []
+    controller.release(INFERENCE, None, 0.01)
+    waiting_prediction.join()
+    training.join()
+    assert order == [INFERENCE, TRAINING]
+
+
+def test_async_admission_waits_outside_the_default_threadpool(controller):
+    async def main():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        controller.acquire(INFERENCE)
+        controller.acquire(INFERENCE)
+        async with anyio.create_task_group() as group:
+            async def queued():
+                async with controller.admit_async(INFERENCE, timeout=1):
+                    pass
+            group.start_soon(queued)
+            await anyio.sleep(0.05)
+            assert controller._lanes[INFERENCE].waiting == 1
+            assert limiter.borrowed_tokens == 0
+            controller.release(INFERENCE, None, 0.01)
+        assert controller._lanes[INFERENCE].in_flight == 1
+
+    anyio.run(main)
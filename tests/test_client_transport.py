@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+from mlops_client import grpc_api_pb2
+from mlops_client.transport import _matrix_request, _model_path, as_matrix
+
+
+def test_client_imports_without_the_service_package():
+    code = "import sys, mlops_client; print(sorted(m for m in sys.modules if m == 'app' or m.startswith('app.')))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+
+def test_vendored_stubs_build_requests():
+    request = _matrix_request("m", as_matrix([1.0, 2.0]))
+    parsed = grpc_api_pb2.PredictMatrixRequest.FromString(request.SerializeToString())
+    assert (parsed.model_name, parsed.rows, parsed.cols, parsed.dtype) == ("m", 1, 2, "float64")
+
+
+def test_model_name_is_quoted_in_rest_paths():
+    assert _model_path("a/b?c#d", "predict/raw") == "/api/v1/models/a%2Fb%3Fc%23d/predict/raw"
+    assert _model_path("plain", "load") == "/api/v1/models/plain/load"
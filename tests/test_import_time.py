@@ -0,0 +1,19 @@
+import pytest
+from benchmarks.import_time import measure
+
+IMPORT_BUDGET_SECONDS = 1.5
+
+
+def _grpc_stubs_generated() -> bool:
+    # the checked-in stubs are placeholders until grpc_tools.protoc runs (see Dockerfile)
+    from app.api import grpc_api_pb2
+    return hasattr(grpc_api_pb2, "DESCRIPTOR")
+
+
+@pytest.mark.parametrize("module", ["app.api.rest_api", "app.api.grpc_server"])
+def test_entry_point_import_budget(module):
+    if module == "app.api.grpc_server" and not _grpc_stubs_generated():
+        pytest.skip("gRPC stubs are not generated")
+    result = measure(module, repeats=3)
+    assert result["heavy_modules_loaded"] == [], f"{module} eagerly imports {result['heavy_modules_loaded']}"
+    assert result["seconds"] <= IMPORT_BUDGET_SECONDS, f"{module} took {result['seconds']:.2f}s to import"
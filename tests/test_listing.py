@@ -0,0 +1,87 @@
+import pytest
+from app.services.listing import ListingIndex
+
+
+def index_of(names, size=lambda name: len(name)):
+    index = ListingIndex(["name", "size"])
+    for name in names:
+        index.put(name, {"name": name, "size": size(name)})
+    return index
+
+
+def walk(index, limit=2, **kwargs):
+    names, cursor = [], None
+    while True:
+        items, cursor, _ = index.page(cursor=cursor, limit=limit, **kwargs)
+        names += [item["name"] for item in items]
+        if cursor is None:
+            return names
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_every_record_once(descending):
+    names = [f"m{i:02d}" for i in range(7)]
+    index = index_of(names)
+    assert walk(index, descending=descending) == sorted(names, reverse=descending)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_inserts_and_deletes_between_pages(descending):
+    index = index_of(["b", "d", "f", "h"])
+    first, cursor, _ = index.page(descending=descending, limit=2)
+    seen = [item["name"] for item in first]
+    # a record already passed, one ahead of the cursor, and a removed one ahead of it
+    passed = "i" if descending else "a"
+    index.put(passed, {"name": passed, "size": 1})
+    index.put("e", {"name": "e", "size": 1})
+    index.remove("f" if not descending else "b")
+    rest, cursor, _ = index.page(descending=descending, cursor=cursor, limit=10)
+    seen += [item["name"] for item in rest]
+    assert cursor is None
+    if descending:
+        assert seen == ["h", "f", "e", "d"]
+    else:
+        assert seen == ["b", "d", "e", "h"]
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_ties_on_sort_key_are_broken_by_name(descending):
+    index = index_of(["c", "a", "b", "d"], size=lambda name: 1)
+    assert walk(index, limit=1, sort_by="size", descending=descending) == sorted("abcd", reverse=descending)
+
+
+def test_missing_values_sort_last():
+    index = ListingIndex(["name", "created"])
+    for name, created in [("a", None), ("b", "2024"), ("c", "2023")]:
+        index.put(name, {"name": name, "created": created})
+    assert walk(index, sort_by="created") == ["c", "b", "a"]
+
+
+def test_filter_and_total_on_demand():
+    index = index_of(["x1", "y1", "x2", "x3"])
+    match = lambda record: record["name"].startswith("x")
+    items, cursor, total = index.page(match, limit=2, include_total=True)
+    assert [item["name"] for item in items] == ["x1", "x2"] and total == 3
+    items, cursor, total = index.page(match, cursor=cursor, limit=2)
+    assert [item["name"] for item in items] == ["x3"] and cursor is None and total is None
+
+
+def test_cursor_is_bound_to_its_sort_order():
+    index = index_of(["a", "b", "c"])
+    _, cursor, _ = index.page(limit=1)
+    with pytest.raises(ValueError):
+        index.page(cursor=cursor, descending=True)
+    with pytest.raises(ValueError):
+        index.page(cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        index.page(sort_by="owner")
+
+
+def test_version_only_moves_on_change():
+    index = index_of(["a"])
+    version = index.version
+    index.put("a", {"name": "a", "size": 1})
+    index.remove("missing")
+    assert index.version == version
+    index.put("a", {"name": "a", "size": 2})
+    assert index.version == version + 1
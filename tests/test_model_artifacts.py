@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from app.services.model_artifacts import (
+    NpzForestModel, NpzLinearModel, load_artifact, save_artifact, to_float32
+)
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 6))
+    y = X @ rng.normal(size=6) + rng.normal(scale=0.1, size=400)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def models(data):
+    X, y = data
+    return {
+        "linear": LinearRegression().fit(X, y),
+        "forest": RandomForestRegressor(n_estimators=12, max_depth=6, random_state=0).fit(X, y),
+    }
+
+
+@pytest.mark.parametrize("kind, loaded_type", [("linear", NpzLinearModel), ("forest", NpzForestModel)])
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_npz_round_trip_matches_sklearn(tmp_path, data, models, kind, loaded_type, compression):
+    X, _ = data
+    path = save_artifact(models[kind], str(tmp_path / kind), "npz", compression)
+    assert path.endswith(".npz")
+
+    loaded = load_artifact(path)
+    assert isinstance(loaded, loaded_type)
+    np.testing.assert_allclose(loaded.predict(X), models[kind].predict(X), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("kind", ["linear", "forest"])
+def test_npz_keeps_feature_count(tmp_path, data, models, kind):
+    X, _ = data
+    loaded = load_artifact(save_artifact(models[kind], str(tmp_path / kind), "npz"))
+    assert loaded.n_features_in_ == X.shape[1]
+    assert to_float32(loaded).n_features_in_ == X.shape[1]
+
+
+def test_npz_falls_back_to_joblib_for_unsupported_models(tmp_path, data):
+    X, y = data
+    model = RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y > 0)
+    path = save_artifact(model, str(tmp_path / "classifier"), "npz")
+    assert path.endswith(".pkl")
+    np.testing.assert_array_equal(load_artifact(path).predict(X), model.predict(X))
+
+
+def test_npz_falls_back_to_joblib_for_linear_classifiers(tmp_path, data):
+    X, y = data
+    model = LogisticRegression().fit(X, y > 0)
+    path = save_artifact(model, str(tmp_path / "logistic"), "npz")
+    assert path.endswith(".pkl")
+    np.testing.assert_array_equal(load_artifact(path).predict(X), model.predict(X))
+    assert to_float32(model) is None
+
+
+def test_unknown_format_is_rejected(tmp_path, models):
+    with pytest.raises(ValueError):
+        save_artifact(models["linear"], str(tmp_path / "m"), "onnx")
+
+
+@pytest.mark.parametrize("kind", ["linear", "forest"])
+def test_float32_layout_stays_close(data, models, kind):
+    X, _ = data
+    compiled = to_float32(models[kind])
+    predictions = compiled.predict(X.astype(np.float32))
+    expected = models[kind].predict(X)
+    assert np.max(np.abs(predictions - expected)) / np.max(np.abs(expected)) < 1e-5
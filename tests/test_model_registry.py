@@ -0,0 +1,69 @@
+import pytest
+from app.services.model_registry import ModelRegistry
+
+
+def publish(registry, name="m", model="model", number=None, forward_only=False):
+    version = registry.register(name, model, number=number)
+    version.warmed = True
+    return version, registry.set_alias(name, version.version, forward_only=forward_only)
+
+
+def test_unwarmed_version_takes_no_traffic():
+    registry = ModelRegistry()
+    version = registry.register("m", "v1")
+    assert not registry.set_alias("m", version.version)
+    assert "m" not in registry
+
+
+def test_alias_move_keeps_previous_version_on_standby():
+    registry = ModelRegistry()
+    publish(registry, model="v1")
+    publish(registry, model="v2")
+    assert registry["m"] == "v2"
+    assert registry["m@1"] == "v1"
+    assert registry.previous_version("m") == 1
+    assert [v["state"] for v in registry.versions("m")] == ["standby", "serving"]
+
+
+def test_retired_version_drains_until_released():
+    registry = ModelRegistry(versions_retained=0)
+    first, _ = publish(registry, model="v1")
+    with registry.acquire("m") as held:
+        publish(registry, model="v2")
+        assert held is first and held.state == "draining" and held.model == "v1"
+        assert registry.resident_versions() == 2
+        with pytest.raises(KeyError):
+            registry["m@1"]
+    assert first.state == "freed" and first.model is None
+    assert registry.resident_versions() == 1
+
+
+def test_retention_frees_oldest_standby_versions():
+    registry = ModelRegistry(versions_retained=1)
+    for model in ("v1", "v2", "v3"):
+        publish(registry, model=model)
+    assert [v["version"] for v in registry.versions("m")] == [2, 3]
+    assert registry.resident_versions() == 2
+
+
+def test_forward_only_alias_refuses_older_version():
+    registry = ModelRegistry()
+    older, newer = registry.reserve("m"), registry.reserve("m")
+    assert (older, newer) == (1, 2)
+    publish(registry, model="newer", number=newer, forward_only=True)
+    _, moved = publish(registry, model="older", number=older, forward_only=True)
+    assert not moved
+    assert registry["m"] == "newer"
+    # rollbacks move the alias back explicitly
+    assert registry.set_alias("m", older)
+
+
+def test_remove_drains_in_flight_versions():
+    registry = ModelRegistry()
+    version, _ = publish(registry)
+    with registry.acquire("m"):
+        assert registry.remove("m")
+        assert "m" not in registry
+        assert registry.resident_versions() == 1
+    assert version.state == "freed"
+    assert registry.resident_versions() == 0
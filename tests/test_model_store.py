@@ -0,0 +1,117 @@
+import os
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+from sklearn.linear_model import LinearRegression
+from app.config import settings
+from app.services import clearml_service, model_service
+from app.services.dataset_service import DatasetService
+from app.services.model_service import ModelService, TRAINED
+from app.services.model_store import ModelStore
+from benchmarks.standins import LocalModel, LocalOutputModel, LocalRepo, LocalS3, LocalTask
+
+DATASET = "store_dataset.csv"
+
+
+class _LinearModel:
+    # the part of app.models.BaseMLModel that ModelService relies on
+    def __init__(self, hyperparameters):
+        self.model = LinearRegression(**hyperparameters)
+        self.is_trained = False
+
+    def train(self, X, y):
+        self.model.fit(X, y)
+        self.is_trained = True
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+@pytest.fixture
+def replicas(tmp_path, monkeypatch):
+    local_clearml = SimpleNamespace(Task=LocalTask, Model=LocalModel, OutputModel=LocalOutputModel)
+    monkeypatch.setattr(clearml_service, "_clearml", lambda: local_clearml)
+    monkeypatch.setattr(DatasetService, "_open_dvc_repo", lambda self: LocalRepo(self.datasets_dir))
+    monkeypatch.setattr(model_service, "_load_model_class", lambda class_name: _LinearModel)
+    monkeypatch.setattr(settings, "model_store_enabled", False)
+    monkeypatch.setattr(settings, "models_dir", str(tmp_path / "models"))
+
+    X = np.random.default_rng(0).normal(size=(50, 3))
+    os.makedirs(settings.datasets_dir, exist_ok=True)
+    pd.DataFrame({"f1": X[:, 0], "f2": X[:, 1], "f3": X[:, 2], "target": X @ [1.0, 2.0, 3.0]}).to_csv(
+        os.path.join(settings.datasets_dir, DATASET), index=False
+    )
+
+    bucket = LocalS3(str(tmp_path / "s3"))
+    services = []
+    for name in ("a", "b"):
+        # each replica has its own cache directory in front of the shared bucket
+        monkeypatch.setattr(settings, "model_cache_dir", str(tmp_path / f"cache-{name}"))
+        service = ModelService()
+        service.store = ModelStore(client=bucket)
+        services.append(service)
+    yield services
+    for service in services:
+        service.close()
+
+
+def _train(service, model_name, **hyperparameters):
+    return service.train_model(model_name, "LinearRegression", DATASET, hyperparameters)
+
+
+def _cached(service, model_name):
+    model_dir = os.path.join(service.store.cache_dir, model_name)
+    return sorted(os.listdir(model_dir)) if os.path.isdir(model_dir) else []
+
+
+def test_publish_is_picked_up_by_another_replica(replicas):
+    a, b = replicas
+    assert _train(a, "m") == TRAINED
+    assert "m" not in b.models
+
+    assert b.sync_from_store() == 1
+    X = np.ones((2, 3))
+    np.testing.assert_allclose(b.predict("m", X), a.predict("m", X))
+    assert len(_cached(b, "m")) == 1
+    # an unchanged manifest is neither downloaded nor loaded again
+    assert b.sync_from_store() == 0
+
+
+def test_new_revision_replaces_the_cached_artifact(replicas):
+    a, b = replicas
+    _train(a, "m")
+    b.sync_from_store()
+    first = _cached(b, "m")
+
+    _train(a, "m", fit_intercept=False)
+    assert b.sync_from_store() == 1
+    assert b.models.get("m").model.fit_intercept is False
+    assert len(_cached(b, "m")) == 1 and _cached(b, "m") != first
+
+
+def test_delete_is_seen_by_another_replica(replicas):
+    a, b = replicas
+    _train(a, "m")
+    b.sync_from_store()
+
+    assert a.delete_model("m")
+    b.sync_from_store()
+    assert "m" not in b.models
+    assert b.predict("m", np.ones((1, 3))) is None
+    assert b.store.get_manifest("m") is None
+
+
+def test_explicit_load_reads_through_the_store(replicas):
+    a, b = replicas
+    _train(a, "m")
+    # the model is gone from ClearML, so only the store can serve it
+    for model in LocalModel.query_models():
+        if model.name == "m":
+            model.delete()
+
+    assert b.load_model_from_clearml("m")
+    assert "m" in b.models
+    assert len(_cached(b, "m")) == 1
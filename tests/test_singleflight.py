@@ -0,0 +1,93 @@
+import threading
+import time
+import pytest
+from app.metrics import COALESCED_CALLS
+from app.singleflight import SingleFlight
+
+
+def run_concurrently(flight, key, fn, callers=5):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def wait_for_followers(flight, count, before):
+    # the leader is released only once every other caller is waiting on it
+    deadline = time.monotonic() + 1
+    while COALESCED_CALLS.labels(flight.name)._value.get() - before < count and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def blocking(started, release, outcome):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(1)
+        return outcome()
+
+    return fn, calls
+
+
+def test_concurrent_calls_share_one_execution():
+    flight, started, release = SingleFlight("test"), threading.Event(), threading.Event()
+    fn, calls = blocking(started, release, lambda: object())
+    before = COALESCED_CALLS.labels(flight.name)._value.get()
+    threads, results, errors = run_concurrently(flight, "key", fn)
+    started.wait(1)
+    wait_for_followers(flight, 4, before)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert not errors and len(results) == 5
+    assert all(result is results[0] for result in results)
+
+
+def test_error_is_shared_with_waiters():
+    flight, started, release = SingleFlight("test"), threading.Event(), threading.Event()
+
+    def fail():
+        raise RuntimeError("download failed")
+
+    fn, calls = blocking(started, release, fail)
+    before = COALESCED_CALLS.labels(flight.name)._value.get()
+    threads, results, errors = run_concurrently(flight, "key", fn)
+    started.wait(1)
+    wait_for_followers(flight, 4, before)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert not results and len(errors) == 5
+    assert all(str(error) == "download failed" for error in errors)
+
+
+def test_next_call_after_completion_runs_again():
+    flight = SingleFlight("test")
+    calls = []
+    flight.do("key", calls.append, 1)
+    with pytest.raises(ZeroDivisionError):
+        flight.do("key", lambda: 1 / 0)
+    flight.do("key", calls.append, 2)
+    assert calls == [1, 2]
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight, started, release = SingleFlight("test"), threading.Event(), threading.Event()
+    fn, _ = blocking(started, release, lambda: "slow")
+    threads, _, _ = run_concurrently(flight, "slow", fn, callers=1)
+    started.wait(1)
+    assert flight.do("fast", lambda: "fast") == "fast"
+    release.set()
+    threads[0].join()